@@ -0,0 +1,72 @@
+"""Add composite indexes for hot lookup queries.
+
+Revision ID: 003_hot_table_composite_indexes
+Revises: 002_whatsapp_price_alerts
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "003_hot_table_composite_indexes"
+down_revision = "002_whatsapp_price_alerts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_normalized_market_records_lookup",
+        "normalized_market_records",
+        ["record_type", "commodity", "region", "period", "observed_at"],
+        unique=False,
+        if_not_exists=True,
+        postgresql_include=[
+            "open_usd_per_troy_oz",
+            "high_usd_per_troy_oz",
+            "low_usd_per_troy_oz",
+            "close_usd_per_troy_oz",
+            "volume",
+        ],
+    )
+    op.create_index(
+        "idx_alert_history_user_triggered",
+        "alert_history",
+        ["user_sub", "triggered_at"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "idx_chat_history_user_created",
+        "chat_history",
+        ["user_id", "created_at"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "idx_training_runs_lookup",
+        "training_runs",
+        ["commodity", "region", "trained_at"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "idx_training_jobs_lookup",
+        "training_jobs",
+        ["commodity", "region", "created_at", "id"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_training_jobs_lookup", table_name="training_jobs", if_exists=True)
+    op.drop_index("idx_training_runs_lookup", table_name="training_runs", if_exists=True)
+    op.drop_index("idx_chat_history_user_created", table_name="chat_history", if_exists=True)
+    op.drop_index("idx_alert_history_user_triggered", table_name="alert_history", if_exists=True)
+    op.drop_index(
+        "idx_normalized_market_records_lookup",
+        table_name="normalized_market_records",
+        if_exists=True,
+    )
@@ -0,0 +1,43 @@
+"""Add price_alerts.cooldown_until for SQL-side cooldown filtering.
+
+Revision ID: 004_price_alert_cooldown_until
+Revises: 003_hot_table_composite_indexes
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "004_price_alert_cooldown_until"
+down_revision = "003_hot_table_composite_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("price_alerts") as batch_op:
+        batch_op.add_column(sa.Column("cooldown_until", sa.DateTime(), nullable=True))
+        batch_op.create_index("ix_price_alerts_cooldown_until", ["cooldown_until"], unique=False)
+
+    # last_triggered_at + max(5, cooldown_minutes), as AlertService._cooldown_until computes it.
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        op.execute(
+            "UPDATE price_alerts SET cooldown_until = "
+            "datetime(last_triggered_at, '+' || MAX(5, COALESCE(cooldown_minutes, 30)) || ' minutes') "
+            "WHERE last_triggered_at IS NOT NULL"
+        )
+    else:
+        op.execute(
+            "UPDATE price_alerts SET cooldown_until = "
+            "last_triggered_at + GREATEST(5, COALESCE(cooldown_minutes, 30)) * INTERVAL '1 minute' "
+            "WHERE last_triggered_at IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("price_alerts") as batch_op:
+        batch_op.drop_index("ix_price_alerts_cooldown_until")
+        batch_op.drop_column("cooldown_until")
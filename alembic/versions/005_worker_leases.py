@@ -0,0 +1,36 @@
+"""Add worker_leases for sharding background workers across processes.
+
+Revision ID: 005_worker_leases
+Revises: 004_price_alert_cooldown_until
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "005_worker_leases"
+down_revision = "004_price_alert_cooldown_until"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "worker_leases",
+        sa.Column("pool", sa.String(length=64), nullable=False),
+        sa.Column("shard", sa.Integer(), nullable=False),
+        sa.Column("owner", sa.String(length=128), nullable=False, server_default=""),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("pool", "shard"),
+    )
+    op.create_index("ix_worker_leases_owner", "worker_leases", ["owner"], unique=False)
+    op.create_index("ix_worker_leases_expires_at", "worker_leases", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_worker_leases_expires_at", table_name="worker_leases")
+    op.drop_index("ix_worker_leases_owner", table_name="worker_leases")
+    op.drop_table("worker_leases")
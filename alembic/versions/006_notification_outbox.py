@@ -0,0 +1,56 @@
+"""Add notification_outbox for transactional alert delivery.
+
+Revision ID: 006_notification_outbox
+Revises: 005_worker_leases
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "006_notification_outbox"
+down_revision = "005_worker_leases"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_outbox",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("idempotency_key", sa.String(length=160), nullable=False),
+        sa.Column("channel", sa.String(length=16), nullable=False),
+        sa.Column("alert_id", sa.Integer(), nullable=False),
+        sa.Column("alert_history_id", sa.Integer(), nullable=False),
+        sa.Column("recipient", sa.String(length=255), nullable=False),
+        sa.Column("subject", sa.String(length=255), nullable=True),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("market_context", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(length=32), nullable=False, server_default="pending"),
+        sa.Column("provider", sa.String(length=32), nullable=True),
+        sa.Column("error", sa.String(length=512), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("claimed_by", sa.String(length=128), nullable=True),
+        sa.Column("claimed_until", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("idempotency_key"),
+    )
+    op.create_index("ix_notification_outbox_alert_id", "notification_outbox", ["alert_id"], unique=False)
+    op.create_index(
+        "ix_notification_outbox_alert_history_id", "notification_outbox", ["alert_history_id"], unique=False
+    )
+    op.create_index(
+        "idx_notification_outbox_due", "notification_outbox", ["status", "next_attempt_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_notification_outbox_due", table_name="notification_outbox")
+    op.drop_index("ix_notification_outbox_alert_history_id", table_name="notification_outbox")
+    op.drop_index("ix_notification_outbox_alert_id", table_name="notification_outbox")
+    op.drop_table("notification_outbox")
@@ -0,0 +1,54 @@
+"""Extend the history lookup indexes with id for keyset pagination.
+
+Revision ID: 007_history_keyset_indexes
+Revises: 006_notification_outbox
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "007_history_keyset_indexes"
+down_revision = "006_notification_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_alert_history_user_triggered_id",
+        "alert_history",
+        ["user_sub", "triggered_at", "id"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "idx_chat_history_user_created_id",
+        "chat_history",
+        ["user_id", "created_at", "id"],
+        unique=False,
+        if_not_exists=True,
+    )
+    # The (user, ts, id) indexes cover every lookup the two-column ones served.
+    op.drop_index("idx_alert_history_user_triggered", table_name="alert_history", if_exists=True)
+    op.drop_index("idx_chat_history_user_created", table_name="chat_history", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(
+        "idx_chat_history_user_created",
+        "chat_history",
+        ["user_id", "created_at"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "idx_alert_history_user_triggered",
+        "alert_history",
+        ["user_sub", "triggered_at"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.drop_index("idx_chat_history_user_created_id", table_name="chat_history", if_exists=True)
+    op.drop_index("idx_alert_history_user_triggered_id", table_name="alert_history", if_exists=True)
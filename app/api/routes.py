@@ -1,21 +1,36 @@
 import csv
 import io
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator
+from datetime import date, datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, status
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request, Response, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.admission import admission_controller, training_runs
 from app.core.exceptions import CommodityNotSupportedError, TrainingError
 from app.core.auth import get_current_user
+from app.core.body_cache import bodies
+from app.core.responses import ORJSONResponse, dumps
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.http_cache import (
+    apply_validator,
+    as_last_modified,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    validators,
+)
 from app.db.session import get_session
 from app.schemas.responses import (
+    AdmissionClassStats,
     AlertCreateRequest,
     AlertEvaluationResponse,
     AlertHistoryResponse,
     AlertUpdateRequest,
     CommodityNewsSummaryResponse,
     CommodityDefinition,
+    DashboardResponse,
     DataProvenance,
     ErrorResponse,
     FeatureSnapshotResponse,
@@ -25,11 +40,13 @@ from app.schemas.responses import (
     LivePricesEnvelope,
     MarketIntelligenceResponse,
     MarketSignalResponse,
-    NormalizedHistoricalBarResponse,
+    MultiRegionHistoricalResponse,
+    NormalizedHistoricalColumnarResponse,
     NormalizedHistoricalSeriesResponse,
     NormalizedLiveQuoteResponse,
     PriceAlertResponse,
     RegionDefinition,
+    RegionalHistoricalColumnarResponse,
     RegionalHistoricalResponse,
     RegionalPredictionResponse,
     TrainResponse,
@@ -40,11 +57,15 @@ from app.schemas.responses import (
 )
 from app.services.alert_service import AlertService
 from app.services.commodity_service import CommodityService
+from app.services.dashboard_service import DASHBOARD_SECTIONS, DashboardService
+from app.services.fx_cache import fx_snapshot_version
+from app.services.live_price_snapshot_service import LivePriceSnapshotService
 from app.services.market_quote_service import ALERT_COMMODITY_SYMBOLS
 from app.services.news_service import CommodityNewsService
 from app.services.news_persistence_service import NewsPersistenceService
 from app.services.profile_service import ProfileService
 from app.services.market_signal_service import MarketSignalService
+from app.services.normalization_service import validate_layout
 from app.services.settings_service import SettingsService
 
 router = APIRouter()
@@ -55,6 +76,13 @@ news_persistence_service = NewsPersistenceService(news_service)
 profile_service = ProfileService()
 settings_service = SettingsService()
 market_signal_service = MarketSignalService()
+dashboard_service = DashboardService(
+    commodity_service=service,
+    market_signal_service=market_signal_service,
+    alert_service=alert_service,
+    news_service=news_service,
+    news_persistence_service=news_persistence_service,
+)
 
 REGION_CATALOG = [
     RegionDefinition(id="india", currency="INR", unit="10g"),
@@ -69,15 +97,104 @@ COMMODITY_CATALOG = [
 ]
 
 
+# Freshness windows for conditional GETs; nginx caches `public` responses for the same window.
+LIVE_PRICES_MAX_AGE = 15
+# Lets a CDN absorb the landing-page polling and keep serving through origin hiccups.
+PUBLIC_LIVE_PRICES_CACHE_CONTROL = (
+    f"public, max-age={LIVE_PRICES_MAX_AGE}, s-maxage={LIVE_PRICES_MAX_AGE}, "
+    "stale-while-revalidate=30, stale-if-error=300"
+)
+PRIVATE_LIVE_PRICES_CACHE_CONTROL = f"private, max-age={LIVE_PRICES_MAX_AGE}"
+HISTORICAL_MAX_AGE = 300
+HISTORICAL_CACHE_CONTROL = f"private, max-age={HISTORICAL_MAX_AGE}"
+EPOCH_DAY_ZERO = date(1970, 1, 1)
+live_price_snapshots = LivePriceSnapshotService(service, cache_control=PUBLIC_LIVE_PRICES_CACHE_CONTROL)
+
+
 def _err(code: str, message: str, **context: str) -> dict:
     return {"error": {"code": code, "message": message, "context": context}}
 
 
+def _last_bar(payload: RegionalHistoricalResponse | RegionalHistoricalColumnarResponse) -> tuple[date | None, float | None]:
+    if isinstance(payload, RegionalHistoricalColumnarResponse):
+        columns = payload.columns
+        if not columns.close:
+            return None, None
+        last_date = columns.date[-1]
+        if isinstance(last_date, int):
+            last_date = EPOCH_DAY_ZERO + timedelta(days=last_date)
+        return last_date, columns.close[-1]
+    if not payload.data:
+        return None, None
+    return payload.data[-1].date, payload.data[-1].close
+
+
+async def _cached_response(request: Request, key: str) -> Response | None:
+    """Answer from the remembered validator (304) or cached body before the handler does any work."""
+    validator = validators.fresh(key)
+    if validator is None:
+        return None
+    if is_not_modified(request, validator):
+        return not_modified(validator, request)
+    entry = bodies.get(key, validator.etag)
+    if entry is None:
+        return None
+    return await bodies.respond(entry, validator, request.headers.get("accept-encoding"))
+
+
+async def _conditional(
+    request: Request,
+    key: str,
+    content,
+    *,
+    etag: str,
+    last_modified,
+    cache_control: str,
+    ttl_seconds: int,
+) -> Response:
+    """Remember the validator and answer 304, or the (pre)compressed orjson body."""
+    validator = validators.remember(
+        key,
+        etag=etag,
+        last_modified=as_last_modified(last_modified),
+        cache_control=cache_control,
+        ttl_seconds=ttl_seconds,
+    )
+    if is_not_modified(request, validator):
+        return not_modified(validator, request)
+    entry = bodies.get(key, etag) or bodies.put(key, etag, dumps(content))
+    return await bodies.respond(entry, validator, request.headers.get("accept-encoding"))
+
+
+async def _live_prices_conditional(
+    request: Request,
+    key: str,
+    envelope: LivePricesEnvelope,
+    cache_control: str,
+) -> Response:
+    watermark = [(item.commodity, item.region, item.live_price, item.source, item.timestamp) for item in envelope.items]
+    return await _conditional(
+        request,
+        key,
+        envelope,
+        etag=make_etag(watermark, fx_snapshot_version()),
+        last_modified=max((item.timestamp for item in envelope.items), default=None),
+        cache_control=cache_control,
+        ttl_seconds=LIVE_PRICES_MAX_AGE,
+    )
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health() -> HealthResponse:
     return HealthResponse(status="ok")
 
 
+@router.get("/health/admission", response_model=list[AdmissionClassStats])
+async def admission_stats(response: Response) -> list[AdmissionClassStats]:
+    response.headers["Cache-Control"] = "no-store"
+    return [AdmissionClassStats(**item) for item in admission_controller.stats()]
+
+
 @router.get("/regions", response_model=list[RegionDefinition])
 async def regions() -> list[RegionDefinition]:
     return REGION_CATALOG
@@ -94,17 +211,22 @@ async def commodities() -> list[CommodityDefinition]:
     responses={503: {"model": ErrorResponse}},
 )
 async def live_prices(
+    request: Request,
     session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-) -> LivePricesEnvelope:
+) -> Response:
     _ = current_user
+    key = "live-prices:all"
+    if hit := await _cached_response(request, key):
+        return hit
     try:
-        return LivePricesEnvelope(items=await service.live_prices(session=session))
+        envelope = LivePricesEnvelope(items=await service.live_prices(session=session))
     except (CommodityNotSupportedError, TrainingError, RuntimeError) as exc:
         raise HTTPException(
             status_code=503,
             detail=_err("LIVE_PRICE_UNAVAILABLE", str(exc)),
         ) from exc
+    return await _live_prices_conditional(request, key, envelope, PRIVATE_LIVE_PRICES_CACHE_CONTROL)
 
 
 @router.get(
@@ -112,19 +234,26 @@ async def live_prices(
     response_model=LivePricesEnvelope,
     responses={400: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
 )
-async def public_live_prices_region(region: str, session: AsyncSession = Depends(get_session)) -> LivePricesEnvelope:
+async def public_live_prices_region(region: str, request: Request) -> Response:
+    """Serve the precomputed snapshot; no provider calls or DB writes per hit."""
     try:
-        return LivePricesEnvelope(items=await service.live_prices(region=region, session=session))
+        snapshot = await live_price_snapshots.get(region)
     except ValueError as exc:
         raise HTTPException(
             status_code=400,
             detail=_err("INVALID_REGION", str(exc), region=region),
         ) from exc
-    except (CommodityNotSupportedError, TrainingError, RuntimeError) as exc:
+    except RuntimeError as exc:
         raise HTTPException(
             status_code=503,
             detail=_err("LIVE_PRICE_UNAVAILABLE", str(exc), region=region),
         ) from exc
+    if is_not_modified(request, snapshot.validator):
+        return not_modified(snapshot.validator, request)
+    entry = live_price_snapshots.bodies.get(snapshot.region, snapshot.validator.etag)
+    if entry is None:
+        entry = live_price_snapshots.bodies.put(snapshot.region, snapshot.validator.etag, dumps(snapshot.envelope))
+    return await live_price_snapshots.bodies.respond(entry, snapshot.validator, request.headers.get("accept-encoding"))
 
 
 @router.get(
@@ -134,12 +263,16 @@ async def public_live_prices_region(region: str, session: AsyncSession = Depends
 )
 async def live_prices_region(
     region: str,
+    request: Request,
     session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-) -> LivePricesEnvelope:
+) -> Response:
     _ = current_user
+    key = f"live-prices:{region}"
+    if hit := await _cached_response(request, key):
+        return hit
     try:
-        return LivePricesEnvelope(items=await service.live_prices(region=region, session=session))
+        envelope = LivePricesEnvelope(items=await service.live_prices(region=region, session=session))
     except ValueError as exc:
         raise HTTPException(
             status_code=400,
@@ -150,6 +283,7 @@ async def live_prices_region(
             status_code=503,
             detail=_err("LIVE_PRICE_UNAVAILABLE", str(exc), region=region),
         ) from exc
+    return await _live_prices_conditional(request, key, envelope, PRIVATE_LIVE_PRICES_CACHE_CONTROL)
 
 
 @router.get(
@@ -172,21 +306,92 @@ async def commodity_news_summary(
     return await news_service.summarize(commodity, headlines=headlines)
 
 
+@router.get(
+    "/historical/{commodity}",
+    response_model=MultiRegionHistoricalResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def historical_regions(
+    commodity: str,
+    request: Request,
+    regions: str = Query("india,us,europe", description="Comma-separated regions"),
+    range: str = Query("1y", description="1m|6m|1y|5y|max"),
+    points: int | None = Query(default=None, ge=3, le=5000, description="LTTB-downsample to at most this many points"),
+    format: str = Query("rows", description="rows|columnar"),
+    date_encoding: str = Query("iso", description="iso|epoch_day (columnar only)"),
+    session: AsyncSession = Depends(get_session),
+    current_user: dict = Depends(get_current_user),
+) -> Response:
+    _ = current_user
+    requested = [item.strip() for item in regions.split(",") if item.strip()]
+    key = f"historical-regions:{commodity}:{','.join(requested)}:{range}:{points}:{format}:{date_encoding}"
+    if hit := await _cached_response(request, key):
+        return hit
+    try:
+        payload = await service.historical_regions(
+            commodity,
+            regions=requested,
+            period=range,
+            session=session,
+            points=points,
+            format=format,
+            date_encoding=date_encoding,
+        )
+    except CommodityNotSupportedError as exc:
+        raise HTTPException(
+            status_code=404,
+            detail=_err("UNSUPPORTED_COMMODITY", str(exc), commodity=commodity),
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=_err("INVALID_REQUEST", str(exc), commodity=commodity, regions=regions),
+        ) from exc
+    last_bars = {region: _last_bar(item) for region, item in payload.series.items()}
+    last_date = next(iter(last_bars.values()))[0] if last_bars else None
+    return await _conditional(
+        request,
+        key,
+        payload,
+        etag=make_etag(payload.rows, payload.source_rows, sorted(last_bars.items()), fx_snapshot_version()),
+        last_modified=last_date,
+        cache_control=HISTORICAL_CACHE_CONTROL,
+        ttl_seconds=HISTORICAL_MAX_AGE,
+    )
+
+
 @router.get(
     "/historical/{commodity}/{region}",
-    response_model=RegionalHistoricalResponse,
+    response_model=RegionalHistoricalResponse | RegionalHistoricalColumnarResponse,
     responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
 )
 async def historical(
     commodity: str,
     region: str,
+    request: Request,
     range: str = Query("1y", description="1m|6m|1y|5y|max"),
+    points: int | None = Query(default=None, ge=3, le=5000, description="Downsample to at most this many points"),
+    downsample: str = Query("lttb", description="lttb|ohlc"),
+    format: str = Query("rows", description="rows|columnar"),
+    date_encoding: str = Query("iso", description="iso|epoch_day (columnar only)"),
     session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-) -> RegionalHistoricalResponse:
+) -> Response:
     _ = current_user
+    key = f"historical:{commodity}:{region}:{range}:{points}:{downsample}:{format}:{date_encoding}"
+    if hit := await _cached_response(request, key):
+        return hit
     try:
-        return await service.historical(commodity, region=region, period=range, session=session)
+        payload = await service.historical(
+            commodity,
+            region=region,
+            period=range,
+            session=session,
+            points=points,
+            downsample=downsample,
+            format=format,
+            date_encoding=date_encoding,
+        )
     except CommodityNotSupportedError as exc:
         raise HTTPException(
             status_code=404,
@@ -197,6 +402,17 @@ async def historical(
             status_code=400,
             detail=_err("INVALID_REQUEST", str(exc), commodity=commodity, region=region),
         ) from exc
+    last_date, last_close = _last_bar(payload)
+    watermark = (payload.currency, payload.unit, payload.rows, payload.source_rows, last_date, last_close)
+    return await _conditional(
+        request,
+        key,
+        payload,
+        etag=make_etag(watermark, fx_snapshot_version()),
+        last_modified=last_date,
+        cache_control=HISTORICAL_CACHE_CONTROL,
+        ttl_seconds=HISTORICAL_MAX_AGE,
+    )
 
 
 @router.get(
@@ -297,47 +513,33 @@ async def normalized_live_quote(
 
 @router.get(
     "/normalized/historical/{commodity}/{region}",
-    response_model=NormalizedHistoricalSeriesResponse,
+    response_model=NormalizedHistoricalSeriesResponse | NormalizedHistoricalColumnarResponse,
     responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
 )
 async def normalized_historical(
     commodity: str,
     region: str,
+    request: Request,
     range: str = Query("1y", description="1m|6m|1y|5y|max"),
+    format: str = Query("rows", description="rows|columnar"),
+    date_encoding: str = Query("iso", description="iso|epoch_day (columnar only)"),
     session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-) -> NormalizedHistoricalSeriesResponse:
+) -> Response:
     _ = current_user
+    key = f"normalized-historical:{commodity}:{region}:{range}:{format}:{date_encoding}"
+    if hit := await _cached_response(request, key):
+        return hit
     try:
         service._validate(commodity)
         region = service._validate_region(region)
-        series = service.ingestion_service.load_historical_series(commodity=commodity, region=region, period=range)
-        await service.ingestion_persistence_service.persist_historical_series(
-            session,
-            series=series,
-            period=range,
-        )
-        return NormalizedHistoricalSeriesResponse(
-            commodity=series.commodity,
-            region=series.region,
-            rows=len(series.bars),
-            provenance=DataProvenance(
-                data_type="historical",
-                provider=series.provenance.provider,
-                detail=series.provenance.detail,
-                observed_at=series.provenance.observed_at,
-            ),
-            data=[
-                NormalizedHistoricalBarResponse(
-                    date=bar.date,
-                    open_usd_per_troy_oz=bar.open_usd_per_troy_oz,
-                    high_usd_per_troy_oz=bar.high_usd_per_troy_oz,
-                    low_usd_per_troy_oz=bar.low_usd_per_troy_oz,
-                    close_usd_per_troy_oz=bar.close_usd_per_troy_oz,
-                    volume=bar.volume,
-                )
-                for bar in series.bars
-            ],
+        validate_layout(format, date_encoding)
+        series = await service.historical_series(commodity, region=region, period=range, session=session)
+        provenance = DataProvenance(
+            data_type="historical",
+            provider=series.provenance.provider,
+            detail=series.provenance.detail,
+            observed_at=series.provenance.observed_at,
         )
     except CommodityNotSupportedError as exc:
         raise HTTPException(
@@ -349,6 +551,30 @@ async def normalized_historical(
             status_code=400,
             detail=_err("NORMALIZED_DATA_FAILED", str(exc), commodity=commodity, region=region),
         ) from exc
+    # USD bars: the watermark is the series itself, no FX component.
+    last = series.bars[-1] if series.bars else None
+    payload = {
+        "commodity": series.commodity,
+        "region": series.region,
+        "rows": len(series.bars),
+        "provenance": provenance,
+    }
+    if format == "columnar":
+        payload["format"] = format
+        payload["date_encoding"] = date_encoding
+        payload["columns"] = service.normalization_service.to_normalized_columns(series, date_encoding)
+    else:
+        # Same field names as NormalizedHistoricalBarResponse; dumped in one pass, not re-validated per bar.
+        payload["data"] = series.model_dump(include={"bars"})["bars"]
+    return await _conditional(
+        request,
+        key,
+        payload,
+        etag=make_etag(len(series.bars), last.date if last else None, last.close_usd_per_troy_oz if last else None),
+        last_modified=last.date if last else None,
+        cache_control=HISTORICAL_CACHE_CONTROL,
+        ttl_seconds=HISTORICAL_MAX_AGE,
+    )
 
 
 @router.get(
@@ -477,6 +703,39 @@ async def market_intelligence(
         ) from exc
 
 
+@router.get(
+    "/dashboard",
+    response_model=DashboardResponse,
+    responses={400: {"model": ErrorResponse}},
+)
+async def dashboard(
+    region: str | None = Query(default=None, description="Defaults to the user's default_region"),
+    horizon: int | None = Query(default=None, ge=1, le=90),
+    sections: str | None = Query(default=None, description=f"Comma-separated subset of {','.join(DASHBOARD_SECTIONS)}"),
+    session: AsyncSession = Depends(get_session),
+    current_user: dict = Depends(get_current_user),
+) -> Response:
+    user_id = current_user.get("sub", "unknown")
+    if region is None or horizon is None:
+        user_settings = await settings_service.get_or_create(session=session, user_id=user_id)
+        region = region or user_settings.default_region
+        horizon = horizon or user_settings.prediction_horizon
+    try:
+        payload = await dashboard_service.build(
+            user_sub=user_id,
+            region=region,
+            horizon=horizon,
+            sections=dashboard_service.parse_sections(sections),
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=_err("INVALID_REQUEST", str(exc), region=region),
+        ) from exc
+    # Per-user and partly live, so never shared or stored by intermediaries.
+    return ORJSONResponse(payload, headers={"Cache-Control": "private, no-store"})
+
+
 @router.post("/alerts", response_model=PriceAlertResponse, responses={400: {"model": ErrorResponse}})
 async def create_alert(
     payload: AlertCreateRequest,
@@ -557,6 +816,7 @@ async def delete_alert(
 
 @router.get("/alerts/history", response_model=list[AlertHistoryResponse])
 async def list_alert_history(
+    response: Response,
     commodity: str | None = Query(default=None),
     alert_type: str | None = Query(default=None),
     email_status: str | None = Query(default=None),
@@ -564,20 +824,87 @@ async def list_alert_history(
     end_at: datetime | None = Query(default=None),
     search: str | None = Query(default=None),
     limit: int = Query(default=200, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
     session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
 ) -> list[AlertHistoryResponse]:
-    return await alert_service.alert_history(
-        session,
-        current_user.get("sub", "unknown"),
-        commodity=commodity,
-        alert_type=alert_type,
-        email_status=email_status,
-        start_at=start_at,
-        end_at=end_at,
-        search=search,
-        limit=limit,
-    )
+    """Newest first; pass the X-Next-Cursor header of one page as `cursor` to fetch the next."""
+    try:
+        items, next_cursor = await alert_service.alert_history_page(
+            session,
+            current_user.get("sub", "unknown"),
+            commodity=commodity,
+            alert_type=alert_type,
+            email_status=email_status,
+            start_at=start_at,
+            end_at=end_at,
+            search=search,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=_err("INVALID_CURSOR", str(exc))) from exc
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+
+ALERT_HISTORY_CSV_COLUMNS = [
+    "id",
+    "alert_id",
+    "commodity",
+    "region",
+    "alert_type",
+    "threshold",
+    "observed_value",
+    "message",
+    "email_status",
+    "delivery_provider",
+    "delivery_error",
+    "delivery_attempts",
+    "triggered_at",
+]
+# Rows buffered per CSV chunk handed to the response.
+ALERT_HISTORY_CSV_CHUNK_ROWS = 200
+
+
+async def _alert_history_csv(user_sub: str, filters: dict) -> AsyncIterator[str]:
+    """Stream the export in CSV chunks from a server-side cursor on its own session.
+
+    The request-scoped session is not used: the body is produced after the handler returns.
+    """
+    from app.db.session import AsyncSessionLocal
+
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(ALERT_HISTORY_CSV_COLUMNS)
+    pending = 0
+    async with AsyncSessionLocal() as session:
+        async for row in alert_service.stream_alert_history(session, user_sub, **filters):
+            writer.writerow(
+                [
+                    row.id,
+                    row.alert_id,
+                    row.commodity,
+                    row.region,
+                    row.alert_type,
+                    row.threshold,
+                    row.observed_value,
+                    row.message,
+                    row.email_status,
+                    row.delivery_provider or "",
+                    row.delivery_error or "",
+                    row.delivery_attempts,
+                    row.triggered_at.isoformat(),
+                ]
+            )
+            pending += 1
+            if pending >= ALERT_HISTORY_CSV_CHUNK_ROWS:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+                pending = 0
+    yield buf.getvalue()
 
 
 @router.get("/alerts/history/export")
@@ -588,63 +915,21 @@ async def export_alert_history(
     start_at: datetime | None = Query(default=None),
     end_at: datetime | None = Query(default=None),
     search: str | None = Query(default=None),
-    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
 ) -> StreamingResponse:
-    rows = await alert_service.alert_history(
-        session,
-        current_user.get("sub", "unknown"),
-        commodity=commodity,
-        alert_type=alert_type,
-        email_status=email_status,
-        start_at=start_at,
-        end_at=end_at,
-        search=search,
-        limit=1000,
-    )
-    buf = io.StringIO()
-    writer = csv.writer(buf)
-    writer.writerow(
-        [
-            "id",
-            "alert_id",
-            "commodity",
-            "region",
-            "alert_type",
-            "threshold",
-            "observed_value",
-            "message",
-            "email_status",
-            "delivery_provider",
-            "delivery_error",
-            "delivery_attempts",
-            "triggered_at",
-        ]
-    )
-    for row in rows:
-        writer.writerow(
-            [
-                row.id,
-                row.alert_id,
-                row.commodity,
-                row.region,
-                row.alert_type,
-                row.threshold,
-                row.observed_value,
-                row.message,
-                row.email_status,
-                row.delivery_provider or "",
-                row.delivery_error or "",
-                row.delivery_attempts,
-                row.triggered_at.isoformat(),
-            ]
-        )
-    payload = buf.getvalue()
+    filters = {
+        "commodity": commodity,
+        "alert_type": alert_type,
+        "email_status": email_status,
+        "start_at": start_at,
+        "end_at": end_at,
+        "search": search,
+    }
     filename = f"alert-history-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}.csv"
     return StreamingResponse(
-        iter([payload]),
+        _alert_history_csv(current_user.get("sub", "unknown"), filters),
         media_type="text/csv",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "private, no-store"},
     )
 
 
@@ -720,7 +1005,7 @@ async def train(
     from app.db.session import AsyncSessionLocal
 
     async def run_training():
-        async with AsyncSessionLocal() as bg_session:
+        async with training_runs, AsyncSessionLocal() as bg_session:
             try:
                 await service.train(bg_session, commodity, region=region, horizon=horizon, job_id=job.id)
             except Exception as e:
@@ -776,7 +1061,7 @@ async def backfill_historical_ingestion(
     from app.db.session import AsyncSessionLocal
 
     async def run_backfill() -> None:
-        async with AsyncSessionLocal() as bg_session:
+        async with training_runs, AsyncSessionLocal() as bg_session:
             try:
                 await service.run_ingestion_backfill_job(bg_session, job_id=job.id)
             except Exception as exc:
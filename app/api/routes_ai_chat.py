@@ -3,13 +3,14 @@ from __future__ import annotations
 import asyncio
 import json
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.db.session import get_session
-from app.schemas.responses import AIChatRequest, AIChatResponse, AIProviderStatusResponse
+from app.schemas.responses import AIChatRequest, AIChatResponse, AIProviderStatusResponse, ChatHistoryResponse
 from app.services.ai_chat_service import AIChatService, AIProviderUnavailableError
 from app.services.profile_service import ProfileService
 from app.services.rate_limiter import RedisRateLimiter
@@ -91,6 +92,33 @@ async def ai_chat_stream(
     return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
+@router.get("/ai/chat/history", response_model=list[ChatHistoryResponse])
+async def ai_chat_history(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    session: AsyncSession = Depends(get_session),
+    current_user: dict = Depends(get_current_user),
+) -> list[ChatHistoryResponse]:
+    """Newest first; pass the X-Next-Cursor header of one page as `cursor` to fetch the next."""
+    try:
+        items, next_cursor = await chat_service.history_page(
+            session,
+            current_user.get("sub", "unknown"),
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        # Same envelope as the alert history listing in routes.py.
+        raise HTTPException(
+            status_code=400,
+            detail={"error": {"code": "INVALID_CURSOR", "message": str(exc), "context": {}}},
+        ) from exc
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+
 @router.get("/ai/provider-status", response_model=AIProviderStatusResponse)
 async def ai_provider_status() -> AIProviderStatusResponse:
     return AIProviderStatusResponse(**chat_service.provider_status())
@@ -0,0 +1,294 @@
+"""Admission control for expensive route classes.
+
+Inference, AI chat and training requests each pass through a gate with a fixed
+number of concurrent slots and a bounded FIFO queue. A request that finds the
+queue full, or waits longer than the class's queue deadline, is shed at once with
+503 and `Retry-After` instead of piling onto the DB pool and model workers. A
+single client holding too many slots of one class gets 429. Routes outside these
+classes (health, live prices, settings) never touch a gate.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+from collections import deque
+from dataclasses import dataclass
+
+from app.core.config import Settings, get_settings
+from app.core.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+SHED_REASONS = ("queue_full", "queue_timeout", "client_limit")
+
+
+@dataclass(frozen=True)
+class RouteClass:
+    name: str
+    methods: frozenset[str]
+    pattern: re.Pattern[str]
+    max_concurrent: int
+    max_queue: int
+    queue_timeout_seconds: float
+    max_per_client: int
+    retry_after_seconds: int
+
+    def matches(self, method: str, path: str) -> bool:
+        return method in self.methods and self.pattern.match(path) is not None
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, route_class: RouteClass, reason: str) -> None:
+        super().__init__(reason)
+        self.route_class = route_class
+        self.reason = reason
+
+    @property
+    def status_code(self) -> int:
+        return 429 if self.reason == "client_limit" else 503
+
+
+class AdmissionGate:
+    """Concurrency slots plus a bounded FIFO queue for one route class.
+
+    A released slot is handed straight to the oldest waiter, so queued requests
+    are admitted in arrival order and newcomers cannot overtake them.
+    """
+
+    def __init__(self, route_class: RouteClass) -> None:
+        self.route_class = route_class
+        self.active = 0
+        self.admitted = 0
+        self.shed = dict.fromkeys(SHED_REASONS, 0)
+        self.max_queue_wait_ms = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._per_client: dict[str, int] = {}
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self, client: str | None = None) -> None:
+        spec = self.route_class
+        if client is not None:
+            if self._per_client.get(client, 0) >= spec.max_per_client:
+                self._reject("client_limit")
+            self._per_client[client] = self._per_client.get(client, 0) + 1
+        try:
+            await self._acquire_slot()
+        except BaseException:
+            self._forget_client(client)
+            raise
+        self.admitted += 1
+
+    async def _acquire_slot(self) -> None:
+        spec = self.route_class
+        if self.active < spec.max_concurrent and not self.queued:
+            self.active += 1
+            return
+        if self.queued >= spec.max_queue:
+            self._reject("queue_full")
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        started = loop.time()
+        try:
+            await asyncio.wait_for(waiter, spec.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            # The client went away; pass on a slot that was handed over meanwhile.
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot()
+            raise
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+        self.max_queue_wait_ms = max(self.max_queue_wait_ms, (loop.time() - started) * 1000)
+
+    def release(self, client: str | None = None) -> None:
+        self._forget_client(client)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot over; `active` stays the same.
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _forget_client(self, client: str | None) -> None:
+        if client is None:
+            return
+        remaining = self._per_client.get(client, 0) - 1
+        if remaining > 0:
+            self._per_client[client] = remaining
+        else:
+            self._per_client.pop(client, None)
+
+    def _reject(self, reason: str) -> None:
+        self.shed[reason] += 1
+        raise AdmissionRejected(self.route_class, reason)
+
+    def stats(self) -> dict:
+        spec = self.route_class
+        return {
+            "route_class": spec.name,
+            "active": self.active,
+            "queued": self.queued,
+            "max_concurrent": spec.max_concurrent,
+            "max_queue": spec.max_queue,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "max_queue_wait_ms": round(self.max_queue_wait_ms, 2),
+        }
+
+
+def default_route_classes(settings: Settings) -> list[RouteClass]:
+    timeout = settings.admission_queue_timeout_seconds
+    per_client = settings.admission_max_per_client
+    return [
+        RouteClass(
+            name="training",
+            methods=frozenset({"POST"}),
+            pattern=re.compile(r"^/api/(train|ingestion/backfill)/"),
+            max_concurrent=settings.admission_training_concurrency,
+            max_queue=settings.admission_training_queue,
+            queue_timeout_seconds=timeout,
+            max_per_client=1,
+            retry_after_seconds=30,
+        ),
+        RouteClass(
+            name="ai_chat",
+            methods=frozenset({"POST"}),
+            pattern=re.compile(r"^/api/ai/chat(/stream)?/?$"),
+            max_concurrent=settings.admission_ai_chat_concurrency,
+            max_queue=settings.admission_ai_chat_queue,
+            queue_timeout_seconds=timeout,
+            max_per_client=per_client,
+            retry_after_seconds=5,
+        ),
+        RouteClass(
+            name="inference",
+            methods=frozenset({"GET"}),
+            pattern=re.compile(r"^/api/(predict|forecasts|intelligence|signals|features)/|^/api/dashboard/?$"),
+            max_concurrent=settings.admission_inference_concurrency,
+            max_queue=settings.admission_inference_queue,
+            queue_timeout_seconds=timeout,
+            max_per_client=per_client,
+            retry_after_seconds=max(1, math.ceil(timeout)),
+        ),
+    ]
+
+
+class AdmissionController:
+    def __init__(self, route_classes: list[RouteClass]) -> None:
+        self.gates = [AdmissionGate(route_class) for route_class in route_classes]
+
+    def gate_for(self, method: str, path: str) -> AdmissionGate | None:
+        for gate in self.gates:
+            if gate.route_class.matches(method, path):
+                return gate
+        return None
+
+    def stats(self) -> list[dict]:
+        return [gate.stats() for gate in self.gates]
+
+
+def _client_key(scope) -> str | None:
+    user = (scope.get("state") or {}).get("user")
+    if isinstance(user, dict) and user.get("sub"):
+        return f"user:{user['sub']}"
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else None
+
+
+admission_controller = AdmissionController(default_route_classes(get_settings()))
+
+# Training and backfill routes answer 202 and hand the run to BackgroundTasks, which
+# starts after the response has released the admission slot. Each run holds one of
+# these for its whole duration, so bursts queue up instead of training at once.
+training_runs = asyncio.Semaphore(max(1, get_settings().admission_training_concurrency))
+
+
+class AdmissionControlMiddleware:
+    """Pure ASGI middleware; the slot is held until the response (or stream) ends.
+
+    The slot is released when the last body message is sent, not when the app
+    returns: Starlette runs BackgroundTasks after the body inside the same call,
+    and a queued training job must not keep the gate closed for its whole run;
+    those runs are bounded by `training_runs` instead.
+    """
+
+    def __init__(self, app, controller: AdmissionController = admission_controller) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        gate = self.controller.gate_for(scope["method"], scope["path"])
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+        client = _client_key(scope)
+        try:
+            await gate.acquire(client)
+        except AdmissionRejected as exc:
+            logger.warning(
+                "Shed %s %s: route_class=%s reason=%s",
+                scope["method"],
+                scope["path"],
+                exc.route_class.name,
+                exc.reason,
+            )
+            await self._reject(send, exc)
+            return
+        released = False
+
+        def _release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                gate.release(client)
+
+        async def _send(message) -> None:
+            try:
+                await send(message)
+            finally:
+                if message["type"] == "http.response.body" and not message.get("more_body", False):
+                    _release()
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            _release()
+
+    @staticmethod
+    async def _reject(send, exc: AdmissionRejected) -> None:
+        spec = exc.route_class
+        if exc.reason == "client_limit":
+            code, message = "TOO_MANY_CONCURRENT_REQUESTS", "Too many concurrent requests from this client"
+        else:
+            code, message = "SERVER_BUSY", "Server is at capacity, retry shortly"
+        body = dumps({"detail": {"error": {"code": code, "message": message, "context": {"route_class": spec.name, "reason": exc.reason}}}})
+        await send(
+            {
+                "type": "http.response.start",
+                "status": exc.status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(spec.retry_after_seconds).encode()),
+                    (b"cache-control", b"no-store"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -1,34 +1,40 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import logging
 import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any
 
 import httpx
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from starlette.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.core.config import get_settings
-from app.core.secrets import AUTH_SECRETS, get_secret_value
+from app.core.secrets import AUTH_SECRETS, get_secret_value, vault
 
 logger = logging.getLogger(__name__)
 
 try:
-    from jose import JWTError, jwt  # type: ignore
+    from jose import JWTError, jwk, jwt  # type: ignore
 
     JOSE_AVAILABLE = True
 except ImportError:  # pragma: no cover - env-dependent fallback
     JWTError = Exception  # type: ignore
+    jwk = None  # type: ignore
     jwt = None  # type: ignore
     JOSE_AVAILABLE = False
 
 bearer_scheme = HTTPBearer(auto_error=False)
-_JWKS_CACHE: dict[str, Any] = {"keys": None, "fetched_at": 0.0}
+# `by_kid` holds verification keys constructed once per JWKS fetch, not per decode.
+_JWKS_CACHE: dict[str, Any] = {"keys": None, "by_kid": {}, "fetched_at": 0.0}
 _JWKS_TTL_SECONDS = 60 * 60
+# Resolved app JWT secret and the vault snapshot it was resolved against.
+_APP_JWT_SECRET_CACHE: dict[str, Any] = {"snapshot": None, "secret": None}
+INSECURE_DEV_JWT_SECRET = "dev-insecure-jwt-secret"
 
 
 def _settings():
@@ -70,24 +76,110 @@ async def _get_jwks() -> dict[str, Any]:
         response.raise_for_status()
         keys = response.json()
 
+    by_kid = {}
+    for key in keys.get("keys", []):
+        if not key.get("kid"):
+            continue
+        try:
+            by_kid[key["kid"]] = jwk.construct(key, key.get("alg", "RS256")) if JOSE_AVAILABLE else key
+        except Exception as exc:
+            logger.warning("Skipping unusable JWKS key kid=%s: %s", key.get("kid"), exc)
     _JWKS_CACHE["keys"] = keys
+    _JWKS_CACHE["by_kid"] = by_kid
     _JWKS_CACHE["fetched_at"] = now
     return keys
 
 
+class ClaimsCache:
+    """Bounded LRU of verified claims keyed by the SHA-256 of the token.
+
+    Entries expire at the token's `exp`, capped at `max_ttl_seconds` so JWKS
+    rotation and secret changes take effect within that window. Failed
+    verifications are never cached.
+    """
+
+    def __init__(self, max_entries: int, max_ttl_seconds: float) -> None:
+        self._entries: OrderedDict[bytes, tuple[dict[str, Any], float]] = OrderedDict()
+        self._max_entries = max_entries
+        self._max_ttl_seconds = max_ttl_seconds
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        claims, expires_at = entry
+        if expires_at <= time.time():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        expires_at = time.time() + self._max_ttl_seconds
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= time.time() or self._max_entries <= 0:
+            return
+        key = self._key(token)
+        self._entries[key] = (claims, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+claims_cache = ClaimsCache(
+    max_entries=get_settings().auth_claims_cache_size,
+    max_ttl_seconds=get_settings().auth_claims_cache_max_ttl_seconds,
+)
+
+
 def _audience() -> str:
     settings = _settings()
     return settings.auth0_audience or settings.auth0_client_id
 
 
-def create_app_jwt(user_claims: dict[str, Any]) -> str:
+def _app_jwt_secret() -> str:
+    """App JWT secret, resolved again whenever the vault swaps in a new snapshot.
+
+    The insecure development default is never cached, so a vault that loads after
+    the first request takes over on the next call.
+    """
+    snapshot = vault.snapshot
+    if _APP_JWT_SECRET_CACHE["snapshot"] is snapshot and _APP_JWT_SECRET_CACHE["secret"]:
+        return _APP_JWT_SECRET_CACHE["secret"]
     settings = _settings()
-    jwt_secret = get_secret_value(
+    secret = get_secret_value(
         AUTH_SECRETS,
         "JWT_SECRET",
         env_fallback="JWT_SECRET",
-        default=settings.jwt_secret or settings.secret_key or "dev-insecure-jwt-secret",
+        default=settings.jwt_secret or settings.secret_key or INSECURE_DEV_JWT_SECRET,
     )
+    if secret != INSECURE_DEV_JWT_SECRET:
+        _APP_JWT_SECRET_CACHE.update(snapshot=snapshot, secret=secret)
+    return secret
+
+
+@lru_cache(maxsize=4)
+def _verification_key_for(secret: str):
+    return jwk.construct(secret, "HS256")
+
+
+def _app_jwt_verification_key():
+    # Keyed on the secret itself, so a rotated secret gets a new key immediately.
+    return _verification_key_for(_app_jwt_secret())
+
+
+def create_app_jwt(user_claims: dict[str, Any]) -> str:
+    jwt_secret = _app_jwt_secret()
     now = int(time.time())
     payload = {
         "sub": user_claims.get("sub"),
@@ -110,19 +202,12 @@ def create_app_jwt(user_claims: dict[str, Any]) -> str:
 
 
 def _decode_app_jwt(token: str) -> dict[str, Any]:
-    settings = _settings()
-    jwt_secret = get_secret_value(
-        AUTH_SECRETS,
-        "JWT_SECRET",
-        env_fallback="JWT_SECRET",
-        default=settings.jwt_secret or settings.secret_key or "dev-insecure-jwt-secret",
-    )
     if not JOSE_AVAILABLE:
         return _decode_unverified_payload(token)
     try:
         return jwt.decode(
             token,
-            jwt_secret,
+            _app_jwt_verification_key(),
             algorithms=["HS256"],
             audience="tradesight-frontend",
             issuer="tradesight",
@@ -149,8 +234,8 @@ async def _decode_auth0_jwt(token: str) -> dict[str, Any]:
     if not kid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing JWT kid header")
 
-    jwks = await _get_jwks()
-    key = next((k for k in jwks.get("keys", []) if k.get("kid") == kid), None)
+    await _get_jwks()
+    key = _JWKS_CACHE["by_kid"].get(kid)
     if not key:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="No matching JWKS key found")
 
@@ -197,6 +282,15 @@ async def decode_access_token(token: str) -> dict[str, Any]:
     if token.count(".") != 2:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token format")
 
+    cached = claims_cache.get(token)
+    if cached is not None:
+        return dict(cached)
+    claims = await _verify_access_token(token)
+    claims_cache.put(token, claims)
+    return dict(claims)
+
+
+async def _verify_access_token(token: str) -> dict[str, Any]:
     if not JOSE_AVAILABLE:
         return _decode_unverified_payload(token)
 
@@ -267,20 +361,36 @@ async def get_current_user(
 
 
 
-class TokenVerificationMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request.state.user = None
-
-        auth_header = request.headers.get("authorization", "")
-        if auth_header.lower().startswith("bearer "):
-            token = auth_header.split(" ", 1)[1].strip()
-            if token:
-                try:
-                    request.state.user = await decode_access_token(token)
-                except HTTPException as exc:
-                    logger.warning("Token verification failed: %s", exc.detail)
-                    # Don't block the request — let it through with user=None.
-                    # Protected routes enforce auth via get_current_user dependency.
-
-        response = await call_next(request)
-        return response
+def _bearer_token(headers: list[tuple[bytes, bytes]]) -> str | None:
+    for name, value in headers:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token.strip():
+                return token.strip()
+            return None
+    return None
+
+
+class TokenVerificationMiddleware:
+    """Pure ASGI middleware that verifies a bearer token into `request.state.user`.
+
+    Invalid tokens do not block the request; protected routes enforce auth via
+    the `get_current_user` dependency.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        state = scope.setdefault("state", {})
+        state["user"] = None
+        token = _bearer_token(scope["headers"])
+        if token:
+            try:
+                state["user"] = await decode_access_token(token)
+            except HTTPException as exc:
+                logger.warning("Token verification failed: %s", exc.detail)
+        await self.app(scope, receive, send)
@@ -0,0 +1,131 @@
+"""In-process cache of serialized and precompressed response bodies.
+
+Entries are keyed by resource key (endpoint + params) and the resource's ETag,
+which already encodes the data version. A hit is served without running the
+handler, serializing, or compressing; each encoding is compressed at most once
+per data version. Large bodies are compressed in a worker thread so a cache miss
+does not stall the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+
+from fastapi import Response
+
+from app.core.http_cache import Validator, apply_validator, representation_etag
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Below this size the framing overhead outweighs the savings.
+MIN_COMPRESS_BYTES = 512
+# Above this size compression moves off the event loop.
+THREAD_COMPRESS_BYTES = 64 * 1024
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str:
+    """Pick br, gzip or identity from an Accept-Encoding header."""
+    if not accept_encoding:
+        return "identity"
+    offered: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        offered[name.strip().lower()] = quality
+
+    def accepted(name: str) -> bool:
+        return offered.get(name, offered.get("*", 0.0)) > 0
+
+    if brotli is not None and accepted("br"):
+        return "br"
+    if accepted("gzip"):
+        return "gzip"
+    return "identity"
+
+
+class _Entry:
+    __slots__ = ("etag", "bodies")
+
+    def __init__(self, etag: str, body: bytes) -> None:
+        self.etag = etag
+        self.bodies: dict[str, bytes] = {"identity": body}
+
+    @property
+    def size(self) -> int:
+        return sum(len(body) for body in self.bodies.values())
+
+    async def body_for(self, encoding: str) -> tuple[bytes, str]:
+        identity = self.bodies["identity"]
+        if encoding == "identity" or len(identity) < MIN_COMPRESS_BYTES:
+            return identity, "identity"
+        body = self.bodies.get(encoding)
+        if body is None:
+            if len(identity) >= THREAD_COMPRESS_BYTES:
+                body = await asyncio.to_thread(_compress, identity, encoding)
+            else:
+                body = _compress(identity, encoding)
+            self.bodies[encoding] = body
+        return body, encoding
+
+
+class CompressedBodyCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self._entries: dict[str, _Entry] = {}
+        self._max_bytes = max_bytes
+
+    def get(self, key: str, etag: str) -> _Entry | None:
+        entry = self._entries.pop(key, None)
+        if entry is None or entry.etag != etag:
+            return None
+        # Re-insert to keep dict order least-recently-used first.
+        self._entries[key] = entry
+        return entry
+
+    def put(self, key: str, etag: str, body: bytes) -> _Entry:
+        self._entries.pop(key, None)
+        entry = _Entry(etag, body)
+        self._entries[key] = entry
+        self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        total = sum(entry.size for entry in self._entries.values())
+        while total > self._max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            total -= self._entries.pop(oldest).size
+
+    async def respond(self, entry: _Entry, validator: Validator, accept_encoding: str | None) -> Response:
+        before = entry.size
+        body, encoding = await entry.body_for(negotiate_encoding(accept_encoding))
+        if entry.size != before:
+            self._evict()
+        response = Response(content=body, media_type="application/json")
+        apply_validator(response, validator)
+        response.headers["Vary"] = "Accept-Encoding"
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+            response.headers["ETag"] = representation_etag(validator.etag, encoding)
+        return response
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+bodies = CompressedBodyCache()
@@ -16,6 +16,9 @@ class Settings(BaseSettings):
     auth0_client_id: str = ""
     auth0_client_secret: str = ""
     jwt_secret: str = ""
+    auth_claims_cache_size: int = 4096
+    auth_claims_cache_max_ttl_seconds: int = 300
+    user_cache_ttl_seconds: int = 60
     openrouter_api_key: str = ""
     infisical_project_id: str = ""
     infisical_env: str = "dev"
@@ -26,6 +29,22 @@ class Settings(BaseSettings):
     cors_allowed_origins: str = ""
     cors_allow_origin_regex: str = r"https://.*\.vercel\.app$"
     data_cache_dir: str = "ml/cache"
+    historical_db_reads_enabled: bool = False
+    historical_db_max_staleness_days: int = 4
+    dashboard_section_timeout_seconds: float = 6.0
+    dashboard_db_concurrency: int = 4
+    public_live_prices_refresh_seconds: int = 15
+    public_live_prices_max_staleness_seconds: int = 60
+    public_live_prices_failure_backoff_seconds: int = 30
+    public_live_prices_refresher_enabled: bool = True
+    admission_inference_concurrency: int = 8
+    admission_inference_queue: int = 32
+    admission_ai_chat_concurrency: int = 4
+    admission_ai_chat_queue: int = 8
+    admission_training_concurrency: int = 1
+    admission_training_queue: int = 2
+    admission_queue_timeout_seconds: float = 2.0
+    admission_max_per_client: int = 4
     artifact_dir: str = "ml/artifacts"
     forecast_horizons: tuple[int, ...] = (1, 7, 30)
     min_training_rows: int = 180
@@ -43,6 +62,18 @@ class Settings(BaseSettings):
     whatsapp_rate_limit_max_messages: int = 5
     whatsapp_alert_poll_interval_seconds: int = 60
     whatsapp_worker_enabled: bool = True
+    # Alerts are partitioned by id into shards leased to worker processes.
+    alert_worker_shards: int = 16
+    alert_worker_lease_ttl_seconds: int = 90
+    alert_send_concurrency: int = 8
+    # Messages per second per delivery provider, shared by all workers.
+    delivery_provider_rate_limits: dict[str, int] = {"twilio": 10, "meta": 20, "resend": 10, "sendgrid": 50}
+    notification_dispatcher_enabled: bool = True
+    notification_dispatch_interval_seconds: float = 2.0
+    notification_dispatch_batch_size: int = 100
+    notification_max_attempts: int = 6
+    notification_retry_base_seconds: int = 30
+    notification_retry_max_seconds: int = 1800
     anthropic_model: str = "claude-3-5-haiku-latest"
     ai_chat_provider: str = "openrouter"
     openrouter_chat_model: str = "qwen/qwen3-next-80b-a3b-instruct"
@@ -0,0 +1,149 @@
+"""HTTP conditional caching helpers (ETag / Last-Modified) for market data endpoints.
+
+Handlers derive a strong ETag from the data watermark of the payload they build
+(last bar, quote timestamps, FX snapshot version). `ValidatorRegistry` remembers
+the latest validator per resource for the freshness window, so a matching
+`If-None-Match` can be answered with 304 before the handler loads or converts
+anything. Compressed bodies get an encoding-suffixed ETag, since a strong ETag
+must identify one exact byte sequence.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+
+@dataclass(frozen=True)
+class Validator:
+    etag: str
+    last_modified: datetime | None
+    cache_control: str
+    expires_at: float
+
+
+class ValidatorRegistry:
+    def __init__(self, max_entries: int = 4096) -> None:
+        self._entries: dict[str, Validator] = {}
+        self._max_entries = max_entries
+
+    def fresh(self, key: str) -> Validator | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return entry
+
+    def remember(
+        self,
+        key: str,
+        *,
+        etag: str,
+        last_modified: datetime | None,
+        cache_control: str,
+        ttl_seconds: float,
+    ) -> Validator:
+        if len(self._entries) >= self._max_entries and key not in self._entries:
+            now = time.monotonic()
+            for stale_key in [k for k, v in self._entries.items() if v.expires_at <= now]:
+                self._entries.pop(stale_key, None)
+            if len(self._entries) >= self._max_entries:
+                self._entries.pop(next(iter(self._entries)))
+        validator = Validator(
+            etag=etag,
+            last_modified=last_modified,
+            cache_control=cache_control,
+            expires_at=time.monotonic() + ttl_seconds,
+        )
+        self._entries[key] = validator
+        return validator
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+validators = ValidatorRegistry()
+
+# Content-codings whose bodies carry their own ETag suffix (see representation_etag).
+ENCODED_ETAG_SUFFIXES = ("br", "gzip")
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def as_last_modified(value: date | datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution.
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def representation_etag(etag: str, encoding: str) -> str:
+    """ETag of one content-coding of a resource: `"<tag>-br"` for a brotli body of `"<tag>"`."""
+    if encoding == "identity":
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _resource_etag(tag: str) -> str:
+    tag = tag.removeprefix("W/")
+    for encoding in ENCODED_ETAG_SUFFIXES:
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return f'{tag[: -len(suffix)]}"'
+    return tag
+
+
+def _matching_etag(header: str, etag: str) -> str | None:
+    candidates = [item.strip() for item in header.split(",") if item.strip()]
+    if "*" in candidates:
+        return "*"
+    # If-None-Match uses weak comparison (RFC 9110 §13.1.2); any coding of the
+    # same data version is still current.
+    return next((candidate for candidate in candidates if _resource_etag(candidate) == etag), None)
+
+
+def is_not_modified(request: Request, validator: Validator) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _matching_etag(if_none_match, validator.etag) is not None
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validator.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return validator.last_modified <= since
+    return False
+
+
+def apply_validator(response: Response, validator: Validator) -> None:
+    response.headers["ETag"] = validator.etag
+    response.headers["Cache-Control"] = validator.cache_control
+    if validator.last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(validator.last_modified, usegmt=True)
+
+
+def not_modified(validator: Validator, request: Request | None = None) -> Response:
+    response = Response(status_code=304)
+    apply_validator(response, validator)
+    if request is not None:
+        # Confirm the representation the client holds, not the identity coding.
+        matched = _matching_etag(request.headers.get("if-none-match") or "", validator.etag)
+        if matched not in (None, "*"):
+            response.headers["ETag"] = matched
+    return response
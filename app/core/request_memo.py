@@ -0,0 +1,157 @@
+"""Request-scoped memoization of shared lookups.
+
+Service methods decorated with `request_memoized` run at most once per distinct
+argument set while a `request_scope()` is active (every HTTP request, via
+`RequestMemoMiddleware`). Outside a scope, e.g. in workers or startup, they run
+uncached. The scope lives in a contextvar, so nothing has to be threaded through
+service signatures, and tasks spawned during the request inherit it.
+
+Async lookups are memoized as shared tasks: concurrent callers await the same
+in-flight work, a caller that is cancelled does not cancel it for the others,
+and failures are not cached.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_MEMO: ContextVar[dict[Hashable, Any] | None] = ContextVar("request_memo", default=None)
+_UNHASHABLE = object()
+
+
+@contextmanager
+def request_scope():
+    """Activate a fresh memo for the enclosed work."""
+    token = _MEMO.set({})
+    try:
+        yield
+    finally:
+        _MEMO.reset(token)
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    try:
+        hash(value)
+    except TypeError:
+        return _UNHASHABLE
+    return value
+
+
+async def _await_shared(memo: dict, key: Hashable, future: asyncio.Future) -> Any:
+    try:
+        return await asyncio.shield(future)
+    except Exception:
+        if memo.get(key) is future:
+            memo.pop(key)
+        raise
+
+
+def request_memoized(namespace: str, *, ignore: tuple[str, ...] = ("self", "session")):
+    """Memoize a sync or async callable per request, keyed by its arguments.
+
+    Parameters named in `ignore` (the bound instance, DB sessions) are left out of
+    the key. Calls with unhashable arguments bypass the memo.
+    """
+
+    def decorate(fn: Callable[..., T]) -> Callable[..., T]:
+        signature = inspect.signature(fn)
+
+        def key_for(args: tuple, kwargs: dict) -> Hashable | None:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            parts = tuple(
+                (name, _freeze(value)) for name, value in bound.arguments.items() if name not in ignore
+            )
+            if any(part[1] is _UNHASHABLE for part in parts):
+                return None
+            return (namespace, parts)
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                memo = _MEMO.get()
+                key = None if memo is None else key_for(args, kwargs)
+                if key is None:
+                    return await fn(*args, **kwargs)
+                future = memo.get(key)
+                if future is None:
+                    future = memo[key] = asyncio.ensure_future(fn(*args, **kwargs))
+                return await _await_shared(memo, key, future)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def sync_wrapper(*args, **kwargs):
+            memo = _MEMO.get()
+            key = None if memo is None else key_for(args, kwargs)
+            if key is None:
+                return fn(*args, **kwargs)
+            if key not in memo:
+                memo[key] = fn(*args, **kwargs)
+            return memo[key]
+
+        return sync_wrapper
+
+    return decorate
+
+
+async def memoized_each(
+    namespace: str,
+    items: Iterable[Hashable],
+    fetch: Callable[[list], Awaitable[dict]],
+) -> dict:
+    """Batch lookup memoized per item: only items not yet seen in this request are fetched.
+
+    `fetch` receives the missing items and returns a mapping for those it found;
+    items it omits are remembered as absent for the rest of the request.
+    """
+    items = list(items)
+    memo = _MEMO.get()
+    if memo is None:
+        return await fetch(items)
+    missing = [item for item in items if (namespace, item) not in memo]
+    if missing:
+        batch = asyncio.ensure_future(fetch(missing))
+        for item in missing:
+            memo[(namespace, item)] = batch
+    out = {}
+    for item in items:
+        future = memo[(namespace, item)]
+        try:
+            found = await asyncio.shield(future)
+        except Exception:
+            # Forget every item of the failed batch so a later call refetches them.
+            for key in [key for key, value in memo.items() if value is future]:
+                memo.pop(key)
+            raise
+        if item in found:
+            out[item] = found[item]
+    return out
+
+
+class RequestMemoMiddleware:
+    """Pure ASGI middleware giving every HTTP request its own memo scope."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with request_scope():
+            await self.app(scope, receive, send)
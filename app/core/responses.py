@@ -0,0 +1,31 @@
+"""orjson-backed JSON response for large market data payloads.
+
+Handlers that build their payload from data we produced ourselves return this
+directly, which skips FastAPI's response_model re-validation and the generic
+JSON encoder. Pydantic models inside the content are dumped without
+re-validating; dates, datetimes and numpy values are encoded natively by orjson.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
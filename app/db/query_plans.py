@@ -0,0 +1,138 @@
+"""EXPLAIN-based regression checks for the hot lookup queries.
+
+Each entry in `hot_queries()` mirrors the statement shape issued by a service on
+a request path. `find_full_scans` runs EXPLAIN for every entry and reports plan
+steps that read a whole table (or sort outside an index) instead of seeking.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.models.alert_history import AlertHistory
+from app.models.chat_history import ChatHistory
+from app.models.normalized_market_record import NormalizedMarketRecord
+from app.models.training_job import TrainingJob
+from app.models.training_run import TrainingRun
+
+
+def hot_queries(reference_time: datetime | None = None) -> dict[str, Select]:
+    now = reference_time or datetime(2026, 1, 1)
+    return {
+        # IngestionPersistenceService.persist_historical_series
+        "normalized_historical_range": (
+            select(NormalizedMarketRecord)
+            .where(NormalizedMarketRecord.record_type == "historical")
+            .where(NormalizedMarketRecord.commodity == "gold")
+            .where(NormalizedMarketRecord.region == "us")
+            .where(NormalizedMarketRecord.period == "1y")
+            .where(NormalizedMarketRecord.observed_at >= now - timedelta(days=365))
+            .where(NormalizedMarketRecord.observed_at <= now)
+        ),
+        # IngestionPersistenceService.load_historical_series
+        "normalized_historical_read": (
+            select(
+                NormalizedMarketRecord.observed_at,
+                NormalizedMarketRecord.close_usd_per_troy_oz,
+            )
+            .where(NormalizedMarketRecord.record_type == "historical")
+            .where(NormalizedMarketRecord.commodity == "gold")
+            .where(NormalizedMarketRecord.region == "us")
+            .where(NormalizedMarketRecord.period == "1y")
+            .where(NormalizedMarketRecord.observed_at >= now - timedelta(days=365))
+            .order_by(NormalizedMarketRecord.observed_at.asc())
+        ),
+        # IngestionPersistenceService.persist_live_quotes
+        "normalized_live_quotes": (
+            select(NormalizedMarketRecord)
+            .where(NormalizedMarketRecord.record_type == "live")
+            .where(NormalizedMarketRecord.commodity.in_(["gold", "silver", "crude_oil"]))
+            .where(NormalizedMarketRecord.region == "us")
+        ),
+        # AlertService.alert_history
+        "alert_history_by_user": (
+            select(AlertHistory)
+            .where(AlertHistory.user_sub == "user-1")
+            .order_by(AlertHistory.triggered_at.desc(), AlertHistory.id.desc())
+            .limit(201)
+        ),
+        # AlertService.alert_history_page with a cursor
+        "alert_history_next_page": (
+            select(AlertHistory)
+            .where(AlertHistory.user_sub == "user-1")
+            .where(tuple_(AlertHistory.triggered_at, AlertHistory.id) < tuple_(now - timedelta(days=1), 500))
+            .order_by(AlertHistory.triggered_at.desc(), AlertHistory.id.desc())
+            .limit(201)
+        ),
+        # AIReasoningEngine._recent_user_messages
+        "chat_history_recent": (
+            select(ChatHistory)
+            .where(ChatHistory.user_id == "user-1")
+            .order_by(ChatHistory.created_at.desc())
+            .limit(6)
+        ),
+        # AIChatService.history_page with a cursor
+        "chat_history_next_page": (
+            select(ChatHistory)
+            .where(ChatHistory.user_id == "user-1")
+            .where(tuple_(ChatHistory.created_at, ChatHistory.id) < tuple_(now - timedelta(days=1), 500))
+            .order_by(ChatHistory.created_at.desc(), ChatHistory.id.desc())
+            .limit(51)
+        ),
+        # ModelRegistryService.latest_metrics
+        "training_run_latest": (
+            select(TrainingRun)
+            .where(TrainingRun.commodity == "gold")
+            .where(TrainingRun.region == "us")
+            .order_by(TrainingRun.trained_at.desc())
+            .limit(1)
+        ),
+        # TrainingJobService.get_status
+        "training_job_latest": (
+            select(TrainingJob)
+            .where(TrainingJob.commodity == "gold")
+            .where(TrainingJob.region == "us")
+            .order_by(TrainingJob.created_at.desc(), TrainingJob.id.desc())
+            .limit(1)
+        ),
+    }
+
+
+async def explain(conn: AsyncConnection, stmt: Select) -> list[str]:
+    dialect = conn.engine.dialect
+    # Literal binds keep expanding IN parameters and driver paramstyles out of the EXPLAIN text.
+    compiled = stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    if dialect.name == "sqlite":
+        rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")).all()
+        return [str(row[3]) for row in rows]
+    rows = (await conn.exec_driver_sql(f"EXPLAIN {compiled}")).all()
+    return [str(row[0]) for row in rows]
+
+
+def full_scan_steps(dialect_name: str, plan: list[str]) -> list[str]:
+    if dialect_name == "sqlite":
+        return [
+            step
+            for step in plan
+            if step.startswith("SCAN ") or "USE TEMP B-TREE" in step
+        ]
+    return [step for step in plan if "Seq Scan" in step or "Sort  (" in step]
+
+
+async def find_full_scans(
+    conn: AsyncConnection,
+    queries: dict[str, Select] | None = None,
+) -> dict[str, list[str]]:
+    """Return {query name: offending plan steps} for hot queries that do not seek an index."""
+    dialect_name = conn.engine.dialect.name
+    if dialect_name == "postgresql":
+        # Tiny seeded tables make the planner prefer seq scans regardless of indexes.
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    out: dict[str, list[str]] = {}
+    for name, stmt in (queries or hot_queries()).items():
+        offending = full_scan_steps(dialect_name, await explain(conn, stmt))
+        if offending:
+            out[name] = offending
+    return out
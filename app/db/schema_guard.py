@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 from collections.abc import Iterable
 
-from sqlalchemy import text
+from sqlalchemy import inspect, text
 from sqlalchemy.ext.asyncio import AsyncConnection
 
 logger = logging.getLogger(__name__)
@@ -19,6 +19,34 @@ REQUIRED_COLUMNS: dict[str, tuple[str, bool]] = {
     "trained_at": ("DATETIME", True),
 }
 
+# (index name, table, key columns, covering columns) for the hot read paths.
+# Covering columns only apply on PostgreSQL via INCLUDE.
+HOT_PATH_INDEXES: tuple[tuple[str, str, tuple[str, ...], tuple[str, ...]], ...] = (
+    (
+        "idx_normalized_market_records_lookup",
+        "normalized_market_records",
+        ("record_type", "commodity", "region", "period", "observed_at"),
+        (
+            "open_usd_per_troy_oz",
+            "high_usd_per_troy_oz",
+            "low_usd_per_troy_oz",
+            "close_usd_per_troy_oz",
+            "volume",
+        ),
+    ),
+    # (ts, id) keys back keyset pagination of the history listings.
+    ("idx_alert_history_user_triggered_id", "alert_history", ("user_sub", "triggered_at", "id"), ()),
+    ("idx_chat_history_user_created_id", "chat_history", ("user_id", "created_at", "id"), ()),
+    ("idx_training_runs_lookup", "training_runs", ("commodity", "region", "trained_at"), ()),
+    ("idx_training_jobs_lookup", "training_jobs", ("commodity", "region", "created_at", "id"), ()),
+)
+
+# Indexes made redundant by a wider HOT_PATH_INDEXES entry; dropped so writes stop maintaining them.
+SUPERSEDED_INDEXES: tuple[str, ...] = (
+    "idx_alert_history_user_triggered",
+    "idx_chat_history_user_created",
+)
+
 
 async def _sqlite_columns(conn: AsyncConnection, table_name: str) -> dict[str, dict[str, object]]:
     rows = (await conn.execute(text(f"PRAGMA table_info({table_name})"))).all()
@@ -220,7 +248,7 @@ async def ensure_alerts_schema(conn: AsyncConnection) -> None:
     """
     Validate and repair alert tables for older SQLite files.
     Fixes:
-    - add missing cooldown/email settings columns on `price_alerts`
+    - add missing cooldown/email settings columns on `price_alerts`, backfilling `cooldown_until`
     - add delivery tracking columns on `alert_history`
     """
     dialect = conn.engine.dialect.name
@@ -282,6 +310,16 @@ async def ensure_alerts_schema(conn: AsyncConnection) -> None:
             await conn.execute(
                 text("ALTER TABLE price_alerts ADD COLUMN email_notifications_enabled BOOLEAN NOT NULL DEFAULT 1")
             )
+        if "cooldown_until" not in columns:
+            logger.warning("schema_repair: adding missing column price_alerts.cooldown_until")
+            await conn.execute(text("ALTER TABLE price_alerts ADD COLUMN cooldown_until DATETIME"))
+            await conn.execute(
+                text(
+                    "UPDATE price_alerts SET cooldown_until = "
+                    "datetime(last_triggered_at, '+' || MAX(5, cooldown_minutes) || ' minutes') "
+                    "WHERE last_triggered_at IS NOT NULL"
+                )
+            )
 
     history_exists = (
         await conn.execute(
@@ -301,3 +339,29 @@ async def ensure_alerts_schema(conn: AsyncConnection) -> None:
             await conn.execute(
                 text("ALTER TABLE alert_history ADD COLUMN delivery_attempts INTEGER NOT NULL DEFAULT 0")
             )
+
+
+async def ensure_hot_path_indexes(conn: AsyncConnection) -> None:
+    """
+    Create composite indexes backing the hot lookup queries on existing databases.
+    `create_all` only emits model indexes for new tables, so older SQLite files and
+    PostgreSQL databases that predate the indexes are repaired here.
+    """
+    dialect = conn.engine.dialect.name
+    existing_tables = set(await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names()))
+    for name, table_name, columns, covering in HOT_PATH_INDEXES:
+        if table_name not in existing_tables:
+            continue
+        table_columns = {
+            str(col["name"])
+            for col in await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_columns(table_name))
+        }
+        if not set(columns).issubset(table_columns):
+            logger.warning("schema_check: skipped index %s (missing columns on %s)", name, table_name)
+            continue
+        ddl = f"CREATE INDEX IF NOT EXISTS {name} ON {table_name}({', '.join(columns)})"
+        if dialect == "postgresql" and covering and set(covering).issubset(table_columns):
+            ddl += f" INCLUDE ({', '.join(covering)})"
+        await conn.execute(text(ddl))
+    for name in SUPERSEDED_INDEXES:
+        await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
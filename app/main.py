@@ -6,16 +6,26 @@ from app.api import routes as api_routes
 from app.api.routes import router
 from app.api.routes_ai_chat import router as ai_chat_router
 from app.api.routes_settings import router as settings_router
+from app.core.admission import AdmissionControlMiddleware
 from app.core.auth import TokenVerificationMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.core.config import get_settings
-from app.core.secrets import AUTH_SECRETS, get_secret_value
+from app.core.secrets import AUTH_SECRETS, get_secret_value, vault
 from app.core.logging import setup_logging
+from app.core.request_memo import RequestMemoMiddleware
 from app.db.base import Base
-from app.db.schema_guard import ensure_alerts_schema, ensure_ingestion_schema, ensure_training_runs_schema, ensure_vector_extension
+from app.db.schema_guard import (
+    ensure_alerts_schema,
+    ensure_hot_path_indexes,
+    ensure_ingestion_schema,
+    ensure_training_runs_schema,
+    ensure_vector_extension,
+)
 from app.db.session import AsyncSessionLocal, engine
 # Import all models so Base.metadata includes them
-from app.models import alert_history, chat_history, ingestion_job, macro_metric_record, news_headline_record, normalized_market_record, price_alert, price_record, raw_market_payload, training_job, training_run, user_profile, user_settings  # noqa: F401
+from app.models import alert_history, chat_history, ingestion_job, macro_metric_record, news_headline_record, normalized_market_record, notification_outbox, price_alert, price_record, raw_market_payload, training_job, training_run, user_profile, user_settings, worker_lease  # noqa: F401
 from app.models import vector_models  # noqa: F401
+from app.workers.notification_dispatcher import notification_dispatcher
 from app.workers.whatsapp_alert_worker import whatsapp_alert_worker
 
 settings = get_settings()
@@ -38,6 +48,8 @@ app = FastAPI(
     description="TradeSight — Multi-region commodity market intelligence platform",
     version="2.0.0",
 )
+# Innermost: shed responses still get CORS headers, and the gate sees the verified user.
+app.add_middleware(AdmissionControlMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=list(dict.fromkeys(allow_origins)),
@@ -45,9 +57,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 app.add_middleware(SessionMiddleware, secret_key=session_secret or "dev-insecure-session-secret")
 app.add_middleware(TokenVerificationMiddleware)
+# Outermost, so auth and every handler share the request's memo scope.
+app.add_middleware(RequestMemoMiddleware)
 @app.get("/")
 async def root():
     return {
@@ -79,19 +94,29 @@ async def on_startup() -> None:
         bool(settings.auth0_domain and "your-tenant" not in settings.auth0_domain),
         bool(settings.infisical_project_id),
     )
+    vault.start()
     async with engine.begin() as conn:
         await ensure_vector_extension(conn)
         await conn.run_sync(Base.metadata.create_all)
         await ensure_training_runs_schema(conn)
         await ensure_ingestion_schema(conn)
         await ensure_alerts_schema(conn)
+        await ensure_hot_path_indexes(conn)
     async with AsyncSessionLocal() as session:
         await api_routes.service.prewarm_latest_models(session)
     if settings.whatsapp_worker_enabled:
         whatsapp_alert_worker.start()
+    if settings.notification_dispatcher_enabled:
+        notification_dispatcher.start()
+    if settings.public_live_prices_refresher_enabled:
+        api_routes.live_price_snapshots.start()
 
 
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
     if settings.whatsapp_worker_enabled:
         await whatsapp_alert_worker.stop()
+    if settings.notification_dispatcher_enabled:
+        await notification_dispatcher.stop()
+    await api_routes.live_price_snapshots.stop()
+    await vault.stop()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Float, String
+from sqlalchemy import DateTime, Float, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -10,6 +10,24 @@ from app.db.base import Base
 
 class NormalizedMarketRecord(Base):
     __tablename__ = "normalized_market_records"
+    __table_args__ = (
+        # Range scans over one series; INCLUDE lets Postgres answer OHLCV reads index-only.
+        Index(
+            "idx_normalized_market_records_lookup",
+            "record_type",
+            "commodity",
+            "region",
+            "period",
+            "observed_at",
+            postgresql_include=[
+                "open_usd_per_troy_oz",
+                "high_usd_per_troy_oz",
+                "low_usd_per_troy_oz",
+                "close_usd_per_troy_oz",
+                "volume",
+            ],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     record_type: Mapped[str] = mapped_column(String(16), index=True)
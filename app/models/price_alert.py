@@ -37,6 +37,8 @@ class PriceAlert(Base):
     email_notifications_enabled: Mapped[bool] = mapped_column(Boolean, default=True)
 
     last_triggered_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # last_triggered_at + cooldown, so the global evaluator can filter cooldowns in SQL.
+    cooldown_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
     triggered_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
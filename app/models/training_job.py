@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import JSON, DateTime, Integer, String
+from sqlalchemy import JSON, DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -11,6 +11,7 @@ from app.db.base import Base
 
 class TrainingJob(Base):
     __tablename__ = "training_jobs"
+    __table_args__ = (Index("idx_training_jobs_lookup", "commodity", "region", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     commodity: Mapped[str] = mapped_column(String(32), index=True)
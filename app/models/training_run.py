@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, String
+from sqlalchemy import DateTime, Float, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -8,6 +8,7 @@ from app.db.base import Base
 
 class TrainingRun(Base):
     __tablename__ = "training_runs"
+    __table_args__ = (Index("idx_training_runs_lookup", "commodity", "region", "trained_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     commodity: Mapped[str] = mapped_column(String(32), index=True)
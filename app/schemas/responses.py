@@ -8,6 +8,17 @@ class HealthResponse(BaseModel):
     status: str
 
 
+class AdmissionClassStats(BaseModel):
+    route_class: str
+    active: int
+    queued: int
+    max_concurrent: int
+    max_queue: int
+    admitted: int
+    shed: dict[str, int]
+    max_queue_wait_ms: float
+
+
 class ErrorDetail(BaseModel):
     code: str
     message: str
@@ -64,6 +75,39 @@ class RegionalHistoricalResponse(BaseModel):
     unit: str
     rows: int
     data: list[RegionalHistoricalPoint]
+    source_rows: Optional[int] = None
+    downsample: Optional[Literal["lttb", "ohlc"]] = None
+
+
+class RegionalHistoricalColumns(BaseModel):
+    date: list[date] | list[int]
+    open: list[Optional[float]]
+    high: list[Optional[float]]
+    low: list[Optional[float]]
+    close: list[float]
+    volume: list[Optional[float]]
+
+
+class RegionalHistoricalColumnarResponse(BaseModel):
+    commodity: str
+    region: str
+    currency: str
+    unit: str
+    rows: int
+    format: Literal["columnar"] = "columnar"
+    date_encoding: Literal["iso", "epoch_day"] = "iso"
+    columns: RegionalHistoricalColumns
+    source_rows: Optional[int] = None
+    downsample: Optional[Literal["lttb", "ohlc"]] = None
+
+
+class MultiRegionHistoricalResponse(BaseModel):
+    commodity: str
+    regions: list[str]
+    rows: int
+    series: dict[str, RegionalHistoricalResponse | RegionalHistoricalColumnarResponse]
+    source_rows: Optional[int] = None
+    downsample: Optional[Literal["lttb"]] = None
 
 
 # --- Train / Metrics ---
@@ -153,6 +197,7 @@ class MarketIntelligenceResponse(BaseModel):
     news_sentiment: Optional[Literal["bullish", "bearish", "neutral"]] = None
     news_summary: Optional[str] = None
     provenance: list[DataProvenance] = Field(default_factory=list)
+    stage_timings_ms: dict[str, float] = Field(default_factory=dict)
 
 
 class NormalizedLiveQuoteResponse(BaseModel):
@@ -179,6 +224,25 @@ class NormalizedHistoricalSeriesResponse(BaseModel):
     data: list[NormalizedHistoricalBarResponse]
 
 
+class NormalizedHistoricalColumns(BaseModel):
+    date: list[date] | list[int]
+    open_usd_per_troy_oz: list[float]
+    high_usd_per_troy_oz: list[float]
+    low_usd_per_troy_oz: list[float]
+    close_usd_per_troy_oz: list[float]
+    volume: list[Optional[float]]
+
+
+class NormalizedHistoricalColumnarResponse(BaseModel):
+    commodity: str
+    region: str
+    rows: int
+    provenance: DataProvenance
+    format: Literal["columnar"] = "columnar"
+    date_encoding: Literal["iso", "epoch_day"] = "iso"
+    columns: NormalizedHistoricalColumns
+
+
 class FeatureSnapshotResponse(BaseModel):
     commodity: str
     region: str
@@ -396,9 +460,37 @@ class AIChatResponse(BaseModel):
     generated_at: datetime
 
 
+class ChatHistoryResponse(BaseModel):
+    id: int
+    message: str
+    response: str
+    created_at: datetime
+
+
 class AIProviderStatusResponse(BaseModel):
     provider: Literal["openrouter", "disabled"]
     openrouter_model: str
     openrouter_api_key_present: bool
     openrouter_cooldown_seconds_remaining: int = Field(ge=0)
     last_openrouter_error: Optional[str] = None
+
+
+class DashboardSectionStatus(BaseModel):
+    status: Literal["ok", "partial", "timeout", "error", "skipped"]
+    elapsed_ms: float = Field(ge=0)
+    error: Optional[str] = None
+
+
+class DashboardResponse(BaseModel):
+    region: Literal["india", "us", "europe"]
+    currency: str
+    horizon_days: int = Field(ge=1, le=90)
+    as_of: datetime
+    live_prices: list[LivePriceResponse] = Field(default_factory=list)
+    sparklines: dict[str, RegionalHistoricalResponse] = Field(default_factory=dict)
+    predictions: dict[str, RegionalPredictionResponse] = Field(default_factory=dict)
+    signals: dict[str, MarketSignalResponse] = Field(default_factory=dict)
+    alerts: list[PriceAlertResponse] = Field(default_factory=list)
+    alert_history: list[AlertHistoryResponse] = Field(default_factory=list)
+    news: dict[str, CommodityNewsSummaryResponse] = Field(default_factory=dict)
+    sections: dict[str, DashboardSectionStatus]
@@ -7,12 +7,14 @@ import logging
 from typing import Any
 
 import httpx
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.secrets import AI_SECRETS, get_secret_value
 from app.models.chat_history import ChatHistory
-from app.schemas.responses import AIChatResponse
+from app.schemas.responses import AIChatResponse, ChatHistoryResponse
 from app.services.ai_reasoning_engine import AIReasoningEngine
 from app.services.vector_service import vector_service
 
@@ -85,6 +87,30 @@ class AIChatService:
             generated_at=datetime.now(timezone.utc),
         )
 
+    async def history_page(
+        self,
+        session: AsyncSession,
+        user_id: str,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[list[ChatHistoryResponse], str | None]:
+        """Newest-first chat turns after `cursor`, plus the cursor for the next page (None on the last)."""
+        limit = min(200, max(1, limit))
+        stmt = (
+            select(ChatHistory)
+            .where(ChatHistory.user_id == user_id)
+            .order_by(ChatHistory.created_at.desc(), ChatHistory.id.desc())
+        )
+        if cursor:
+            stmt = stmt.where(tuple_(ChatHistory.created_at, ChatHistory.id) < tuple_(*decode_cursor(cursor)))
+        rows = (await session.execute(stmt.limit(limit + 1))).scalars().all()
+        next_cursor = encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+        items = [
+            ChatHistoryResponse(id=row.id, message=row.message, response=row.response, created_at=row.created_at)
+            for row in rows[:limit]
+        ]
+        return items, next_cursor
+
     @staticmethod
     def isAdvisoryQuestion(question: str) -> bool:
         text = question.lower()
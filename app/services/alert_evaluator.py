@@ -0,0 +1,277 @@
+"""Global alert evaluation over sorted per-market threshold ladders.
+
+Active alerts are loaded into ladders keyed by (commodity, region): one sorted
+threshold array per trigger rule (above/below price, daily-change spike/drop, ...).
+For a new quote, the alerts whose threshold lies between the previous and the
+current observation are found with two bisects, so the work per quote grows with
+the alerts that crossed rather than with the alerts that exist. Alerts that
+entered a ladder since its last evaluation (new, re-enabled or re-priced) are
+checked against the current observation once. Candidates are then re-read in a
+single query that applies the delivery state and cooldown filters in SQL.
+
+A ladder moves past an observation only after the firings it produced are
+committed. Alerts whose firing failed or was rate-limited, and alerts that
+crossed while cooling down, are checked again on each later observation until
+they fire, so no crossing is lost.
+
+Ladders are rebuilt only when the watermark of the active alert set changes.
+"""
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Collection
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.price_alert import PriceAlert
+from app.services.market_quote_service import MarketQuote
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LadderRule:
+    # Returns None when the quote carries no value for this rule.
+    observe: Callable[[MarketQuote], float | None]
+    key: Callable[[float], float]
+    # Fires when the observation rises past the key (else when it falls past it).
+    rising: bool
+    # Whether an observation equal to the key fires.
+    inclusive: bool
+
+
+def _price(quote: MarketQuote) -> float:
+    return quote.price
+
+
+def _change(quote: MarketQuote) -> float | None:
+    return quote.daily_change_pct
+
+
+def _abs_change(quote: MarketQuote) -> float | None:
+    return None if quote.daily_change_pct is None else abs(quote.daily_change_pct)
+
+
+def _same(threshold: float) -> float:
+    return threshold
+
+
+def _negative_abs(threshold: float) -> float:
+    return -abs(threshold)
+
+
+# (channel, alert type) -> rule. Email rules mirror AlertService._is_triggered; WhatsApp
+# targets fire when the price reaches them.
+RULES: dict[tuple[str, str], LadderRule] = {
+    ("email", "above"): LadderRule(_price, _same, rising=True, inclusive=False),
+    ("email", "below"): LadderRule(_price, _same, rising=False, inclusive=False),
+    ("email", "pct_change_24h"): LadderRule(_abs_change, _same, rising=True, inclusive=True),
+    ("email", "spike"): LadderRule(_change, _same, rising=True, inclusive=True),
+    ("email", "drop"): LadderRule(_change, _negative_abs, rising=False, inclusive=True),
+    ("whatsapp", "above"): LadderRule(_price, _same, rising=True, inclusive=True),
+    ("whatsapp", "below"): LadderRule(_price, _same, rising=False, inclusive=True),
+}
+CHANGE_RULES = frozenset(rule for rule in RULES.values() if rule.observe is not _price)
+
+
+class ThresholdLadder:
+    def __init__(self, rule: LadderRule, entries: list[tuple[float, int]]) -> None:
+        entries.sort()
+        self.rule = rule
+        self.keys = [key for key, _ in entries]
+        self.ids = [alert_id for _, alert_id in entries]
+        self.last: float | None = None
+        self.fresh: dict[int, float] = {}
+
+    def _cut(self, observed: float) -> int:
+        """Split point between fired and unfired keys: fired is ids[:cut] when rising, ids[cut:] otherwise."""
+        if self.rule.rising:
+            return bisect_right(self.keys, observed) if self.rule.inclusive else bisect_left(self.keys, observed)
+        return bisect_left(self.keys, observed) if self.rule.inclusive else bisect_right(self.keys, observed)
+
+    def _fires(self, key: float, observed: float) -> bool:
+        if self.rule.rising:
+            return key <= observed if self.rule.inclusive else key < observed
+        return key >= observed if self.rule.inclusive else key > observed
+
+    def crossed(self, observed: float) -> list[int]:
+        """Ids that crossed their threshold since the previous observation, plus fresh ids that fire now.
+
+        Does not move the ladder; `advance` records the observation once the firings are stored.
+        """
+        cut = self._cut(observed)
+        if self.last is None:
+            return self.ids[:cut] if self.rule.rising else self.ids[cut:]
+        previous = self._cut(self.last)
+        out = self.ids[previous:cut] if self.rule.rising else self.ids[cut:previous]
+        out.extend(alert_id for alert_id, key in self.fresh.items() if self._fires(key, observed))
+        return out
+
+    def advance(self, observed: float, retry: Collection[int] = ()) -> None:
+        """Make `observed` the previous observation; ids in `retry` are checked again on the next one."""
+        self.last = observed
+        self.fresh = {alert_id: key for key, alert_id in zip(self.keys, self.ids) if alert_id in retry} if retry else {}
+
+
+class AlertEvaluator:
+    def __init__(self, shard_count: int = 1) -> None:
+        # Alerts belong to shard `id % shard_count`; see ShardLeaseService.
+        self.shard_count = max(1, shard_count)
+        # (commodity, region) -> (channel, alert type) -> ladder
+        self._ladders: dict[tuple[str, str], dict[tuple[str, str], ThresholdLadder]] = {}
+        self._watermark: tuple | None = None
+
+    def _active_filter(self, shards: frozenset[int] | None):
+        email = and_(PriceAlert.whatsapp_number.is_(None), PriceAlert.enabled.is_(True))
+        whatsapp = and_(
+            PriceAlert.whatsapp_number.is_not(None),
+            PriceAlert.is_active.is_(True),
+            PriceAlert.is_triggered.is_(False),
+            PriceAlert.direction.in_(("above", "below")),
+        )
+        active = or_(email, whatsapp)
+        if shards is None:
+            return active
+        return and_(active, (PriceAlert.id % self.shard_count).in_(sorted(shards)))
+
+    async def refresh(self, session: AsyncSession, shards: frozenset[int] | None = None) -> bool:
+        """Rebuild the ladders if the active alert set changed; returns whether it did.
+
+        `shards` limits the ladders to the alerts of those shards (all alerts when None).
+        Every ORM write bumps `updated_at`, so firing an email alert (which moves its
+        cooldown) also triggers a rebuild; the rebuild keeps each ladder's last
+        observation, so it costs one query and no re-evaluation.
+        """
+        row = (
+            await session.execute(
+                select(
+                    func.count(PriceAlert.id),
+                    func.max(PriceAlert.id),
+                    func.sum(PriceAlert.threshold),
+                    func.sum(PriceAlert.target_price),
+                    # Catches edits the sums miss, e.g. +10 on one alert and -10 on another.
+                    func.max(PriceAlert.updated_at),
+                ).where(self._active_filter(shards))
+            )
+        ).one()
+        watermark = (*row, shards)
+        if watermark == self._watermark:
+            return False
+
+        rows = (
+            await session.execute(
+                select(
+                    PriceAlert.id,
+                    PriceAlert.commodity,
+                    PriceAlert.region,
+                    PriceAlert.alert_type,
+                    PriceAlert.direction,
+                    PriceAlert.threshold,
+                    PriceAlert.target_price,
+                    PriceAlert.whatsapp_number,
+                ).where(self._active_filter(shards))
+            )
+        ).all()
+        grouped: dict[tuple[str, str], dict[tuple[str, str], list[tuple[float, int]]]] = {}
+        for alert_id, commodity, region, alert_type, direction, threshold, target_price, whatsapp_number in rows:
+            if whatsapp_number:
+                name, value = ("whatsapp", direction), float(target_price or threshold)
+            else:
+                name, value = ("email", alert_type), float(threshold)
+            rule = RULES.get(name)
+            if rule is None:
+                continue
+            grouped.setdefault((commodity, region), {}).setdefault(name, []).append((rule.key(value), alert_id))
+
+        ladders: dict[tuple[str, str], dict[tuple[str, str], ThresholdLadder]] = {}
+        for market, by_rule in grouped.items():
+            for name, entries in by_rule.items():
+                ladder = ThresholdLadder(RULES[name], entries)
+                previous = self._ladders.get(market, {}).get(name)
+                if previous is not None:
+                    # Keep the last observation so only new or re-priced entries are checked in full.
+                    unchecked = {(key, alert_id) for alert_id, key in previous.fresh.items()}
+                    known = set(zip(previous.keys, previous.ids)) - unchecked
+                    ladder.last = previous.last
+                    ladder.fresh = {
+                        alert_id: key for key, alert_id in zip(ladder.keys, ladder.ids) if (key, alert_id) not in known
+                    }
+                ladders.setdefault(market, {})[name] = ladder
+        self._ladders = ladders
+        self._watermark = watermark
+        logger.info("alert_index_rebuilt alerts=%s markets=%s", len(rows), len(ladders))
+        return True
+
+    def markets(self) -> list[tuple[str, str]]:
+        return sorted(self._ladders)
+
+    def _observed(self, quote: MarketQuote, rules: Collection[LadderRule] | None):
+        """(ladder, observation) for the ladders of `quote`'s market that `rules` selects and `quote` has a value for."""
+        for ladder in self._ladders.get((quote.commodity, quote.region), {}).values():
+            if rules is not None and ladder.rule not in rules:
+                continue
+            observed = ladder.rule.observe(quote)
+            if observed is not None:
+                yield ladder, observed
+
+    def candidates(self, quote: MarketQuote, rules: Collection[LadderRule] | None = None) -> list[int]:
+        """Alert ids whose rule fired for `quote` since the market's previous observation.
+
+        Only ladders whose rule is in `rules` (all when None) and which `quote` has a
+        value for are consulted. Nothing moves until `advance`.
+        """
+        out: list[int] = []
+        for ladder, observed in self._observed(quote, rules):
+            out.extend(ladder.crossed(observed))
+        return out
+
+    def advance(
+        self,
+        quote: MarketQuote,
+        rules: Collection[LadderRule] | None = None,
+        retry: Collection[int] = (),
+    ) -> None:
+        """Record `quote` as the market's previous observation once its firings are committed.
+
+        Alerts in `retry` (rate-limited or failed) are checked against the next quote again.
+        """
+        for ladder, observed in self._observed(quote, rules):
+            ladder.advance(observed, retry)
+
+    async def triggered(
+        self,
+        session: AsyncSession,
+        quote: MarketQuote,
+        rules: Collection[LadderRule] | None = None,
+        ids: Collection[int] | None = None,
+    ) -> list[PriceAlert]:
+        """Candidate alerts for `quote` that are still deliverable and out of cooldown.
+
+        `ids` are the candidates when the caller already computed them.
+        """
+        if ids is None:
+            ids = self.candidates(quote, rules)
+        if not ids:
+            return []
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        email_ready = and_(
+            PriceAlert.whatsapp_number.is_(None),
+            PriceAlert.enabled.is_(True),
+            or_(PriceAlert.cooldown_until.is_(None), PriceAlert.cooldown_until <= now),
+        )
+        whatsapp_ready = and_(
+            PriceAlert.whatsapp_number.is_not(None),
+            PriceAlert.is_active.is_(True),
+            PriceAlert.is_triggered.is_(False),
+        )
+        result = await session.execute(
+            select(PriceAlert)
+            .where(PriceAlert.id.in_(ids))
+            .where(or_(email_ready, whatsapp_ready))
+            .order_by(PriceAlert.id.asc())
+        )
+        return list(result.scalars().all())
@@ -1,33 +1,40 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterator
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import delete, select
+from sqlalchemy import Select, delete, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import decode_cursor, encode_cursor
 from app.models.alert_history import AlertHistory
 from app.models.price_alert import PriceAlert
-from app.models.user_profile import UserProfile
 from app.schemas.responses import (
     AlertCreateRequest,
     AlertEvaluationResponse,
     AlertHistoryResponse,
     AlertUpdateRequest,
     PriceAlertResponse,
+    UserProfileResponse,
     WhatsAppAlertCreateRequest,
     WhatsAppAlertResponse,
 )
 from app.services.market_quote_service import ALERT_COMMODITY_UNITS
-from app.services.email_service import EmailService
-from app.services.market_quote_service import MarketQuoteService
+from app.services.market_quote_service import MarketQuote, MarketQuoteService
+from app.services.notification_outbox_service import QUEUED, NotificationOutboxService
 from app.services.price_conversion import REGION_CURRENCY
+from app.services.profile_service import ProfileService
+
+# Rows fetched per round-trip when streaming history exports.
+HISTORY_STREAM_BATCH = 500
 
 
 class AlertService:
     def __init__(self) -> None:
         self.market = MarketQuoteService()
-        self.email = EmailService()
+        self.profiles = ProfileService()
+        self.outbox = NotificationOutboxService()
 
     async def list_alerts(self, session: AsyncSession, user_sub: str) -> list[PriceAlertResponse]:
         result = await session.execute(
@@ -97,6 +104,7 @@ class AlertService:
             alert.is_active = payload.enabled
         if payload.cooldown_minutes is not None:
             alert.cooldown_minutes = payload.cooldown_minutes
+            alert.cooldown_until = self._cooldown_until(alert)
         if payload.email_notifications_enabled is not None:
             alert.email_notifications_enabled = payload.email_notifications_enabled
         await session.commit()
@@ -158,6 +166,89 @@ class AlertService:
         search: str | None = None,
         limit: int = 200,
     ) -> list[AlertHistoryResponse]:
+        items, _ = await self.alert_history_page(
+            session,
+            user_sub,
+            commodity=commodity,
+            alert_type=alert_type,
+            email_status=email_status,
+            start_at=start_at,
+            end_at=end_at,
+            search=search,
+            limit=limit,
+        )
+        return items
+
+    async def alert_history_page(
+        self,
+        session: AsyncSession,
+        user_sub: str,
+        commodity: str | None = None,
+        alert_type: str | None = None,
+        email_status: str | None = None,
+        start_at: datetime | None = None,
+        end_at: datetime | None = None,
+        search: str | None = None,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> tuple[list[AlertHistoryResponse], str | None]:
+        """One page of history after `cursor`, plus the cursor for the next page (None on the last)."""
+        limit = min(1000, max(1, limit))
+        stmt = self._history_query(
+            user_sub,
+            commodity=commodity,
+            alert_type=alert_type,
+            email_status=email_status,
+            start_at=start_at,
+            end_at=end_at,
+            search=search,
+        )
+        if cursor:
+            stmt = stmt.where(tuple_(AlertHistory.triggered_at, AlertHistory.id) < tuple_(*decode_cursor(cursor)))
+        # One extra row tells whether another page exists without a COUNT.
+        rows = (await session.execute(stmt.limit(limit + 1))).scalars().all()
+        next_cursor = encode_cursor(rows[limit - 1].triggered_at, rows[limit - 1].id) if len(rows) > limit else None
+        return [self._to_history_response(row) for row in rows[:limit]], next_cursor
+
+    async def stream_alert_history(
+        self,
+        session: AsyncSession,
+        user_sub: str,
+        commodity: str | None = None,
+        alert_type: str | None = None,
+        email_status: str | None = None,
+        start_at: datetime | None = None,
+        end_at: datetime | None = None,
+        search: str | None = None,
+    ) -> AsyncIterator[AlertHistory]:
+        """Yield every matching row through a server-side cursor, HISTORY_STREAM_BATCH rows at a time."""
+        stmt = self._history_query(
+            user_sub,
+            commodity=commodity,
+            alert_type=alert_type,
+            email_status=email_status,
+            start_at=start_at,
+            end_at=end_at,
+            search=search,
+        ).execution_options(yield_per=HISTORY_STREAM_BATCH)
+        rows = await session.stream_scalars(stmt)
+        try:
+            async for row in rows:
+                yield row
+        finally:
+            await rows.close()
+
+    @staticmethod
+    def _history_query(
+        user_sub: str,
+        *,
+        commodity: str | None,
+        alert_type: str | None,
+        email_status: str | None,
+        start_at: datetime | None,
+        end_at: datetime | None,
+        search: str | None,
+    ) -> Select:
         stmt = select(AlertHistory).where(AlertHistory.user_sub == user_sub)
         if commodity:
             stmt = stmt.where(AlertHistory.commodity == commodity)
@@ -171,10 +262,7 @@ class AlertService:
             stmt = stmt.where(AlertHistory.triggered_at <= end_at)
         if search:
             stmt = stmt.where(AlertHistory.message.ilike(f"%{search.strip()}%"))
-        stmt = stmt.order_by(AlertHistory.triggered_at.desc()).limit(min(1000, max(1, limit)))
-        result = await session.execute(stmt)
-        rows = result.scalars().all()
-        return [self._to_history_response(row) for row in rows]
+        return stmt.order_by(AlertHistory.triggered_at.desc(), AlertHistory.id.desc())
 
     async def evaluate_user_alerts(
         self,
@@ -189,12 +277,15 @@ class AlertService:
             .order_by(PriceAlert.created_at.desc())
         )
         alerts = result.scalars().all()
+        quotes = await self.market.fetch_quotes(
+            ((alert.commodity, alert.region) for alert in alerts),
+            cycle="user",
+        )
 
         events: list[AlertHistoryResponse] = []
         for alert in alerts:
-            try:
-                quote = await asyncio.to_thread(self.market.fetch_quote, alert.commodity, alert.region)
-            except Exception:
+            quote = quotes.get((alert.commodity, alert.region))
+            if quote is None:
                 # Skip evaluation for this alert when quote provider is unavailable.
                 continue
             observed = quote.price if alert.alert_type in {"above", "below"} else quote.daily_change_pct
@@ -207,44 +298,75 @@ class AlertService:
             if alert.last_triggered_at and (datetime.utcnow() - alert.last_triggered_at) < timedelta(minutes=cooldown_minutes):
                 continue
 
-            descriptor = (
-                f"{alert.commodity.replace('_', ' ').title()} {alert.alert_type.replace('_', ' ')} alert: "
-                f"observed {observed:.2f} {'%' if alert.alert_type in {'pct_change_24h', 'spike', 'drop'} else quote.currency} "
-                f"vs threshold {alert.threshold:.2f}"
-            )
-            subject = f"Commodity Alert: {alert.commodity.replace('_', ' ').title()}"
-            market_context = f"{alert.region.upper()} market, current {quote.price:.2f} {quote.currency}, daily move {quote.daily_change_pct:.2f}%"
-            email_result = await self.email.send_alert(
-                user_email or alert.user_email,
-                subject,
-                descriptor,
-                market_context=market_context,
-                send_enabled=alert.email_notifications_enabled,
-            )
-
-            alert.last_triggered_at = datetime.now(timezone.utc).replace(tzinfo=None)
-            event = AlertHistory(
-                alert_id=alert.id,
-                user_sub=user_sub,
-                commodity=alert.commodity,
-                region=alert.region,
-                currency=quote.currency,
-                alert_type=alert.alert_type,
-                threshold=alert.threshold,
-                observed_value=observed,
-                message=descriptor,
-                email_status=email_result.status,
-                delivery_provider=email_result.provider,
-                delivery_error=email_result.error,
-                delivery_attempts=email_result.attempts,
-            )
-            session.add(event)
-            await session.flush()
+            event = await self.fire_alert(session, alert, quote, user_email=user_email)
             events.append(self._to_history_response(event))
 
         await session.commit()
         return AlertEvaluationResponse(checked=len(alerts), triggered=len(events), events=events)
 
+    async def fire_alert(
+        self,
+        session: AsyncSession,
+        alert: PriceAlert,
+        quote: MarketQuote,
+        user_email: str | None = None,
+    ) -> AlertHistory:
+        """Start the cooldown, record the history row and queue its email in the caller's transaction.
+
+        Nothing is sent here; NotificationDispatcher delivers the outbox row.
+        """
+        observed = quote.price if alert.alert_type in {"above", "below"} else quote.daily_change_pct
+        descriptor = (
+            f"{alert.commodity.replace('_', ' ').title()} {alert.alert_type.replace('_', ' ')} alert: "
+            f"observed {observed:.2f} {'%' if alert.alert_type in {'pct_change_24h', 'spike', 'drop'} else quote.currency} "
+            f"vs threshold {alert.threshold:.2f}"
+        )
+        subject = f"Commodity Alert: {alert.commodity.replace('_', ' ').title()}"
+        daily_move = "n/a" if quote.daily_change_pct is None else f"{quote.daily_change_pct:.2f}%"
+        market_context = f"{alert.region.upper()} market, current {quote.price:.2f} {quote.currency}, daily move {daily_move}"
+        recipient = user_email or alert.user_email
+        if not alert.email_notifications_enabled:
+            email_status = "skipped:disabled"
+        elif not recipient:
+            email_status = "skipped:no-recipient"
+        else:
+            email_status = QUEUED
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        alert.last_triggered_at = now
+        alert.cooldown_until = self._cooldown_until(alert)
+        event = AlertHistory(
+            alert_id=alert.id,
+            user_sub=alert.user_sub,
+            commodity=alert.commodity,
+            region=alert.region,
+            currency=quote.currency,
+            alert_type=alert.alert_type,
+            threshold=alert.threshold,
+            observed_value=observed,
+            message=descriptor,
+            email_status=email_status,
+        )
+        session.add(event)
+        await session.flush()
+        if email_status == QUEUED:
+            await self.outbox.enqueue(
+                session,
+                event,
+                channel="email",
+                recipient=recipient,
+                subject=subject,
+                body=descriptor,
+                market_context=market_context,
+            )
+        return event
+
+    @staticmethod
+    def _cooldown_until(alert: PriceAlert) -> datetime | None:
+        if alert.last_triggered_at is None:
+            return None
+        return alert.last_triggered_at + timedelta(minutes=max(5, int(alert.cooldown_minutes or 30)))
+
     def _is_triggered(self, alert_type: str, observed: float, threshold: float) -> bool:
         if alert_type == "above":
             return observed > threshold
@@ -312,6 +434,5 @@ class AlertService:
             triggered_at=row.triggered_at,
         )
 
-    async def _profile(self, session: AsyncSession, user_sub: str) -> UserProfile | None:
-        result = await session.execute(select(UserProfile).where(UserProfile.user_sub == user_sub).limit(1))
-        return result.scalar_one_or_none()
+    async def _profile(self, session: AsyncSession, user_sub: str) -> UserProfileResponse | None:
+        return await self.profiles.get(session, user_sub)
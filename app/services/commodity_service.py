@@ -9,20 +9,24 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import get_settings
 from app.core.exceptions import CommodityNotSupportedError, TrainingError
 from app.models.training_run import TrainingRun
+from app.schemas.market_data import NormalizedHistoricalSeries, NormalizedLiveQuote
 from app.schemas.responses import (
     LivePriceResponse,
+    MultiRegionHistoricalResponse,
+    RegionalHistoricalColumnarResponse,
     RegionalHistoricalResponse,
     RegionalPredictionResponse,
     TrainResponse,
 )
+from app.services.downsampling import DOWNSAMPLE_METHODS, downsample_points
 from app.services.feature_store_service import FeatureStoreService
 from app.services.forecast_service import ForecastService
-from app.services.fx_cache import get_fx_rates
+from app.services.fx_cache import fx_snapshot_version, get_cached_historical, get_fx_rates, set_cached_historical
 from app.services.ingestion_service import MarketIngestionService
 from app.services.ingestion_persistence_service import IngestionPersistenceService
 from app.services.ingestion_replay_service import IngestionReplayService
 from app.services.model_registry_service import ModelRegistryService
-from app.services.normalization_service import MarketDataNormalizationService
+from app.services.normalization_service import MarketDataNormalizationService, validate_layout
 from app.services.price_conversion import REGION_CURRENCY, REGION_UNIT, convert_price, troy_oz_to_grams
 from app.services.training_job_service import TrainingJobService
 from app.services.training_service import TrainingService
@@ -131,14 +135,120 @@ class CommodityService:
         region: str,
         period: str = "1y",
         session: AsyncSession | None = None,
-    ) -> RegionalHistoricalResponse:
+        points: int | None = None,
+        downsample: str = "lttb",
+        format: str = "rows",
+        date_encoding: str = "iso",
+    ) -> RegionalHistoricalResponse | RegionalHistoricalColumnarResponse:
         self._validate(commodity)
         region = self._validate_region(region)
         valid_ranges = {"1m", "6m", "1y", "5y", "max"}
         if period not in valid_ranges:
             raise ValueError(f"Invalid range {period!r}. Must be one of {sorted(valid_ranges)}")
+        if downsample not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"Invalid downsample {downsample!r}. Must be one of {list(DOWNSAMPLE_METHODS)}")
+        validate_layout(format, date_encoding)
 
         fx = get_fx_rates()
+        series = await self.historical_series(commodity, region=region, period=period, session=session)
+        if points is None or points >= len(series.bars):
+            return self.normalization_service.to_historical_response(
+                series=series,
+                fx_rates=fx,
+                fx_history=self.fetcher.get_fx_history(region=region, period=period),
+                format=format,
+                date_encoding=date_encoding,
+            )
+
+        # Downsampled responses are reused until the series gains a bar, the FX rates change or
+        # the entry is evicted; `points` is client-chosen, so the cache is a bounded LRU.
+        last_bar = series.bars[-1]
+        watermark = (last_bar.date, len(series.bars), last_bar.close_usd_per_troy_oz)
+        cache_key = f"downsampled:{commodity}_{region}:{period}:{downsample}:{points}:{fx_snapshot_version()}"
+        cached = get_cached_historical(cache_key)
+        if cached is not None and cached[0] == watermark:
+            return self._with_layout(cached[1], format, date_encoding)
+        full = self.normalization_service.to_historical_response(
+            series=series,
+            fx_rates=fx,
+            fx_history=self.fetcher.get_fx_history(region=region, period=period),
+        )
+        data = downsample_points(full.data, points, downsample)
+        response = full.model_copy(
+            update={"data": data, "rows": len(data), "source_rows": full.rows, "downsample": downsample}
+        )
+        set_cached_historical(cache_key, (watermark, response))
+        return self._with_layout(response, format, date_encoding)
+
+    async def historical_regions(
+        self,
+        commodity: str,
+        regions: list[str],
+        period: str = "1y",
+        session: AsyncSession | None = None,
+        points: int | None = None,
+        format: str = "rows",
+        date_encoding: str = "iso",
+    ) -> MultiRegionHistoricalResponse:
+        """Historical series for several regions from one canonical USD load and one FX alignment."""
+        self._validate(commodity)
+        regions = list(dict.fromkeys(self._validate_region(region) for region in regions))
+        if not regions:
+            raise ValueError("At least one region is required")
+        valid_ranges = {"1m", "6m", "1y", "5y", "max"}
+        if period not in valid_ranges:
+            raise ValueError(f"Invalid range {period!r}. Must be one of {sorted(valid_ranges)}")
+        validate_layout(format, date_encoding)
+
+        fx = get_fx_rates()
+        # Every region is priced off the same COMEX USD series; "us" is its canonical cache.
+        series = await self.historical_series(commodity, region="us", period=period, session=session)
+        fx_histories = {
+            region: self.fetcher.get_fx_history(region=region, period=period) for region in regions if region != "us"
+        }
+        return self.normalization_service.to_multi_region_response(
+            series=series,
+            regions=regions,
+            fx_rates=fx,
+            fx_histories=fx_histories,
+            points=points,
+            format=format,
+            date_encoding=date_encoding,
+        )
+
+    def _with_layout(
+        self,
+        response: RegionalHistoricalResponse,
+        format: str,
+        date_encoding: str,
+    ) -> RegionalHistoricalResponse | RegionalHistoricalColumnarResponse:
+        if format == "columnar":
+            return self.normalization_service.to_columnar(response, date_encoding)
+        return response
+
+    async def historical_series(
+        self,
+        commodity: str,
+        region: str,
+        period: str = "1y",
+        session: AsyncSession | None = None,
+    ) -> NormalizedHistoricalSeries:
+        """
+        Load a canonical USD series for a range.
+        With `historical_db_reads_enabled`, fresh persisted ranges are served from the database
+        so replicas do not need a warm local cache; otherwise (or on a miss) the fetcher is used
+        and its result persisted.
+        """
+        if session is not None and self.settings.historical_db_reads_enabled:
+            persisted = await self.ingestion_persistence_service.load_historical_series(
+                session,
+                commodity=commodity,
+                region=region,
+                period=period,
+                max_staleness_days=self.settings.historical_db_max_staleness_days,
+            )
+            if persisted is not None:
+                return persisted
         series = self.ingestion_service.load_historical_series(commodity=commodity, region=region, period=period)
         if session is not None:
             await self.ingestion_persistence_service.persist_historical_series(
@@ -146,11 +256,7 @@ class CommodityService:
                 series=series,
                 period=period,
             )
-        return self.normalization_service.to_historical_response(
-            series=series,
-            fx_rates=fx,
-            fx_history=self.fetcher.get_fx_history(region=region, period=period),
-        )
+        return series
 
     async def train(
         self, session: AsyncSession, commodity: str, region: str, horizon: int = 1, job_id: int | None = None
@@ -224,13 +330,25 @@ class CommodityService:
         await self.model_registry_service.prewarm_latest_models(session, self.commodities, self.regions)
 
     async def predict(
-        self, session: AsyncSession, commodity: str, region: str, horizon: int = 1
+        self,
+        session: AsyncSession,
+        commodity: str,
+        region: str,
+        horizon: int = 1,
+        *,
+        series: NormalizedHistoricalSeries | None = None,
+        live_quotes: dict[str, NormalizedLiveQuote] | None = None,
+        features: pd.DataFrame | None = None,
     ) -> RegionalPredictionResponse:
+        """Forecast for one commodity/region; callers that already hold the 1y series, live
+        quotes or its materialized online features can pass them in to skip recomputing."""
         self._validate(commodity)
         region = self._validate_region(region)
-        series = self.ingestion_service.load_historical_series(commodity=commodity, region=region)
+        if series is None:
+            series = self.ingestion_service.load_historical_series(commodity=commodity, region=region)
         fx = get_fx_rates()
-        live_quotes = await self.ingestion_service.fetch_live_quotes([commodity])
+        if live_quotes is None:
+            live_quotes = await self.ingestion_service.fetch_live_quotes([commodity])
         live_quote = live_quotes.get(commodity)
         current_spot_usd_oz = (
             float(live_quote.price_usd_per_troy_oz)
@@ -252,4 +370,5 @@ class CommodityService:
             current_spot_usd_oz=current_spot_usd_oz,
             spot_timestamp=spot_timestamp,
             latest_metrics_loader=self.latest_metrics,
+            features=features,
         )
@@ -0,0 +1,291 @@
+"""Server-side fan-out for the dashboard.
+
+One request computes every dashboard section concurrently. Inputs several sections
+need (live quotes, the 1y series per commodity, forecasts) are computed once per
+build and shared. Each section has its own deadline, and a section that fails or
+times out is reported in `sections` instead of failing the whole payload.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from app.db.session import AsyncSessionLocal
+from app.schemas.responses import DashboardResponse, DashboardSectionStatus
+from app.services.alert_service import AlertService
+from app.services.commodity_service import CommodityService
+from app.services.fx_cache import get_fx_rates
+from app.services.market_quote_service import ALERT_COMMODITY_SYMBOLS
+from app.services.market_signal_service import MarketSignalService
+from app.services.news_persistence_service import NewsPersistenceService
+from app.services.news_service import CommodityNewsService
+from app.services.price_conversion import REGION_CURRENCY
+
+DASHBOARD_SECTIONS = ("live_prices", "sparklines", "predictions", "signals", "alerts", "news")
+SPARKLINE_DAYS = 31
+ALERT_HISTORY_LIMIT = 10
+logger = logging.getLogger(__name__)
+
+
+class _SharedInputs:
+    """Intermediates computed at most once per build.
+
+    Sections await shielded tasks, so a section hitting its deadline does not cancel
+    work another section is still waiting on. DB sessions are drawn through one
+    semaphore so a single dashboard cannot drain the connection pool.
+    """
+
+    def __init__(self, session_factory, db_concurrency: int) -> None:
+        self._tasks: dict[str, asyncio.Future] = {}
+        self._session_factory = session_factory
+        self._db = asyncio.Semaphore(max(1, db_concurrency))
+
+    async def get(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(factory())
+        return await asyncio.shield(task)
+
+    @asynccontextmanager
+    async def session(self):
+        async with self._db:
+            async with self._session_factory() as session:
+                yield session
+
+    def close(self) -> None:
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Mark failures as retrieved; the owning section already reported them.
+                task.exception()
+
+
+class DashboardService:
+    def __init__(
+        self,
+        *,
+        commodity_service: CommodityService,
+        market_signal_service: MarketSignalService,
+        alert_service: AlertService,
+        news_service: CommodityNewsService,
+        news_persistence_service: NewsPersistenceService,
+        session_factory=AsyncSessionLocal,
+    ) -> None:
+        self.commodity_service = commodity_service
+        self.market_signal_service = market_signal_service
+        self.alert_service = alert_service
+        self.news_service = news_service
+        self.news_persistence_service = news_persistence_service
+        self.session_factory = session_factory
+        self.settings = commodity_service.settings
+
+    @staticmethod
+    def parse_sections(sections: str | None) -> list[str]:
+        if not sections:
+            return list(DASHBOARD_SECTIONS)
+        requested = {item.strip() for item in sections.split(",") if item.strip()}
+        unknown = sorted(requested - set(DASHBOARD_SECTIONS))
+        if unknown:
+            raise ValueError(f"Unknown dashboard sections {unknown}. Must be a subset of {list(DASHBOARD_SECTIONS)}")
+        return [name for name in DASHBOARD_SECTIONS if name in requested]
+
+    async def build(
+        self,
+        *,
+        user_sub: str,
+        region: str,
+        horizon: int,
+        sections: list[str] | None = None,
+        timeout_seconds: float | None = None,
+    ) -> DashboardResponse:
+        region = self.commodity_service._validate_region(region)
+        names = list(DASHBOARD_SECTIONS) if sections is None else sections
+        timeout = self.settings.dashboard_section_timeout_seconds if timeout_seconds is None else timeout_seconds
+        shared = _SharedInputs(self.session_factory, self.settings.dashboard_db_concurrency)
+        fx = get_fx_rates()
+        builders = {
+            "live_prices": lambda: self._live_prices(shared, region, fx),
+            "sparklines": lambda: self._sparklines(shared, region, fx),
+            "predictions": lambda: self._per_commodity(
+                lambda commodity: self._prediction(shared, commodity, region, horizon)
+            ),
+            "signals": lambda: self._per_commodity(
+                lambda commodity: self._signal(shared, commodity, region, horizon, fx)
+            ),
+            "alerts": lambda: self._alerts(shared, user_sub),
+            "news": lambda: self._news(shared),
+        }
+        try:
+            results = await asyncio.gather(*(self._run_section(name, builders[name](), timeout) for name in names))
+        finally:
+            shared.close()
+
+        payload: dict[str, Any] = {}
+        statuses = {name: DashboardSectionStatus(status="skipped", elapsed_ms=0.0) for name in DASHBOARD_SECTIONS}
+        for name, (value, status) in zip(names, results):
+            statuses[name] = status
+            if value is None:
+                continue
+            if name == "alerts":
+                payload["alerts"], payload["alert_history"] = value
+            else:
+                payload[name] = value
+        return DashboardResponse(
+            region=region,
+            currency=REGION_CURRENCY[region],
+            horizon_days=horizon,
+            as_of=datetime.now(timezone.utc),
+            sections=statuses,
+            **payload,
+        )
+
+    async def _run_section(self, name: str, work: Awaitable, timeout: float) -> tuple[Any, DashboardSectionStatus]:
+        started = time.perf_counter()
+
+        def _status(status: str, error: str | None = None) -> DashboardSectionStatus:
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+            return DashboardSectionStatus(status=status, elapsed_ms=elapsed_ms, error=error)
+
+        try:
+            value, errors = await asyncio.wait_for(work, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Dashboard section %s timed out after %.1fs", name, timeout)
+            return None, _status("timeout", f"Section exceeded {timeout:g}s")
+        except Exception as exc:
+            logger.warning("Dashboard section %s failed: %s", name, exc)
+            return None, _status("error", str(exc))
+        if not errors:
+            return value, _status("ok")
+        return value, _status("partial" if value else "error", "; ".join(errors))
+
+    async def _per_commodity(self, build: Callable[[str], Awaitable[Any]]) -> tuple[dict[str, Any], list[str]]:
+        commodities = self.commodity_service.commodities
+        results = await asyncio.gather(*(build(commodity) for commodity in commodities), return_exceptions=True)
+        out: dict[str, Any] = {}
+        errors: list[str] = []
+        for commodity, result in zip(commodities, results):
+            if isinstance(result, Exception):
+                errors.append(f"{commodity}: {result}")
+            elif result is not None:
+                out[commodity] = result
+        return out, errors
+
+    # Shared inputs
+
+    async def _quotes(self, shared: _SharedInputs) -> dict:
+        return await shared.get(
+            "quotes",
+            lambda: self.commodity_service.ingestion_service.fetch_live_quotes(self.commodity_service.commodities),
+        )
+
+    async def _series(self, shared: _SharedInputs, commodity: str, region: str):
+        return await shared.get(
+            f"series:{commodity}",
+            lambda: asyncio.to_thread(
+                self.commodity_service.ingestion_service.load_historical_series,
+                commodity=commodity,
+                region=region,
+                period="1y",
+            ),
+        )
+
+    async def _live_rows(self, shared: _SharedInputs, region: str, fx: dict[str, float]) -> list:
+        quotes = await self._quotes(shared)
+        normalization = self.commodity_service.normalization_service
+        return [
+            normalization.to_live_price_response(quote=quotes[commodity], region=region, fx_rates=fx)
+            for commodity in self.commodity_service.commodities
+            if commodity in quotes
+        ]
+
+    async def _prediction(self, shared: _SharedInputs, commodity: str, region: str, horizon: int):
+        async def _build():
+            series = await self._series(shared, commodity, region)
+            try:
+                quotes = await self._quotes(shared)
+            except Exception:
+                # The forecast anchors on the last close when no live quote is available.
+                quotes = {}
+            async with shared.session() as session:
+                return await self.commodity_service.predict(
+                    session,
+                    commodity,
+                    region=region,
+                    horizon=horizon,
+                    series=series,
+                    live_quotes=quotes,
+                )
+
+        return await shared.get(f"prediction:{commodity}", _build)
+
+    # Sections
+
+    async def _live_prices(self, shared: _SharedInputs, region: str, fx: dict[str, float]):
+        rows = await self._live_rows(shared, region, fx)
+        if not rows:
+            raise RuntimeError("Live prices unavailable from all providers")
+        return rows, []
+
+    async def _sparklines(self, shared: _SharedInputs, region: str, fx: dict[str, float]):
+        fetcher = self.commodity_service.fetcher
+        fx_history = await shared.get(
+            "fx_history",
+            lambda: asyncio.to_thread(fetcher.get_fx_history, region=region, period="1m"),
+        )
+
+        async def _sparkline(commodity: str):
+            series = await self._series(shared, commodity, region)
+            if not series.bars:
+                return None
+            # The 1m window is the tail of the shared 1y series rather than a second load.
+            cutoff = series.bars[-1].date - timedelta(days=SPARKLINE_DAYS)
+            tail = series.model_copy(update={"bars": [bar for bar in series.bars if bar.date > cutoff]})
+            return self.commodity_service.normalization_service.to_historical_response(
+                series=tail,
+                fx_rates=fx,
+                fx_history=fx_history,
+            )
+
+        return await self._per_commodity(_sparkline)
+
+    async def _signal(self, shared: _SharedInputs, commodity: str, region: str, horizon: int, fx: dict[str, float]):
+        prediction = await self._prediction(shared, commodity, region, horizon)
+        live_row = next((row for row in await self._live_rows(shared, region, fx) if row.commodity == commodity), None)
+        if live_row is None:
+            raise ValueError(f"Live price unavailable for {commodity}/{region}")
+        series = await self._series(shared, commodity, region)
+        async with shared.session() as session:
+            return await self.market_signal_service.signal_from_inputs(
+                session,
+                commodity=commodity,
+                region=region,
+                horizon=horizon,
+                live_row=live_row,
+                prediction=prediction,
+                series=series,
+            )
+
+    async def _alerts(self, shared: _SharedInputs, user_sub: str):
+        async with shared.session() as session:
+            alerts = await self.alert_service.list_alerts(session, user_sub)
+            history = await self.alert_service.alert_history(session, user_sub, limit=ALERT_HISTORY_LIMIT)
+        return (alerts, history), []
+
+    async def _news(self, shared: _SharedInputs):
+        async def _summary(commodity: str):
+            if commodity not in ALERT_COMMODITY_SYMBOLS:
+                return None
+            async with shared.session() as session:
+                headlines = await self.news_persistence_service.get_or_ingest_recent_headlines(
+                    session,
+                    commodity=commodity,
+                )
+            # Summarization may call out to an LLM; do not hold a connection across it.
+            return await self.news_service.summarize(commodity, headlines=headlines)
+
+        return await self._per_commodity(_summary)
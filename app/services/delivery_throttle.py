@@ -0,0 +1,49 @@
+"""Concurrency and per-provider rate limits for outbound alert notifications.
+
+Sends run concurrently up to a process-wide bound, and each provider is held to a
+messages-per-second budget counted in one-second Redis windows shared by every
+worker process. A sender over budget waits for the next window instead of being
+dropped, without holding a send slot while it waits.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+
+from app.services.rate_limiter import RedisRateLimiter
+
+
+class DeliveryThrottle:
+    def __init__(
+        self,
+        concurrency: int,
+        provider_rates: Mapping[str, int],
+        limiter: RedisRateLimiter | None = None,
+    ) -> None:
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.provider_rates = dict(provider_rates)
+        self.limiter = limiter or RedisRateLimiter()
+
+    @asynccontextmanager
+    async def slot(self, provider: str | None) -> AsyncIterator[None]:
+        """Wait for `provider`'s rate budget, then hold one of the concurrent send slots.
+
+        The budget wait happens outside the semaphore, so senders queued behind an
+        exhausted provider never keep slots from providers that have budget left.
+        """
+        await self._wait_for_budget(provider)
+        async with self._semaphore:
+            yield
+
+    async def _wait_for_budget(self, provider: str | None) -> None:
+        rate = self.provider_rates.get(provider or "")
+        if not rate:
+            return
+        while True:
+            now = time.time()
+            window = int(now)
+            if await self.limiter.allow(key=f"delivery:provider:{provider}:{window}", limit=rate, window_seconds=2):
+                return
+            await asyncio.sleep(window + 1 - now)
@@ -0,0 +1,95 @@
+"""Server-side downsampling for long-range historical chart series.
+
+Charts are a few hundred pixels wide, so 5y/max ranges only need a few hundred
+points. `lttb` keeps the visually significant closes (Largest-Triangle-Three-
+Buckets); `ohlc` merges consecutive bars into candles so wicks are preserved.
+"""
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+
+from app.schemas.responses import RegionalHistoricalPoint
+
+DOWNSAMPLE_METHODS = ("lttb", "ohlc")
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Return the indices LTTB keeps; the first and last points are always kept."""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    out = np.empty(threshold, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    every = (n - 2) / (threshold - 2)
+    selected = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        seg_x = x[start:end]
+        seg_y = y[start:end]
+        area = np.abs(
+            (x[selected] - avg_x) * (seg_y - y[selected])
+            - (x[selected] - seg_x) * (avg_y - y[selected])
+        )
+        selected = start + int(np.argmax(area))
+        out[bucket + 1] = selected
+    return out
+
+
+def lttb(points: list[RegionalHistoricalPoint], threshold: int) -> list[RegionalHistoricalPoint]:
+    if threshold >= len(points):
+        return points
+    x = np.fromiter((point.date.toordinal() for point in points), dtype=np.float64, count=len(points))
+    y = np.fromiter((point.close for point in points), dtype=np.float64, count=len(points))
+    return [points[int(idx)] for idx in lttb_indices(x, y, threshold)]
+
+
+def ohlc_buckets(points: list[RegionalHistoricalPoint], buckets: int) -> list[RegionalHistoricalPoint]:
+    """Aggregate consecutive bars into `buckets` candles dated at each bucket's first bar."""
+    if buckets >= len(points) or buckets < 1:
+        return points
+
+    closes = np.fromiter((point.close for point in points), dtype=np.float64, count=len(points))
+    opens = np.array([closes[i] if p.open is None else p.open for i, p in enumerate(points)], dtype=np.float64)
+    highs = np.array([closes[i] if p.high is None else p.high for i, p in enumerate(points)], dtype=np.float64)
+    lows = np.array([closes[i] if p.low is None else p.low for i, p in enumerate(points)], dtype=np.float64)
+    volumes = np.array([np.nan if p.volume is None else p.volume for p in points], dtype=np.float64)
+
+    starts = np.linspace(0, len(points), buckets + 1).astype(np.int64)[:-1]
+    ends = np.append(starts[1:], len(points))
+    bucket_high = np.maximum.reduceat(highs, starts)
+    bucket_low = np.minimum.reduceat(lows, starts)
+    bucket_volume = np.add.reduceat(np.nan_to_num(volumes), starts)
+    has_volume = np.logical_or.reduceat(~np.isnan(volumes), starts)
+
+    dates: list[date] = [points[int(start)].date for start in starts]
+    return [
+        RegionalHistoricalPoint(
+            date=dates[i],
+            open=round(float(opens[starts[i]]), 4),
+            high=round(float(bucket_high[i]), 4),
+            low=round(float(bucket_low[i]), 4),
+            close=round(float(closes[ends[i] - 1]), 4),
+            volume=float(bucket_volume[i]) if has_volume[i] else None,
+        )
+        for i in range(len(starts))
+    ]
+
+
+def downsample_points(
+    points: list[RegionalHistoricalPoint],
+    target: int,
+    method: str = "lttb",
+) -> list[RegionalHistoricalPoint]:
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Invalid downsample method {method!r}. Must be one of {list(DOWNSAMPLE_METHODS)}")
+    if method == "ohlc":
+        return ohlc_buckets(points, target)
+    return lttb(points, target)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -11,6 +12,9 @@ from app.core.secrets import EMAIL_SECRETS, get_secret_value
 
 logger = logging.getLogger(__name__)
 
+# Resend accepts at most 100 messages per batch request.
+RESEND_BATCH_LIMIT = 100
+
 
 @dataclass
 class EmailDeliveryResult:
@@ -20,6 +24,15 @@ class EmailDeliveryResult:
     attempts: int = 0
 
 
+@dataclass
+class EmailMessage:
+    to_email: str
+    subject: str
+    message: str
+    market_context: str = ""
+    idempotency_key: str | None = None
+
+
 class EmailService:
     @staticmethod
     def _resend_api_key() -> str | None:
@@ -48,9 +61,17 @@ class EmailService:
         subject: str,
         text_message: str,
         html_message: str,
+        idempotency_key: str | None = None,
     ) -> EmailDeliveryResult:
         settings = get_settings()
         resend_api_key = self._resend_api_key()
+        headers = {
+            "Authorization": f"Bearer {resend_api_key}",
+            "Content-Type": "application/json",
+        }
+        if idempotency_key:
+            # Resend drops a repeated request with the same key, so retries cannot double-send.
+            headers["Idempotency-Key"] = idempotency_key
         attempts = 0
         for _ in range(3):
             attempts += 1
@@ -58,10 +79,7 @@ class EmailService:
                 async with httpx.AsyncClient(timeout=10.0) as client:
                     response = await client.post(
                         "https://api.resend.com/emails",
-                        headers={
-                            "Authorization": f"Bearer {resend_api_key}",
-                            "Content-Type": "application/json",
-                        },
+                        headers=headers,
                         json={
                             "from": settings.resend_from_email,
                             "to": [to_email],
@@ -142,6 +160,14 @@ class EmailService:
                 logger.warning("SendGrid send failed attempt=%s: %s", attempts, exc)
         return EmailDeliveryResult(status="failed", provider="sendgrid", error="retry_exhausted", attempts=attempts)
 
+    def active_provider(self) -> str | None:
+        """Provider send_alert tries first."""
+        if self._resend_api_key():
+            return "resend"
+        if self._sendgrid_api_key():
+            return "sendgrid"
+        return None
+
     async def send_alert(
         self,
         to_email: str | None,
@@ -149,6 +175,7 @@ class EmailService:
         message: str,
         market_context: str = "",
         send_enabled: bool = True,
+        idempotency_key: str | None = None,
     ) -> EmailDeliveryResult:
         if not send_enabled:
             return EmailDeliveryResult(status="skipped:disabled")
@@ -159,7 +186,7 @@ class EmailService:
         html_message = self._render_html(subject, message, market_context)
 
         if self._resend_api_key():
-            result = await self._send_with_resend(to_email, subject, message, html_message)
+            result = await self._send_with_resend(to_email, subject, message, html_message, idempotency_key)
             if result.status == "sent":
                 return result
             logger.warning("Resend failed status=%s error=%s", result.status, result.error)
@@ -171,3 +198,47 @@ class EmailService:
             logger.warning("SendGrid failed status=%s error=%s", result.status, result.error)
 
         return EmailDeliveryResult(status="skipped:no-provider")
+
+    async def send_batch(self, messages: list[EmailMessage]) -> list[EmailDeliveryResult | None]:
+        """Send through Resend's batch endpoint, RESEND_BATCH_LIMIT messages per request.
+
+        Results align with `messages`; None marks a message the batch did not deliver
+        (no Resend key, or its request failed), which the caller sends on its own.
+        """
+        results: list[EmailDeliveryResult | None] = [None] * len(messages)
+        resend_api_key = self._resend_api_key()
+        if not resend_api_key:
+            return results
+        settings = get_settings()
+        for start in range(0, len(messages), RESEND_BATCH_LIMIT):
+            chunk = messages[start : start + RESEND_BATCH_LIMIT]
+            batch_key = hashlib.sha256("|".join(m.idempotency_key or m.to_email for m in chunk).encode()).hexdigest()
+            try:
+                async with httpx.AsyncClient(timeout=15.0) as client:
+                    response = await client.post(
+                        "https://api.resend.com/emails/batch",
+                        headers={
+                            "Authorization": f"Bearer {resend_api_key}",
+                            "Content-Type": "application/json",
+                            "Idempotency-Key": f"batch-{batch_key[:48]}",
+                        },
+                        json=[
+                            {
+                                "from": settings.resend_from_email,
+                                "to": [m.to_email],
+                                "subject": m.subject,
+                                "text": m.message,
+                                "html": self._render_html(m.subject, m.message, m.market_context),
+                            }
+                            for m in chunk
+                        ],
+                    )
+            except Exception as exc:
+                logger.warning("Resend batch send failed size=%s: %s", len(chunk), exc)
+                continue
+            if response.status_code >= 300:
+                logger.warning("Resend batch rejected status=%s body=%s", response.status_code, response.text[:300])
+                continue
+            for offset in range(len(chunk)):
+                results[start + offset] = EmailDeliveryResult(status="sent", provider="resend", attempts=1)
+        return results
@@ -40,6 +40,7 @@ class ForecastService:
         current_spot_usd_oz: float,
         spot_timestamp: datetime,
         latest_metrics_loader,
+        features: pd.DataFrame | None = None,
     ) -> RegionalPredictionResponse:
         requested_horizon = max(1, int(horizon))
         cache_key = (commodity, region, requested_horizon)
@@ -57,14 +58,16 @@ class ForecastService:
 
             model, metadata = self.model_registry_service.load_model_bundle(metrics)
             trained_horizon = int(metadata.get("horizon", requested_horizon))
-            feat = await feature_store_service.materialize_online_features_for_session(
-                session,
-                commodity=commodity,
-                series=series,
-                region=region,
-                period="1y",
-                fx=fx_rates,
-            )
+            feat = features
+            if feat is None:
+                feat = await feature_store_service.materialize_online_features_for_session(
+                    session,
+                    commodity=commodity,
+                    series=series,
+                    region=region,
+                    period="1y",
+                    fx=fx_rates,
+                )
             base_usd_oz = self._predict_base_usd_oz(
                 model=model,
                 metadata=metadata,
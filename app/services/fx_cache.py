@@ -1,21 +1,27 @@
 """FX rate fetching with in-memory TTL cache and graceful failover."""
 from __future__ import annotations
 
+import hashlib
 import logging
 import time
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
 from typing import Any
 from urllib.parse import urlencode
 
 import httpx
 
+from app.core.request_memo import request_memoized
+
 logger = logging.getLogger(__name__)
 
 _FX_CACHE: dict[str, Any] = {}
-_HIST_CACHE: dict[str, Any] = {}
+_HIST_CACHE: OrderedDict[str, Any] = OrderedDict()
+_FX_VERSION: dict[str, str] = {"version": ""}
 
 FX_TTL_SECONDS = 300       # 5 minutes
 HIST_TTL_SECONDS = 600      # 10 minutes
+HIST_MAX_ENTRIES = 256      # least recently used entries are evicted beyond this
 
 ECB_FX_URL = "https://www.ecb.europa.eu/stats/eurofxref/eurofxref-daily.xml"
 FALLBACK_FX_URL = "https://api.exchangerate.host/latest"
@@ -65,6 +71,24 @@ def _fetch_fallback_rates() -> dict[str, float]:
     return rates
 
 
+def _store_rates(rates: dict[str, float], ts: float) -> None:
+    previous = _FX_CACHE.get("rates")
+    if previous is None or previous["data"] != rates:
+        canonical = ",".join(f"{currency}={rate!r}" for currency, rate in sorted(rates.items()))
+        _FX_VERSION["version"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+    _FX_CACHE["rates"] = {"data": rates, "ts": ts}
+
+
+def fx_snapshot_version() -> str:
+    """
+    Digest of the cached FX rate values ('' before any rates are cached).
+    Derived from the values alone, so every worker and replica holding the same
+    rates reports the same version and the ETags built on it agree.
+    """
+    return _FX_VERSION["version"]
+
+
+@request_memoized("fx_rates")
 def get_fx_rates() -> dict[str, float]:
     """
     Return current FX rates relative to USD.
@@ -77,7 +101,7 @@ def get_fx_rates() -> dict[str, float]:
 
     try:
         rates = _fetch_ecb_rates()
-        _FX_CACHE["rates"] = {"data": rates, "ts": now}
+        _store_rates(rates, now)
         logger.info("FX rates refreshed from ECB")
         return rates
     except Exception as exc:
@@ -85,7 +109,7 @@ def get_fx_rates() -> dict[str, float]:
 
     try:
         rates = _fetch_fallback_rates()
-        _FX_CACHE["rates"] = {"data": rates, "ts": now}
+        _store_rates(rates, now)
         logger.info("FX rates refreshed from fallback API")
         return rates
     except Exception as exc:
@@ -97,24 +121,32 @@ def get_fx_rates() -> dict[str, float]:
 
     # Final resilience guard: serve static defaults so pricing endpoints remain available.
     logger.warning("Serving static fallback FX rates due to source failures and empty cache")
-    _FX_CACHE["rates"] = {"data": STATIC_FALLBACK_FX, "ts": now}
+    _store_rates(STATIC_FALLBACK_FX, now)
     return STATIC_FALLBACK_FX
 
 
 def get_cached_historical(key: str) -> Any | None:
     """Retrieve a cached historical dataset by key (commodity_region)."""
     entry = _HIST_CACHE.get(key)
-    if entry and (time.monotonic() - entry["ts"]) < HIST_TTL_SECONDS:
-        return entry["data"]
-    return None
+    if entry is None:
+        return None
+    if (time.monotonic() - entry["ts"]) >= HIST_TTL_SECONDS:
+        del _HIST_CACHE[key]
+        return None
+    _HIST_CACHE.move_to_end(key)
+    return entry["data"]
 
 
 def set_cached_historical(key: str, data: Any) -> None:
-    """Store a historical dataset in cache with 10-minute TTL."""
+    """Store a historical dataset in cache with 10-minute TTL, keeping at most HIST_MAX_ENTRIES."""
     _HIST_CACHE[key] = {"data": data, "ts": time.monotonic()}
+    _HIST_CACHE.move_to_end(key)
+    while len(_HIST_CACHE) > HIST_MAX_ENTRIES:
+        _HIST_CACHE.popitem(last=False)
 
 
 def clear_caches() -> None:
     """Clear all in-memory caches (useful for testing)."""
     _FX_CACHE.clear()
     _HIST_CACHE.clear()
+    _FX_VERSION["version"] = ""
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
-from datetime import datetime, time, timezone
+from datetime import datetime, time, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import select
+import pandas as pd
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.ingestion_job import IngestionJob
 from app.models.normalized_market_record import NormalizedMarketRecord
 from app.models.raw_market_payload import RawMarketPayload
-from app.schemas.market_data import NormalizedHistoricalSeries, NormalizedLiveQuote
+from app.schemas.market_data import (
+    MarketDataProvenanceRecord,
+    NormalizedHistoricalBar,
+    NormalizedHistoricalSeries,
+    NormalizedLiveQuote,
+)
+
+_BARS = TypeAdapter(list[NormalizedHistoricalBar])
 
 
 class IngestionPersistenceService:
@@ -21,6 +30,22 @@ class IngestionPersistenceService:
             return value
         return value.astimezone(timezone.utc).replace(tzinfo=None)
 
+    @staticmethod
+    def _period_start(end: datetime, period: str) -> datetime | None:
+        # Mirrors MarketDataFetcher._apply_period_filter so both read paths return the same window.
+        if period == "max" or len(period) < 2:
+            return None
+        count = int(period[:-1] or "1")
+        offsets = {
+            "d": pd.Timedelta(days=count),
+            "m": pd.DateOffset(months=count),
+            "y": pd.DateOffset(years=count),
+        }
+        offset = offsets.get(period[-1])
+        if offset is None:
+            return None
+        return (pd.Timestamp(end) - offset).to_pydatetime()
+
     async def create_job(
         self,
         session: AsyncSession,
@@ -226,6 +251,87 @@ class IngestionPersistenceService:
             "normalized_records_inserted": normalized_records_inserted,
         }
 
+    async def load_historical_series(
+        self,
+        session: AsyncSession,
+        *,
+        commodity: str,
+        region: str,
+        period: str,
+        max_staleness_days: int | None = None,
+    ) -> NormalizedHistoricalSeries | None:
+        """
+        Read a persisted historical range with an index range scan.
+        Returns None when nothing is stored for the series, or the newest bar is older
+        than `max_staleness_days`, so callers can fall back to the market data fetcher.
+        """
+        filters = (
+            NormalizedMarketRecord.record_type == "historical",
+            NormalizedMarketRecord.commodity == commodity,
+            NormalizedMarketRecord.region == region,
+            NormalizedMarketRecord.period == period,
+        )
+        latest = (
+            await session.execute(select(func.max(NormalizedMarketRecord.observed_at)).where(*filters))
+        ).scalar_one_or_none()
+        if latest is None:
+            return None
+        latest = self._normalize_datetime(latest)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if max_staleness_days is not None and latest < now - timedelta(days=max_staleness_days):
+            return None
+
+        # Fetch plain column tuples (no ORM identity map) in index order.
+        stmt = (
+            select(
+                NormalizedMarketRecord.observed_at,
+                NormalizedMarketRecord.open_usd_per_troy_oz,
+                NormalizedMarketRecord.high_usd_per_troy_oz,
+                NormalizedMarketRecord.low_usd_per_troy_oz,
+                NormalizedMarketRecord.close_usd_per_troy_oz,
+                NormalizedMarketRecord.volume,
+            )
+            .where(*filters)
+            .order_by(NormalizedMarketRecord.observed_at.asc())
+        )
+        start = self._period_start(latest, period)
+        if start is not None:
+            stmt = stmt.where(NormalizedMarketRecord.observed_at >= start)
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            return None
+
+        observed, opens, highs, lows, closes, volumes = zip(*rows)
+        bars = _BARS.validate_python(
+            [
+                {
+                    "date": observed_at.date(),
+                    "open_usd_per_troy_oz": open_,
+                    "high_usd_per_troy_oz": high,
+                    "low_usd_per_troy_oz": low,
+                    "close_usd_per_troy_oz": close,
+                    "volume": volume,
+                }
+                for observed_at, open_, high, low, close, volume in zip(observed, opens, highs, lows, closes, volumes)
+                if close is not None
+            ]
+        )
+        if not bars:
+            return None
+        observed_at = latest.replace(tzinfo=timezone.utc)
+        return NormalizedHistoricalSeries(
+            commodity=commodity,
+            region=region,
+            bars=bars,
+            provenance=MarketDataProvenanceRecord(
+                source_type="historical",
+                provider="database",
+                detail=f"normalized_market_records/{commodity}_{region}/{period}",
+                observed_at=observed_at,
+                ingested_at=datetime.now(timezone.utc),
+            ),
+        )
+
     async def persist_historical_series(
         self,
         session: AsyncSession,
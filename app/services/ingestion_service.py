@@ -6,8 +6,10 @@ from typing import Protocol
 
 import httpx
 import pandas as pd
+from pydantic import TypeAdapter
 
 from app.core.exceptions import TrainingError
+from app.core.request_memo import memoized_each, request_memoized
 from app.schemas.market_data import (
     MarketDataProvenanceRecord,
     NormalizedHistoricalBar,
@@ -17,6 +19,7 @@ from app.schemas.market_data import (
 from ml.data.data_fetcher import COMMODITY_SYMBOLS, MarketDataFetcher
 
 logger = logging.getLogger(__name__)
+_BARS = TypeAdapter(list[NormalizedHistoricalBar])
 
 PRIMARY_SOURCE_BY_COMMODITY = {
     "gold": "comex",
@@ -222,6 +225,11 @@ class MarketIngestionService:
         ]
 
     async def fetch_live_quotes(self, commodities: list[str]) -> dict[str, NormalizedLiveQuote]:
+        # Memoized per commodity, so a later single-commodity lookup in the same request
+        # is served from an earlier all-commodity fetch.
+        return await memoized_each("live_quote", commodities, self._fetch_live_quotes)
+
+    async def _fetch_live_quotes(self, commodities: list[str]) -> dict[str, NormalizedLiveQuote]:
         remaining = list(commodities)
         quotes: dict[str, NormalizedLiveQuote] = {}
         for provider in self.live_quote_providers:
@@ -234,6 +242,7 @@ class MarketIngestionService:
             remaining = [commodity for commodity in remaining if commodity not in quotes]
         return quotes
 
+    @request_memoized("historical_series")
     def load_historical_series(
         self,
         commodity: str,
@@ -241,17 +250,28 @@ class MarketIngestionService:
         period: str = "1y",
     ) -> NormalizedHistoricalSeries:
         frame = self.fetcher.get_historical(commodity, period=period, region=region)
-        bars = [
-            NormalizedHistoricalBar(
-                date=row.Date.date() if hasattr(row.Date, "date") else row.Date,
-                open_usd_per_troy_oz=float(row.Open),
-                high_usd_per_troy_oz=float(row.High),
-                low_usd_per_troy_oz=float(row.Low),
-                close_usd_per_troy_oz=float(row.Close),
-                volume=float(row.Volume) if row.Volume is not None else None,
-            )
-            for row in frame.itertuples()
-        ]
+        # Column-wise extraction and one validation pass instead of itertuples + a model per row.
+        columns = zip(
+            pd.to_datetime(frame["Date"]).dt.date.tolist(),
+            frame["Open"].astype(float).tolist(),
+            frame["High"].astype(float).tolist(),
+            frame["Low"].astype(float).tolist(),
+            frame["Close"].astype(float).tolist(),
+            frame["Volume"].tolist(),
+        )
+        bars = _BARS.validate_python(
+            [
+                {
+                    "date": date_,
+                    "open_usd_per_troy_oz": open_,
+                    "high_usd_per_troy_oz": high,
+                    "low_usd_per_troy_oz": low,
+                    "close_usd_per_troy_oz": close,
+                    "volume": float(volume) if volume is not None else None,
+                }
+                for date_, open_, high, low, close, volume in columns
+            ]
+        )
         latest_observed = frame["Date"].max().to_pydatetime().replace(tzinfo=timezone.utc) if not frame.empty else None
         return NormalizedHistoricalSeries(
             commodity=commodity,
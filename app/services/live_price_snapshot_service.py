@@ -0,0 +1,192 @@
+"""Precomputed per-region live-price snapshots for the public endpoint.
+
+A background refresher fetches quotes once per interval and, when the quote or FX
+watermark changed, rebuilds every region's envelope, ETag and serialized body and
+swaps them in together. Reads only look up the current snapshot: no provider
+calls, FX conversion or DB writes happen per request. Quotes are persisted by the
+refresher, once per change, rather than by every public hit, and each change is
+published on the quote event stream for the alert worker.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from app.core.body_cache import CompressedBodyCache
+from app.core.http_cache import Validator, as_last_modified, make_etag
+from app.core.responses import dumps
+from app.db.session import AsyncSessionLocal
+from app.schemas.market_data import NormalizedLiveQuote
+from app.schemas.responses import LivePricesEnvelope
+from app.services.commodity_service import CommodityService
+from app.services.fx_cache import fx_snapshot_version, get_fx_rates
+from app.services.market_quote_service import quote_from_live_price
+from app.services.quote_events import QuoteEventBus, quote_events
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LivePriceSnapshot:
+    region: str
+    envelope: LivePricesEnvelope
+    validator: Validator
+    refreshed_at: float
+
+
+class LivePriceSnapshotService:
+    def __init__(
+        self,
+        commodity_service: CommodityService,
+        *,
+        cache_control: str,
+        session_factory=AsyncSessionLocal,
+        events: QuoteEventBus = quote_events,
+    ) -> None:
+        self.commodity_service = commodity_service
+        self.cache_control = cache_control
+        self.session_factory = session_factory
+        self.events = events
+        self.settings = commodity_service.settings
+        self.bodies = CompressedBodyCache(max_bytes=4 * 1024 * 1024)
+        self._snapshots: dict[str, LivePriceSnapshot] = {}
+        self._watermark: tuple | None = None
+        self._inflight: asyncio.Future | None = None
+        self._failed_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    async def get(self, region: str) -> LivePriceSnapshot:
+        """Current snapshot for `region`, refreshing inline only when missing or too stale.
+
+        After a failed refresh, requests serve the stale snapshot (or fail fast) for
+        the backoff window instead of each retrying the providers inline.
+        """
+        region = self.commodity_service._validate_region(region)
+        snapshot = self._snapshots.get(region)
+        now = time.monotonic()
+        max_staleness = self.settings.public_live_prices_max_staleness_seconds
+        if snapshot is not None and now - snapshot.refreshed_at <= max_staleness:
+            return snapshot
+        backoff = self.settings.public_live_prices_failure_backoff_seconds
+        if self._failed_at is not None and now - self._failed_at < backoff:
+            if snapshot is None:
+                raise RuntimeError("Live prices unavailable: provider refresh failed recently")
+            return snapshot
+        try:
+            await self.refresh()
+        except Exception as exc:
+            if snapshot is None:
+                raise RuntimeError(f"Live prices unavailable: {exc}") from exc
+            # Serve the last good snapshot while providers are failing.
+            logger.warning("Public live-price refresh failed, serving stale snapshot: %s", exc)
+            return snapshot
+        return self._snapshots[region]
+
+    async def refresh(self) -> dict[str, NormalizedLiveQuote] | None:
+        """Fetch quotes and rebuild snapshots if they changed; concurrent callers share one fetch.
+
+        Returns the quotes when the snapshots were rebuilt, or None when unchanged.
+        """
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._refresh())
+        try:
+            quotes = await asyncio.shield(self._inflight)
+        except Exception:
+            self._failed_at = time.monotonic()
+            raise
+        self._failed_at = None
+        return quotes
+
+    async def _refresh(self) -> dict[str, NormalizedLiveQuote] | None:
+        commodities = self.commodity_service.commodities
+        quotes = await self.commodity_service.ingestion_service.fetch_live_quotes(commodities)
+        if not quotes:
+            raise RuntimeError("Live prices unavailable from all providers")
+        fx = get_fx_rates()
+        watermark = (
+            fx_snapshot_version(),
+            tuple(
+                (commodity, quote.price_usd_per_troy_oz, quote.observed_at, quote.provenance.provider)
+                for commodity, quote in sorted(quotes.items())
+            ),
+        )
+        now = time.monotonic()
+        if watermark == self._watermark and len(self._snapshots) == len(self.commodity_service.regions):
+            self._snapshots = {
+                region: LivePriceSnapshot(snapshot.region, snapshot.envelope, snapshot.validator, now)
+                for region, snapshot in self._snapshots.items()
+            }
+            return None
+
+        normalization = self.commodity_service.normalization_service
+        snapshots: dict[str, LivePriceSnapshot] = {}
+        for region in self.commodity_service.regions:
+            envelope = LivePricesEnvelope(
+                items=[
+                    normalization.to_live_price_response(quote=quotes[commodity], region=region, fx_rates=fx)
+                    for commodity in commodities
+                    if commodity in quotes
+                ]
+            )
+            rows = [(item.commodity, item.region, item.live_price, item.source, item.timestamp) for item in envelope.items]
+            validator = Validator(
+                etag=make_etag(rows, fx_snapshot_version()),
+                last_modified=as_last_modified(max((item.timestamp for item in envelope.items), default=None)),
+                cache_control=self.cache_control,
+                expires_at=float("inf"),
+            )
+            self.bodies.put(region, validator.etag, dumps(envelope))
+            snapshots[region] = LivePriceSnapshot(region, envelope, validator, now)
+        # One assignment, so readers never see regions from different refreshes.
+        self._snapshots = snapshots
+        self._watermark = watermark
+        ticks = (
+            quote_from_live_price(item, quotes[item.commodity])
+            for snapshot in snapshots.values()
+            for item in snapshot.envelope.items
+        )
+        self.events.publish(tick for tick in ticks if tick is not None)
+        return quotes
+
+    async def _persist(self, quotes: dict[str, NormalizedLiveQuote]) -> None:
+        async with self.session_factory() as session:
+            for region in self.commodity_service.regions:
+                await self.commodity_service.ingestion_persistence_service.persist_live_quotes(
+                    session,
+                    quotes=quotes,
+                    region=region,
+                )
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name="public-live-price-refresher")
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        interval = max(1, int(self.settings.public_live_prices_refresh_seconds))
+        while True:
+            try:
+                quotes = await self.refresh()
+                if quotes is not None:
+                    await self._persist(quotes)
+            except Exception as exc:
+                logger.exception("public_live_price_refresh_failed error=%s", exc)
+            await asyncio.sleep(interval)
+
+    def clear(self) -> None:
+        self._snapshots = {}
+        self._watermark = None
+        self._failed_at = None
+        self.bodies.clear()
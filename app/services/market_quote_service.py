@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
 import yfinance as yf
 
+from app.schemas.market_data import NormalizedLiveQuote
+from app.schemas.responses import LivePriceResponse
 from app.services.fx_cache import get_fx_rates
 from app.services.price_conversion import REGION_CURRENCY, troy_oz_to_grams, convert_price
 
+logger = logging.getLogger(__name__)
+
 ALERT_COMMODITY_SYMBOLS = {
     "gold": "GC=F",
     "silver": "SI=F",
@@ -24,6 +31,13 @@ ALERT_COMMODITY_UNITS = {
     "copper": {"india": "lb", "us": "lb", "europe": "lb"},
 }
 
+# Commodities whose public live price is converted exactly like alert quotes are
+# (USD/troy-ounce metals), so live-price ticks can drive their alerts.
+TICK_COMMODITIES = frozenset({"gold", "silver"})
+# Highest provider fallback level whose quotes may drive alerts: metals.live (0) and
+# Yahoo Finance (1). Cached-history closes and placeholder prices never do.
+MAX_TICK_FALLBACK_LEVEL = 1
+
 
 @dataclass
 class MarketQuote:
@@ -32,11 +46,33 @@ class MarketQuote:
     currency: str
     unit: str
     price: float
-    daily_change_pct: float
+    # None when the provider reports no daily change; only price rules use such quotes.
+    daily_change_pct: float | None
     timestamp: datetime
     source: str
 
 
+def quote_from_live_price(item: LivePriceResponse, source: NormalizedLiveQuote) -> MarketQuote | None:
+    """Alert quote for a public live-price item built from `source`, or None when alerts cannot use it."""
+    if item.commodity not in TICK_COMMODITIES:
+        return None
+    if source.provenance.fallback_level > MAX_TICK_FALLBACK_LEVEL:
+        return None
+    if item.unit != ALERT_COMMODITY_UNITS[item.commodity].get(item.region):
+        return None
+    return MarketQuote(
+        commodity=item.commodity,
+        region=item.region,
+        currency=item.currency,
+        unit=item.unit,
+        price=item.live_price,
+        # The public item reports a missing change as 0.0; keep it unknown instead.
+        daily_change_pct=None if source.daily_change_pct is None else round(source.daily_change_pct, 4),
+        timestamp=item.timestamp,
+        source=item.source,
+    )
+
+
 class MarketQuoteService:
     @staticmethod
     def _normalize_download(df):
@@ -51,6 +87,10 @@ class MarketQuoteService:
         return df
 
     def fetch_quote(self, commodity: str, region: str) -> MarketQuote:
+        return self.fetch_commodity_quotes(commodity, [region])[region]
+
+    def fetch_commodity_quotes(self, commodity: str, regions: Iterable[str]) -> dict[str, MarketQuote]:
+        """Download `commodity` once and convert the close for each of `regions`."""
         if commodity not in ALERT_COMMODITY_SYMBOLS:
             raise ValueError(f"Unsupported commodity: {commodity}")
 
@@ -67,22 +107,65 @@ class MarketQuoteService:
         daily_change = ((latest_close - prev_close) / prev_close) * 100 if prev_close else 0.0
 
         fx = get_fx_rates()
-        currency = REGION_CURRENCY[region]
+        now = datetime.now(timezone.utc)
+        quotes: dict[str, MarketQuote] = {}
+        for region in regions:
+            currency = REGION_CURRENCY[region]
+            if commodity in {"gold", "silver"}:
+                # yfinance metal quote is USD/troy-ounce; convert via canonical USD/gram.
+                display_price = convert_price(troy_oz_to_grams(latest_close), region, fx)
+            else:
+                rate = fx.get(currency, 1.0)
+                display_price = latest_close * rate
 
-        if commodity in {"gold", "silver"}:
-            # yfinance metal quote is USD/troy-ounce; convert via canonical USD/gram.
-            display_price = convert_price(troy_oz_to_grams(latest_close), region, fx)
-        else:
-            rate = fx.get(currency, 1.0)
-            display_price = latest_close * rate
-
-        return MarketQuote(
-            commodity=commodity,
-            region=region,
-            currency=currency,
-            unit=ALERT_COMMODITY_UNITS[commodity][region],
-            price=round(display_price, 4),
-            daily_change_pct=round(daily_change, 4),
-            timestamp=datetime.now(timezone.utc),
-            source="yahoo_finance",
+            quotes[region] = MarketQuote(
+                commodity=commodity,
+                region=region,
+                currency=currency,
+                unit=ALERT_COMMODITY_UNITS[commodity][region],
+                price=round(display_price, 4),
+                daily_change_pct=round(daily_change, 4),
+                timestamp=now,
+                source="yahoo_finance",
+            )
+        return quotes
+
+    async def fetch_quotes(
+        self,
+        markets: Iterable[tuple[str, str]],
+        *,
+        cycle: str,
+    ) -> dict[tuple[str, str], MarketQuote]:
+        """Fetch each distinct commodity once, concurrently, and convert it per region; failed markets are omitted.
+
+        The upstream series depends only on the commodity, so gold alerts in every
+        region share one download. `cycle` labels the per-cycle count log line.
+        """
+        requested = list(markets)
+        distinct = list(dict.fromkeys(requested))
+        regions_by_commodity: dict[str, list[str]] = {}
+        for commodity, region in distinct:
+            regions_by_commodity.setdefault(commodity, []).append(region)
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(self.fetch_commodity_quotes, commodity, regions)
+                for commodity, regions in regions_by_commodity.items()
+            ),
+            return_exceptions=True,
+        )
+        quotes: dict[tuple[str, str], MarketQuote] = {}
+        for (commodity, regions), result in zip(regions_by_commodity.items(), results):
+            if isinstance(result, BaseException):
+                logger.warning("alert_quote_failed commodity=%s regions=%s error=%s", commodity, ",".join(regions), result)
+                continue
+            quotes.update(((commodity, region), quote) for region, quote in result.items())
+        logger.info(
+            "alert_quotes_fetched cycle=%s requested=%s distinct=%s downloads=%s fetched=%s failed=%s",
+            cycle,
+            len(requested),
+            len(distinct),
+            len(regions_by_commodity),
+            len(quotes),
+            len(distinct) - len(quotes),
         )
+        return quotes
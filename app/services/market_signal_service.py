@@ -1,22 +1,50 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable
 from datetime import datetime, timezone
+import time
+from typing import Any, TypeVar
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.session import AsyncSessionLocal
+from app.schemas.market_data import NormalizedHistoricalSeries
 from app.schemas.responses import (
+    CommodityNewsSummaryResponse,
     DataProvenance,
+    LivePriceResponse,
     MarketSignalResponse,
     MarketIntelligenceResponse,
+    RegionalPredictionResponse,
 )
 from app.services.commodity_service import CommodityService
 from app.services.feature_store_service import FeatureStoreService
+from app.services.fx_cache import get_fx_rates
 from app.services.ingestion_service import MarketIngestionService
 from app.services.market_quote_service import ALERT_COMMODITY_SYMBOLS
 from app.services.news_service import CommodityNewsService
 from app.services.news_persistence_service import NewsPersistenceService
 from app.services.signal_service import SignalService
 
+T = TypeVar("T")
+
+
+async def _gather_or_cancel(*stages: Awaitable[Any]) -> list[Any]:
+    """asyncio.gather that cancels and drains the remaining stages when one fails.
+
+    Plain gather leaves siblings running, which could keep using the caller's
+    session after it has been closed.
+    """
+    tasks = [asyncio.ensure_future(stage) for stage in stages]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
 
 class MarketSignalService:
     def __init__(self) -> None:
@@ -26,6 +54,7 @@ class MarketSignalService:
         self.ingestion_service = MarketIngestionService(fetcher=self.commodity_service.fetcher)
         self.feature_store_service = FeatureStoreService(fetcher=self.commodity_service.fetcher)
         self.signal_service = SignalService()
+        self.session_factory = AsyncSessionLocal
 
     async def build_market_intelligence(
         self,
@@ -35,22 +64,91 @@ class MarketSignalService:
         horizon: int = 30,
         include_news: bool = True,
     ) -> MarketIntelligenceResponse:
-        live_rows = await self.commodity_service.live_prices(region=region)
-        live_row = next((item for item in live_rows if item.commodity == commodity), None)
-        if live_row is None:
-            raise ValueError(f"Live price unavailable for {commodity}/{region}")
+        """Live price, forecast, features and news run as concurrent stages.
 
-        historical = await self.commodity_service.historical(commodity, region=region, period="1y")
-        prediction = await self.commodity_service.predict(session, commodity, region=region, horizon=horizon)
+        The 1y series is loaded once and its online features are materialized once,
+        then shared by the forecast, the regional closes and the signal. One
+        AsyncSession cannot run concurrent operations, so the news stage reads and
+        ingests headlines on a session of its own; the caller's session is used
+        only by the feature and forecast stage.
+        """
+        started = time.perf_counter()
+        timings: dict[str, float] = {}
+        fx = get_fx_rates()
 
-        series = self.ingestion_service.load_historical_series(commodity=commodity, region=region, period="1y")
-        enriched = await self.feature_store_service.materialize_online_features_for_session(
-            session,
-            commodity=commodity,
-            series=series,
-            region=region,
-            period="1y",
+        async def _timed(stage: str, work: Awaitable[T]) -> T:
+            stage_started = time.perf_counter()
+            try:
+                return await work
+            finally:
+                timings[stage] = round((time.perf_counter() - stage_started) * 1000, 2)
+
+        async def _live_row() -> LivePriceResponse:
+            live_rows = await self.commodity_service.live_prices(region=region)
+            live_row = next((item for item in live_rows if item.commodity == commodity), None)
+            if live_row is None:
+                raise ValueError(f"Live price unavailable for {commodity}/{region}")
+            return live_row
+
+        async def _model_inputs():
+            series = await _timed(
+                "series",
+                asyncio.to_thread(
+                    self.ingestion_service.load_historical_series,
+                    commodity=commodity,
+                    region=region,
+                    period="1y",
+                ),
+            )
+            enriched = await _timed(
+                "features",
+                self.feature_store_service.materialize_online_features_for_session(
+                    session,
+                    commodity=commodity,
+                    series=series,
+                    region=region,
+                    period="1y",
+                    fx=fx,
+                ),
+            )
+            prediction = await _timed(
+                "forecast",
+                self.commodity_service.predict(
+                    session,
+                    commodity,
+                    region=region,
+                    horizon=horizon,
+                    series=series,
+                    features=enriched,
+                ),
+            )
+            stage_started = time.perf_counter()
+            historical = self.commodity_service.normalization_service.to_historical_response(
+                series=series,
+                fx_rates=fx,
+                fx_history=self.commodity_service.fetcher.get_fx_history(region=region, period="1y"),
+            )
+            timings["historical"] = round((time.perf_counter() - stage_started) * 1000, 2)
+            return series, enriched, prediction, historical
+
+        async def _news() -> CommodityNewsSummaryResponse | None:
+            if not include_news or commodity not in ALERT_COMMODITY_SYMBOLS:
+                return None
+            if session is None:
+                return await self.news_service.summarize(commodity)
+            async with self.session_factory() as news_session:
+                headlines = await self.news_persistence_service.get_or_ingest_recent_headlines(
+                    news_session,
+                    commodity=commodity,
+                )
+            return await self.news_service.summarize(commodity, headlines=headlines)
+
+        live_row, (series, enriched, prediction, historical), news = await _gather_or_cancel(
+            _timed("live_price", _live_row()),
+            _model_inputs(),
+            _timed("news", _news()),
         )
+
         closes = [float(point.close) for point in historical.data if point.close is not None]
         features = self.feature_store_service.build_feature_snapshot(closes=closes, enriched=enriched)
         signal = self.signal_service.summarize(
@@ -92,15 +190,7 @@ class MarketSignalService:
             ),
         ]
 
-        if include_news and commodity in ALERT_COMMODITY_SYMBOLS:
-            if session is None:
-                news = await self.news_service.summarize(commodity)
-            else:
-                headlines = await self.news_persistence_service.get_or_ingest_recent_headlines(
-                    session,
-                    commodity=commodity,
-                )
-                news = await self.news_service.summarize(commodity, headlines=headlines)
+        if news is not None:
             news_sentiment = news.sentiment
             news_summary = news.summary
             provenance.append(
@@ -131,6 +221,7 @@ class MarketSignalService:
             news_sentiment=news_sentiment,
             news_summary=news_summary,
             provenance=provenance,
+            stage_timings_ms={**timings, "total": round((time.perf_counter() - started) * 1000, 2)},
         )
 
     async def build_signal_response(
@@ -146,7 +237,29 @@ class MarketSignalService:
             raise ValueError(f"Live price unavailable for {commodity}/{region}")
 
         prediction = await self.commodity_service.predict(session, commodity, region=region, horizon=horizon)
-        series = self.ingestion_service.load_historical_series(commodity=commodity, region=region, period="1y")
+        return await self.signal_from_inputs(
+            session,
+            commodity=commodity,
+            region=region,
+            horizon=horizon,
+            live_row=live_row,
+            prediction=prediction,
+        )
+
+    async def signal_from_inputs(
+        self,
+        session: AsyncSession,
+        *,
+        commodity: str,
+        region: str,
+        horizon: int,
+        live_row: LivePriceResponse,
+        prediction: RegionalPredictionResponse,
+        series: NormalizedHistoricalSeries | None = None,
+    ) -> MarketSignalResponse:
+        """Signal from an already-fetched live price and forecast (and optionally the 1y series)."""
+        if series is None:
+            series = self.ingestion_service.load_historical_series(commodity=commodity, region=region, period="1y")
         enriched = await self.feature_store_service.materialize_online_features_for_session(
             session,
             commodity=commodity,
@@ -6,6 +6,7 @@ from typing import Any
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.request_memo import request_memoized
 from app.models.training_run import TrainingRun
 from ml.inference.artifacts import load_model
 
@@ -13,6 +14,7 @@ from ml.inference.artifacts import load_model
 class ModelRegistryService:
     _model_cache: dict[tuple[str, str], tuple[Any, dict[str, Any]]] = {}
 
+    @request_memoized("latest_metrics")
     async def latest_metrics(self, session: AsyncSession, commodity: str, region: str) -> TrainingRun | None:
         result = await session.execute(
             select(TrainingRun)
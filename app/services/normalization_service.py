@@ -1,9 +1,50 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
+from pydantic import TypeAdapter
 
 from app.schemas.market_data import NormalizedHistoricalSeries, NormalizedLiveQuote
-from app.schemas.responses import LivePriceResponse, RegionalHistoricalPoint, RegionalHistoricalResponse
+from app.schemas.responses import (
+    LivePriceResponse,
+    MultiRegionHistoricalResponse,
+    NormalizedHistoricalColumns,
+    RegionalHistoricalColumnarResponse,
+    RegionalHistoricalColumns,
+    RegionalHistoricalPoint,
+    RegionalHistoricalResponse,
+)
+from app.services.downsampling import lttb_indices
+from app.services.price_conversion import FALLBACK_FX, convert_prices, troy_oz_to_grams
+
+HISTORICAL_FORMATS = ("rows", "columnar")
+DATE_ENCODINGS = ("iso", "epoch_day")
+
+_POINTS = TypeAdapter(list[RegionalHistoricalPoint])
+
+
+def _usd_ohlc(bars: list) -> np.ndarray:
+    return np.array(
+        [
+            (bar.open_usd_per_troy_oz, bar.high_usd_per_troy_oz, bar.low_usd_per_troy_oz, bar.close_usd_per_troy_oz)
+            for bar in bars
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+
+
+def validate_layout(format: str, date_encoding: str) -> None:
+    if format not in HISTORICAL_FORMATS:
+        raise ValueError(f"Invalid format {format!r}. Must be one of {list(HISTORICAL_FORMATS)}")
+    if date_encoding not in DATE_ENCODINGS:
+        raise ValueError(f"Invalid date_encoding {date_encoding!r}. Must be one of {list(DATE_ENCODINGS)}")
+
+
+def date_column(dates: list, date_encoding: str) -> list:
+    """Dates as-is (ISO on the wire) or as integer days since 1970-01-01."""
+    if date_encoding == "epoch_day":
+        return np.array(dates, dtype="datetime64[D]").astype(np.int64).tolist()
+    return list(dates)
 
 
 class MarketDataNormalizationService:
@@ -35,40 +76,200 @@ class MarketDataNormalizationService:
         series: NormalizedHistoricalSeries,
         fx_rates: dict[str, float],
         fx_history: pd.Series | None = None,
-    ) -> RegionalHistoricalResponse:
-        def _fx_for_date(date_value):
-            if fx_history is None or fx_history.empty or series.region == "us":
-                return fx_rates
-            ts = pd.Timestamp(date_value).normalize()
-            rate = fx_history.get(ts)
-            if rate is None:
-                history = fx_history.loc[:ts]
-                rate = history.iloc[-1] if not history.empty else None
-            if rate is None:
-                return fx_rates
-            regional_fx = dict(fx_rates)
-            if series.region == "india":
-                regional_fx["INR"] = float(rate)
-            elif series.region == "europe":
-                regional_fx["EUR"] = float(rate)
-            return regional_fx
-
-        points = [
-            RegionalHistoricalPoint(
-                date=bar.date,
-                open=round(self._to_regional_price(bar.open_usd_per_troy_oz, series.region, _fx_for_date(bar.date)), 4),
-                high=round(self._to_regional_price(bar.high_usd_per_troy_oz, series.region, _fx_for_date(bar.date)), 4),
-                low=round(self._to_regional_price(bar.low_usd_per_troy_oz, series.region, _fx_for_date(bar.date)), 4),
-                close=round(self._to_regional_price(bar.close_usd_per_troy_oz, series.region, _fx_for_date(bar.date)), 4),
-                volume=bar.volume,
+        format: str = "rows",
+        date_encoding: str = "iso",
+    ) -> RegionalHistoricalResponse | RegionalHistoricalColumnarResponse:
+        validate_layout(format, date_encoding)
+        bars = series.bars
+        dates = [bar.date for bar in bars]
+        fx_rate = self._aligned_fx_rates(series.region, dates, fx_rates, fx_history)
+        return self._regional_response(
+            series,
+            series.region,
+            dates,
+            troy_oz_to_grams(_usd_ohlc(bars)),
+            [bar.volume for bar in bars],
+            fx_rate,
+            format,
+            date_encoding,
+        )
+
+    def to_multi_region_response(
+        self,
+        series: NormalizedHistoricalSeries,
+        regions: list[str],
+        fx_rates: dict[str, float],
+        fx_histories: dict[str, pd.Series] | None = None,
+        points: int | None = None,
+        format: str = "rows",
+        date_encoding: str = "iso",
+    ) -> MultiRegionHistoricalResponse:
+        """Regionalize one canonical USD series for several regions.
+
+        Bars, FX alignment and (with `points`) the LTTB selection are computed once
+        and shared, so every region reports the same dates.
+        """
+        validate_layout(format, date_encoding)
+        bars = series.bars
+        source_rows = len(bars)
+        grams = troy_oz_to_grams(_usd_ohlc(bars))
+        if points is not None and points < source_rows:
+            x = np.fromiter((bar.date.toordinal() for bar in bars), dtype=np.float64, count=source_rows)
+            keep = lttb_indices(x, grams[:, 3], points)
+            bars = [bars[int(idx)] for idx in keep]
+            grams = grams[keep]
+        dates = [bar.date for bar in bars]
+        volumes = [bar.volume for bar in bars]
+        aligned = self._aligned_fx_table(regions, dates, fx_rates, fx_histories or {})
+        downsampled = len(bars) < source_rows
+        payloads = {}
+        for region in regions:
+            payload = self._regional_response(
+                series, region, dates, grams, volumes, aligned[region], format, date_encoding
             )
-            for bar in series.bars
-        ]
-        return RegionalHistoricalResponse(
+            if downsampled:
+                payload = payload.model_copy(update={"source_rows": source_rows, "downsample": "lttb"})
+            payloads[region] = payload
+        return MultiRegionHistoricalResponse.model_construct(
             commodity=series.commodity,
-            region=series.region,
-            currency=self._region_currency[series.region],
-            unit=self._unit_for(series.commodity, series.region),
+            regions=list(regions),
+            rows=len(bars),
+            series=payloads,
+            source_rows=source_rows if downsampled else None,
+            downsample="lttb" if downsampled else None,
+        )
+
+    def _regional_response(
+        self,
+        series: NormalizedHistoricalSeries,
+        region: str,
+        dates: list,
+        grams_ohlc: np.ndarray,
+        volumes: list,
+        fx_rate: np.ndarray | float | None,
+        format: str,
+        date_encoding: str,
+    ) -> RegionalHistoricalResponse | RegionalHistoricalColumnarResponse:
+        regional = np.round(
+            convert_prices(
+                grams_ohlc,
+                region,
+                fx_rate[:, None] if isinstance(fx_rate, np.ndarray) else fx_rate,
+            ),
+            4,
+        )
+        if format == "columnar":
+            return RegionalHistoricalColumnarResponse.model_construct(
+                commodity=series.commodity,
+                region=region,
+                currency=self._region_currency[region],
+                unit=self._unit_for(series.commodity, region),
+                rows=len(dates),
+                date_encoding=date_encoding,
+                columns=RegionalHistoricalColumns.model_construct(
+                    date=date_column(dates, date_encoding),
+                    open=regional[:, 0].tolist(),
+                    high=regional[:, 1].tolist(),
+                    low=regional[:, 2].tolist(),
+                    close=regional[:, 3].tolist(),
+                    volume=volumes,
+                ),
+            )
+        # Values come from our own bars and conversion, so the points are built in a
+        # single core validation pass rather than one model __init__ per bar.
+        points = _POINTS.validate_python(
+            [
+                {"date": date_, "open": open_, "high": high, "low": low, "close": close, "volume": volume}
+                for date_, (open_, high, low, close), volume in zip(dates, regional.tolist(), volumes)
+            ]
+        )
+        return RegionalHistoricalResponse.model_construct(
+            commodity=series.commodity,
+            region=region,
+            currency=self._region_currency[region],
+            unit=self._unit_for(series.commodity, region),
             rows=len(points),
             data=points,
         )
+
+    def to_columnar(
+        self,
+        response: RegionalHistoricalResponse,
+        date_encoding: str = "iso",
+    ) -> RegionalHistoricalColumnarResponse:
+        """Transpose an already-built (e.g. downsampled) row response into parallel arrays."""
+        validate_layout("columnar", date_encoding)
+        points = response.data
+        return RegionalHistoricalColumnarResponse.model_construct(
+            commodity=response.commodity,
+            region=response.region,
+            currency=response.currency,
+            unit=response.unit,
+            rows=response.rows,
+            date_encoding=date_encoding,
+            columns=RegionalHistoricalColumns.model_construct(
+                date=date_column([point.date for point in points], date_encoding),
+                open=[point.open for point in points],
+                high=[point.high for point in points],
+                low=[point.low for point in points],
+                close=[point.close for point in points],
+                volume=[point.volume for point in points],
+            ),
+            source_rows=response.source_rows,
+            downsample=response.downsample,
+        )
+
+    def to_normalized_columns(
+        self,
+        series: NormalizedHistoricalSeries,
+        date_encoding: str = "iso",
+    ) -> NormalizedHistoricalColumns:
+        validate_layout("columnar", date_encoding)
+        bars = series.bars
+        return NormalizedHistoricalColumns.model_construct(
+            date=date_column([bar.date for bar in bars], date_encoding),
+            open_usd_per_troy_oz=[bar.open_usd_per_troy_oz for bar in bars],
+            high_usd_per_troy_oz=[bar.high_usd_per_troy_oz for bar in bars],
+            low_usd_per_troy_oz=[bar.low_usd_per_troy_oz for bar in bars],
+            close_usd_per_troy_oz=[bar.close_usd_per_troy_oz for bar in bars],
+            volume=[bar.volume for bar in bars],
+        )
+
+    def _aligned_fx_rates(
+        self,
+        region: str,
+        dates: list,
+        fx_rates: dict[str, float],
+        fx_history: pd.Series | None,
+    ) -> np.ndarray | float | None:
+        """Per-bar regional FX rate: the latest history rate on or before each date, else spot."""
+        histories = {} if fx_history is None else {region: fx_history}
+        return self._aligned_fx_table([region], dates, fx_rates, histories)[region]
+
+    def _aligned_fx_table(
+        self,
+        regions: list[str],
+        dates: list,
+        fx_rates: dict[str, float],
+        fx_histories: dict[str, pd.Series],
+    ) -> dict[str, np.ndarray | float | None]:
+        """Align every region's FX history to the bar dates in one forward-filling reindex."""
+        spot: dict[str, float] = {}
+        histories: dict[str, pd.Series] = {}
+        for region in regions:
+            if region == "us":
+                continue
+            currency = self._region_currency[region]
+            spot[region] = (fx_rates or FALLBACK_FX).get(currency, FALLBACK_FX[currency])
+            history = fx_histories.get(region)
+            if history is not None and not history.empty:
+                histories[region] = history[~history.index.duplicated(keep="last")]
+        out: dict[str, np.ndarray | float | None] = {region: spot.get(region) for region in regions}
+        if histories:
+            # Forward-fill each column over the union of fix dates first, so a date where
+            # only another currency has a fix still carries this currency's last rate.
+            table = pd.concat(histories, axis=1, sort=True).ffill()
+            aligned = table.reindex(pd.DatetimeIndex(dates).normalize(), method="ffill")
+            for region in histories:
+                out[region] = aligned[region].fillna(spot[region]).to_numpy(dtype=np.float64)
+        return out
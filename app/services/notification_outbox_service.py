@@ -0,0 +1,153 @@
+"""Transactional outbox for alert notifications.
+
+Alert evaluation records the AlertHistory row and the message to send in one
+transaction, and returns without talking to any provider. NotificationDispatcher
+drains due rows in batches. Each batch is claimed with a short lease, so several
+dispatchers can run side by side. Failed sends are retried with exponential
+backoff up to a maximum number of attempts.
+
+The outbox row's idempotency key is derived from the history row and is unique
+in the table, so a repeated enqueue never queues a message twice. Delivery is at
+least once. The key is forwarded to providers that accept one (Resend), which
+drop a retried request that already went through. WhatsApp providers take no
+such key, so a process that dies after a WhatsApp send but before `complete`
+records it sends that message again once the claim expires.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.alert_history import AlertHistory
+from app.models.notification_outbox import NotificationOutbox
+from app.services.email_service import EmailDeliveryResult
+from app.services.whatsapp_service import WhatsAppDeliveryResult
+
+DeliveryResult = EmailDeliveryResult | WhatsAppDeliveryResult
+
+# AlertHistory.email_status while the notification waits in the outbox.
+QUEUED = "queued"
+PENDING = "pending"
+# A claimed batch that is not completed within this window becomes claimable again.
+CLAIM_SECONDS = 300
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class NotificationOutboxService:
+    def __init__(self) -> None:
+        self.settings = get_settings()
+
+    async def enqueue(
+        self,
+        session: AsyncSession,
+        history: AlertHistory,
+        *,
+        channel: str,
+        recipient: str,
+        body: str,
+        subject: str | None = None,
+        market_context: str | None = None,
+    ) -> NotificationOutbox:
+        """Add the outbox row for `history` to the caller's transaction."""
+        if history.id is None:
+            await session.flush()
+        row = NotificationOutbox(
+            idempotency_key=f"{channel}:alert-history:{history.id}",
+            channel=channel,
+            alert_id=history.alert_id,
+            alert_history_id=history.id,
+            recipient=recipient,
+            subject=subject,
+            body=body,
+            market_context=market_context,
+            status=PENDING,
+            next_attempt_at=_now(),
+        )
+        session.add(row)
+        return row
+
+    async def claim(self, session: AsyncSession, owner: str, limit: int) -> list[NotificationOutbox]:
+        """Lease up to `limit` due rows to `owner` and commit the claim."""
+        now = _now()
+        claimable = (
+            (NotificationOutbox.status == PENDING)
+            & (NotificationOutbox.next_attempt_at <= now)
+            & or_(NotificationOutbox.claimed_until.is_(None), NotificationOutbox.claimed_until < now)
+        )
+        ids = (
+            await session.execute(
+                select(NotificationOutbox.id)
+                .where(claimable)
+                .order_by(NotificationOutbox.next_attempt_at, NotificationOutbox.id)
+                .limit(limit)
+            )
+        ).scalars().all()
+        if not ids:
+            return []
+        await session.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(ids))
+            .where(claimable)
+            .values(claimed_by=owner, claimed_until=now + timedelta(seconds=CLAIM_SECONDS))
+        )
+        await session.commit()
+        result = await session.execute(
+            select(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(ids))
+            .where(NotificationOutbox.claimed_by == owner)
+            .order_by(NotificationOutbox.id)
+        )
+        return list(result.scalars().all())
+
+    def _backoff(self, attempts: int) -> timedelta:
+        base = max(1, self.settings.notification_retry_base_seconds)
+        delay = min(self.settings.notification_retry_max_seconds, base * 2 ** (attempts - 1))
+        # Jitter spreads retries of a provider outage over the window.
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    async def complete(self, session: AsyncSession, outcomes: dict[int, DeliveryResult]) -> None:
+        """Record send outcomes on the outbox and history rows, scheduling retries, and commit."""
+        if not outcomes:
+            return
+        now = _now()
+        rows = (
+            await session.execute(select(NotificationOutbox).where(NotificationOutbox.id.in_(list(outcomes))))
+        ).scalars().all()
+        histories = {
+            history.id: history
+            for history in (
+                await session.execute(
+                    select(AlertHistory).where(AlertHistory.id.in_([row.alert_history_id for row in rows]))
+                )
+            ).scalars()
+        }
+        max_attempts = max(1, self.settings.notification_max_attempts)
+        for row in rows:
+            outcome = outcomes[row.id]
+            row.attempts += 1
+            row.provider = outcome.provider
+            row.error = outcome.error[:512] if outcome.error else None
+            row.claimed_by = None
+            row.claimed_until = None
+            if outcome.status == "failed" and row.attempts < max_attempts:
+                row.next_attempt_at = now + self._backoff(row.attempts)
+            else:
+                row.status = outcome.status
+                if outcome.status == "sent":
+                    row.sent_at = now
+            history = histories.get(row.alert_history_id)
+            if history is None:
+                continue
+            history.delivery_provider = outcome.provider
+            history.delivery_error = row.error
+            history.delivery_attempts = (history.delivery_attempts or 0) + max(1, outcome.attempts)
+            if row.status != PENDING:
+                history.email_status = row.status
+        await session.commit()
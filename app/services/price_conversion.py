@@ -6,6 +6,8 @@ All conversions go through grams as the base unit.
 """
 from __future__ import annotations
 
+import numpy as np
+
 TROY_OZ_TO_GRAMS: float = 31.1035
 TEN_GRAMS: float = 10.0
 
@@ -86,6 +88,30 @@ def convert_price(
         raise ValueError(f"Unknown region: {region!r}. Must be one of: india, us, europe")
 
 
+def convert_prices(
+    price_per_gram_usd: np.ndarray,
+    region: str,
+    fx_rate: np.ndarray | float | None = None,
+) -> np.ndarray:
+    """
+    Vectorized `convert_price` over an array of USD-per-gram prices.
+
+    `fx_rate` is the regional currency's rate vs USD, either a scalar or an
+    array that broadcasts against the prices (e.g. one rate per row). The
+    arithmetic matches `convert_price` step for step, so results are identical.
+    """
+    region = region.lower()
+    if region == "us":
+        return grams_to_troy_oz(price_per_gram_usd)
+    if region not in REGION_CURRENCY:
+        raise ValueError(f"Unknown region: {region!r}. Must be one of: india, us, europe")
+    if fx_rate is None:
+        fx_rate = FALLBACK_FX[REGION_CURRENCY[region]]
+    if region == "india":
+        return grams_to_10g(price_per_gram_usd * fx_rate)
+    return price_per_gram_usd * fx_rate
+
+
 def format_price(price: float, region: str) -> str:
     """
     Format a regional price with currency symbol and unit.
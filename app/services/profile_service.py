@@ -7,9 +7,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user_profile import UserProfile
 from app.schemas.responses import UserProfileResponse, UserProfileUpdateRequest
+from app.services.user_cache import profile_cache
 
 
 class ProfileService:
+    async def get(self, session: AsyncSession, user_sub: str) -> UserProfileResponse | None:
+        cached = profile_cache.get(user_sub)
+        if cached is not None:
+            return cached
+        result = await session.execute(select(UserProfile).where(UserProfile.user_sub == user_sub).limit(1))
+        profile = result.scalar_one_or_none()
+        return profile_cache.put(user_sub, self._to_response(profile)) if profile else None
+
     async def get_or_create(
         self,
         session: AsyncSession,
@@ -19,6 +28,9 @@ class ProfileService:
         picture_url: str | None = None,
         user_context: dict | None = None,
     ) -> UserProfileResponse:
+        cached = profile_cache.get(user_sub)
+        if cached is not None and not self._claims_differ(cached, user_email, user_name, picture_url):
+            return cached
         result = await session.execute(select(UserProfile).where(UserProfile.user_sub == user_sub).limit(1))
         profile = result.scalar_one_or_none()
         if not profile:
@@ -34,7 +46,7 @@ class ProfileService:
             session.add(profile)
             await session.commit()
             await session.refresh(profile)
-            return self._to_response(profile)
+            return profile_cache.put(user_sub, self._to_response(profile))
 
         dirty = False
         if user_email and profile.email != user_email:
@@ -49,7 +61,7 @@ class ProfileService:
         if dirty:
             await session.commit()
             await session.refresh(profile)
-        return self._to_response(profile)
+        return profile_cache.put(user_sub, self._to_response(profile))
 
     async def update(
         self,
@@ -75,10 +87,25 @@ class ProfileService:
         if user_email and profile.email != user_email:
             profile.email = user_email
 
+        profile_cache.invalidate(user_sub)
         await session.commit()
         await session.refresh(profile)
         _ = current
-        return self._to_response(profile)
+        return profile_cache.put(user_sub, self._to_response(profile))
+
+    @staticmethod
+    def _claims_differ(
+        profile: UserProfileResponse,
+        user_email: str | None,
+        user_name: str | None,
+        picture_url: str | None,
+    ) -> bool:
+        # Mirrors the sync in get_or_create: only non-empty claims that changed need a write.
+        return bool(
+            (user_email and profile.email != user_email)
+            or (user_name and profile.name != user_name)
+            or (picture_url and profile.picture_url != picture_url)
+        )
 
     def _to_response(self, row: UserProfile) -> UserProfileResponse:
         return UserProfileResponse(
@@ -0,0 +1,64 @@
+"""In-process stream of quote updates.
+
+Whatever refreshes live quotes publishes them here; consumers such as the alert
+worker subscribe and react to each tick without fetching anything themselves.
+Publishing never blocks: every subscription keeps only the latest quote per
+market, so a slow consumer skips intermediate ticks rather than falling behind.
+Threshold ladders compare against the previous observation, so a skipped tick
+cannot hide a crossing.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from app.services.market_quote_service import MarketQuote
+
+logger = logging.getLogger(__name__)
+
+Market = tuple[str, str]
+
+
+class QuoteSubscription:
+    def __init__(self, bus: QuoteEventBus) -> None:
+        self._bus = bus
+        self._pending: dict[Market, MarketQuote] = {}
+        self._ready = asyncio.Event()
+
+    def _offer(self, quotes: Iterable[MarketQuote]) -> None:
+        for quote in quotes:
+            self._pending[(quote.commodity, quote.region)] = quote
+        if self._pending:
+            self._ready.set()
+
+    async def get(self) -> dict[Market, MarketQuote]:
+        """Wait for the next tick; returns the latest quote of every market updated since the last call."""
+        await self._ready.wait()
+        self._ready.clear()
+        quotes, self._pending = self._pending, {}
+        return quotes
+
+    def close(self) -> None:
+        self._bus._subscriptions.discard(self)
+
+
+class QuoteEventBus:
+    def __init__(self) -> None:
+        self._subscriptions: set[QuoteSubscription] = set()
+
+    def subscribe(self) -> QuoteSubscription:
+        subscription = QuoteSubscription(self)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def publish(self, quotes: Iterable[MarketQuote]) -> None:
+        quotes = list(quotes)
+        if not quotes:
+            return
+        for subscription in list(self._subscriptions):
+            subscription._offer(quotes)
+        logger.debug("quote_tick_published markets=%s subscribers=%s", len(quotes), len(self._subscriptions))
+
+
+quote_events = QuoteEventBus()
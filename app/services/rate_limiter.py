@@ -1,6 +1,21 @@
+"""Rate limiting in Redis, with an in-process fallback.
+
+Limits use GCRA (generic cell rate algorithm). Each key stores one theoretical
+arrival time (TAT). A request is allowed unless it would push the TAT more than
+one window past now. `limit` requests per `window_seconds` pass as a burst, then
+at a steady limit/window rate. The check and the update run in one Lua script
+invoked with EVALSHA. Every decision is therefore atomic, costs one round trip,
+and leaves the key with a TTL.
+
+When Redis is unreachable the limiter falls back to in-process token buckets with
+the same limit and window, and retries Redis after REDIS_RETRY_SECONDS. Limits are
+then enforced per process rather than globally: looser, but never open.
+"""
 from __future__ import annotations
 
 import logging
+import time
+from collections import OrderedDict
 from urllib.parse import parse_qs, urlparse
 
 from app.core.config import get_settings
@@ -12,17 +27,62 @@ try:
 except Exception:  # pragma: no cover - optional dependency in local envs
     redis = None  # type: ignore[assignment]
 
+# KEYS[1] = limiter key; ARGV[1] = emission interval, ARGV[2] = window, both in
+# microseconds. Integer microseconds stay exact in Lua's doubles, and the TAT is
+# written with %.0f so no precision is lost between calls. TIME keeps every
+# process on the server's clock.
+GCRA_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local emission = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local next_tat = tat + emission
+if next_tat - now > window then return 0 end
+redis.call('SET', KEYS[1], string.format('%.0f', next_tat), 'PX', math.ceil((next_tat - now) / 1000))
+return 1
+"""
+
+REDIS_RETRY_SECONDS = 5.0
+LOCAL_MAX_KEYS = 10_000
+
+
+class LocalTokenBuckets:
+    """Per-process token buckets: `limit` tokens, refilled at limit/window per second."""
+
+    def __init__(self, max_keys: int = LOCAL_MAX_KEYS) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def allow(self, key: str, limit: int, window_seconds: float) -> bool:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(limit), now))
+        tokens = min(float(limit), tokens + (now - updated) * limit / window_seconds)
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            # Least recently used first; an evicted key restarts with a full bucket.
+            self._buckets.popitem(last=False)
+        return allowed
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
 
 class RedisRateLimiter:
     def __init__(self) -> None:
         self._client = None
+        self._script = None
         self._available = redis is not None
+        self._redis_retry_at = 0.0
+        self.local = LocalTokenBuckets()
 
-    async def allow(self, key: str, limit: int, window_seconds: int) -> bool:
-        if not self._available:
-            return True
-
-        if self._client is None:
+    def _gcra(self):
+        if self._script is None:
             settings = get_settings()
             parsed = urlparse(settings.redis_url)
             query = parse_qs(parsed.query)
@@ -32,13 +92,28 @@ class RedisRateLimiter:
                 decode_responses=True,
                 ssl=use_tls,
             )
+            # Script objects call EVALSHA and load the script only on NOSCRIPT.
+            self._script = self._client.register_script(GCRA_SCRIPT)
+        return self._script
 
-        try:
-            current = await self._client.incr(key)
-            if current == 1:
-                await self._client.expire(key, window_seconds)
-            return current <= limit
-        except Exception as exc:
-            logger.warning("rate_limiter_error key=%s error=%s", key, exc)
-            # Fail open so alert processing is not blocked by Redis outages.
-            return True
+    async def allow(self, key: str, limit: int, window_seconds: int) -> bool:
+        limit = max(1, int(limit))
+        window_us = max(1, int(window_seconds * 1_000_000))
+        if self._available and time.monotonic() >= self._redis_retry_at:
+            try:
+                allowed = await self._gcra()(keys=[key], args=[max(1, window_us // limit), window_us])
+            except Exception as exc:
+                logger.warning(
+                    "rate_limiter_redis_unavailable key=%s error=%s fallback=local retry_in=%ss",
+                    key,
+                    exc,
+                    REDIS_RETRY_SECONDS,
+                )
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+            else:
+                if self._redis_retry_at:
+                    logger.info("rate_limiter_redis_recovered key=%s", key)
+                    self._redis_retry_at = 0.0
+                return bool(allowed)
+        # Redis is down or not installed: limit per process rather than fail open.
+        return self.local.allow(key, limit, window_seconds)
@@ -5,10 +5,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user_settings import UserSettings
 from app.schemas.responses import UserSettingsResponse, UserSettingsUpdateRequest
+from app.services.user_cache import settings_cache
 
 
 class SettingsService:
     async def get_or_create(self, session: AsyncSession, user_id: str) -> UserSettingsResponse:
+        cached = settings_cache.get(user_id)
+        if cached is not None:
+            return cached
         result = await session.execute(select(UserSettings).where(UserSettings.user_id == user_id).limit(1))
         settings = result.scalar_one_or_none()
         if not settings:
@@ -28,7 +32,7 @@ class SettingsService:
             session.add(settings)
             await session.commit()
             await session.refresh(settings)
-        return self._to_response(settings)
+        return settings_cache.put(user_id, self._to_response(settings))
 
     async def update(
         self,
@@ -47,9 +51,10 @@ class SettingsService:
         for field, value in update_data.items():
             setattr(settings, field, value)
 
+        settings_cache.invalidate(user_id)
         await session.commit()
         await session.refresh(settings)
-        return self._to_response(settings)
+        return settings_cache.put(user_id, self._to_response(settings))
 
     def _to_response(self, row: UserSettings) -> UserSettingsResponse:
         return UserSettingsResponse(
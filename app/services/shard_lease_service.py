@@ -0,0 +1,184 @@
+"""Database leases that partition background work into shards across processes.
+
+Every process running a worker pool heartbeats a membership row and claims a fair
+share of the pool's shards: ceil(shards / live members). Claims are compare-and-set
+updates on rows whose lease expired, so two processes never hold the same shard.
+Holders renew their leases from a heartbeat well inside the TTL. Shards held above
+the fair share are released so that a newly started process picks them up on its
+next claim, and the shards of a process that died are reclaimed once their leases
+expire.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.models.worker_lease import WorkerLease
+
+logger = logging.getLogger(__name__)
+
+# Expiry written on released or never-claimed shards.
+UNCLAIMED = datetime(1970, 1, 1)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class ShardLeaseService:
+    def __init__(
+        self,
+        pool: str,
+        shard_count: int,
+        ttl_seconds: float,
+        *,
+        owner: str | None = None,
+        session_factory=AsyncSessionLocal,
+    ) -> None:
+        self.pool = pool
+        self.shard_count = max(1, shard_count)
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.session_factory = session_factory
+        self.held: frozenset[int] = frozenset()
+        # Membership rows live beside the shard rows, under their own pool name.
+        self.member_pool = f"{pool}:members"
+        self.member_slot = uuid.uuid4().int & 0x7FFFFFFF
+
+    async def _ensure_rows(self) -> None:
+        async with self.session_factory() as session:
+            existing = set(
+                (await session.execute(select(WorkerLease.shard).where(WorkerLease.pool == self.pool))).scalars()
+            )
+            missing = [shard for shard in range(self.shard_count) if shard not in existing]
+            if not missing:
+                return
+            session.add_all(
+                WorkerLease(pool=self.pool, shard=shard, owner="", expires_at=UNCLAIMED) for shard in missing
+            )
+            try:
+                await session.commit()
+            except IntegrityError:
+                # Another process seeded the same rows first.
+                await session.rollback()
+
+    async def _heartbeat_membership(self, session: AsyncSession, now: datetime) -> int:
+        """Refresh this process's membership row and return the number of live members."""
+        member = and_(WorkerLease.pool == self.member_pool, WorkerLease.shard == self.member_slot)
+        renewed = await session.execute(
+            update(WorkerLease).where(member).values(expires_at=now + self.ttl, heartbeat_at=now)
+        )
+        if renewed.rowcount == 0:
+            session.add(
+                WorkerLease(
+                    pool=self.member_pool,
+                    shard=self.member_slot,
+                    owner=self.owner,
+                    expires_at=now + self.ttl,
+                    heartbeat_at=now,
+                )
+            )
+        await session.execute(
+            delete(WorkerLease)
+            .where(WorkerLease.pool == self.member_pool)
+            .where(WorkerLease.expires_at < now - self.ttl * 10)
+        )
+        await session.flush()
+        live = await session.execute(
+            select(WorkerLease.owner).where(WorkerLease.pool == self.member_pool).where(WorkerLease.expires_at > now)
+        )
+        return len(set(live.scalars()) | {self.owner})
+
+    async def acquire(self) -> frozenset[int]:
+        """Renew held leases, rebalance to the fair share and return the shards this process owns."""
+        await self._ensure_rows()
+        async with self.session_factory() as session:
+            now = _now()
+            expires_at = now + self.ttl
+            live_members = await self._heartbeat_membership(session, now)
+            mine = and_(WorkerLease.pool == self.pool, WorkerLease.owner == self.owner)
+            await session.execute(update(WorkerLease).where(mine).values(expires_at=expires_at, heartbeat_at=now))
+            rows = (
+                await session.execute(
+                    select(WorkerLease.shard, WorkerLease.owner, WorkerLease.expires_at)
+                    .where(WorkerLease.pool == self.pool)
+                    .where(WorkerLease.shard < self.shard_count)
+                    .order_by(WorkerLease.shard)
+                )
+            ).all()
+            held = [shard for shard, owner, _ in rows if owner == self.owner]
+            fair_share = math.ceil(self.shard_count / live_members)
+
+            for shard in held[fair_share:]:
+                await session.execute(
+                    update(WorkerLease)
+                    .where(mine)
+                    .where(WorkerLease.shard == shard)
+                    .values(owner="", expires_at=UNCLAIMED)
+                )
+            held = held[:fair_share]
+
+            for shard, _, lease_expiry in rows:
+                if len(held) >= fair_share:
+                    break
+                if lease_expiry > now:
+                    continue
+                claimed = await session.execute(
+                    update(WorkerLease)
+                    .where(WorkerLease.pool == self.pool)
+                    .where(WorkerLease.shard == shard)
+                    .where(WorkerLease.expires_at <= now)
+                    .values(owner=self.owner, expires_at=expires_at, heartbeat_at=now)
+                )
+                if claimed.rowcount == 1:
+                    held.append(shard)
+            await session.commit()
+
+        acquired = frozenset(held)
+        if acquired != self.held:
+            logger.info(
+                "shard_leases_changed pool=%s owner=%s shards=%s fair_share=%s live_members=%s",
+                self.pool,
+                self.owner,
+                sorted(acquired),
+                fair_share,
+                live_members,
+            )
+        self.held = acquired
+        return acquired
+
+    async def renew(self) -> frozenset[int]:
+        """Heartbeat: extend membership and the leases still owned by this process."""
+        async with self.session_factory() as session:
+            now = _now()
+            await self._heartbeat_membership(session, now)
+            mine = and_(WorkerLease.pool == self.pool, WorkerLease.owner == self.owner)
+            await session.execute(update(WorkerLease).where(mine).values(expires_at=now + self.ttl, heartbeat_at=now))
+            self.held = frozenset((await session.execute(select(WorkerLease.shard).where(mine))).scalars())
+            await session.commit()
+        return self.held
+
+    async def release(self) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                delete(WorkerLease)
+                .where(WorkerLease.pool == self.member_pool)
+                .where(WorkerLease.shard == self.member_slot)
+            )
+            await session.execute(
+                update(WorkerLease)
+                .where(WorkerLease.pool == self.pool)
+                .where(WorkerLease.owner == self.owner)
+                .values(owner="", expires_at=UNCLAIMED)
+            )
+            await session.commit()
+        self.held = frozenset()
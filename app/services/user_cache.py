@@ -0,0 +1,55 @@
+"""Short-TTL per-user caches of settings and profile rows.
+
+Settings and profiles are read on most authenticated requests (/predict without a
+horizon, every AI chat message, alert creation) but change rarely. The services
+read through these caches and refresh the entry on their own writes. Entries are
+per process, so a write handled by another worker becomes visible here within
+the TTL.
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+from app.core.config import get_settings
+from app.schemas.responses import UserProfileResponse, UserSettingsResponse
+
+T = TypeVar("T")
+
+
+class UserRowCache(Generic[T]):
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000) -> None:
+        self._entries: OrderedDict[str, tuple[T, float]] = OrderedDict()
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+
+    def get(self, user_key: str) -> T | None:
+        entry = self._entries.get(user_key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(user_key, None)
+            return None
+        self._entries.move_to_end(user_key)
+        return value
+
+    def put(self, user_key: str, value: T) -> T:
+        if self._ttl_seconds <= 0:
+            return value
+        self._entries[user_key] = (value, time.monotonic() + self._ttl_seconds)
+        self._entries.move_to_end(user_key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, user_key: str) -> None:
+        self._entries.pop(user_key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+settings_cache: UserRowCache[UserSettingsResponse] = UserRowCache(get_settings().user_cache_ttl_seconds)
+profile_cache: UserRowCache[UserProfileResponse] = UserRowCache(get_settings().user_cache_ttl_seconds)
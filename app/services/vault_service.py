@@ -1,22 +1,69 @@
+"""Infisical-backed secrets held in an immutable in-memory snapshot.
+
+All known paths are exported in one batch (one `infisical export` per path, run
+concurrently) into a read-only snapshot. Lookups are plain dict reads and never
+spawn the CLI; an asyncio refresher re-exports on a jittered interval and swaps
+the whole snapshot in a single assignment, keeping the previous values for any
+path whose export failed.
+"""
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import os
+import random
 import shutil
 import subprocess
-import threading
 import time
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
 
 from dotenv import dotenv_values
 
 logger = logging.getLogger(__name__)
 
+PATH_KEYS: dict[str, tuple[str, ...]] = {
+    "ai": (
+        "OPENROUTER_API_KEY",
+        "NEWSAPI_KEY",
+        "ANTHROPIC_API_KEY",
+    ),
+    "database": (
+        "DATABASE_URL",
+        "REDIS_URL",
+        "POSTGRES_USER",
+        "POSTGRES_PASSWORD",
+        "POSTGRES_HOST",
+        "POSTGRES_DB",
+    ),
+    "email": (
+        "SENDGRID_API_KEY",
+        "RESEND_API_KEY",
+    ),
+    "auth": (
+        "AUTH0_DOMAIN",
+        "AUTH0_CLIENT_ID",
+        "AUTH0_CLIENT_SECRET",
+        "AUTH0_SECRET",
+        "JWT_SECRET",
+        "TWILIO_ACCOUNT_SID",
+        "TWILIO_AUTH_TOKEN",
+        "TWILIO_WHATSAPP_NUMBER",
+        "WHATSAPP_META_ACCESS_TOKEN",
+        "WHATSAPP_META_PHONE_NUMBER_ID",
+    ),
+}
+# Spread refreshes of many replicas so they do not hit Infisical in lockstep.
+REFRESH_JITTER_FRACTION = 0.1
+_EMPTY: Mapping[str, str] = MappingProxyType({})
+
 
 @dataclass(frozen=True)
-class _CacheEntry:
-    data: dict[str, str]
-    fetched_at: float
+class SecretSnapshot:
+    data: Mapping[str, Mapping[str, str]] = field(default_factory=lambda: MappingProxyType({}))
+    fetched_at: float = 0.0
 
 
 class VaultService:
@@ -42,17 +89,14 @@ class VaultService:
         self.client_id = self._get_config("INFISICAL_CLIENT_ID")
         self.client_secret = self._get_config("INFISICAL_CLIENT_SECRET")
         self.api_url = self._get_config("INFISICAL_API_URL")
-        self.cache_ttl_seconds = int(self._get_config("INFISICAL_CACHE_TTL_SECONDS", "1800"))
         self.refresh_interval_seconds = int(self._get_config("INFISICAL_REFRESH_INTERVAL_SECONDS", "1800"))
         self.renew_interval_seconds = int(self._get_config("INFISICAL_TOKEN_REFRESH_INTERVAL_SECONDS", "600"))
         self.max_retries = max(1, int(self._get_config("INFISICAL_MAX_RETRIES", "3")))
         self.retry_backoff_seconds = max(0.25, float(self._get_config("INFISICAL_RETRY_BACKOFF_SECONDS", "1.0")))
-        self._lock = threading.RLock()
-        self._cache: dict[str, _CacheEntry] = {}
-        self._known_paths: set[str] = set()
+        self._snapshot = SecretSnapshot()
         self._binary = shutil.which("infisical")
         self._enabled = bool(self._binary and self.project_id and (self.token or (self.client_id and self.client_secret)))
-        self._started = False
+        self._tasks: list[asyncio.Task] = []
 
         if not self._enabled:
             logger.info(
@@ -65,7 +109,8 @@ class VaultService:
             )
             return
         self.authenticate()
-        self._start_background_loops()
+        # Blocking once at startup so configuration reads see real values.
+        self._swap({path: data for path in PATH_KEYS if (data := self._export_with_retry(path)) is not None})
 
     @property
     def is_production(self) -> bool:
@@ -108,50 +153,50 @@ class VaultService:
                 time.sleep(self.retry_backoff_seconds * attempt)
         return False
 
+    @property
+    def snapshot(self) -> SecretSnapshot:
+        return self._snapshot
+
     def get_secret(self, path: str, force_refresh: bool = False) -> dict[str, str]:
         normalized = self._normalize_path(path)
-        with self._lock:
-            self._known_paths.add(normalized)
-            cached = self._cache.get(normalized)
-            if cached and not force_refresh and (time.monotonic() - cached.fetched_at) < self.cache_ttl_seconds:
-                return dict(cached.data)
-
-        data = self._fetch_secret_with_retry(normalized)
-        if data is not None:
-            with self._lock:
-                self._cache[normalized] = _CacheEntry(data=data, fetched_at=time.monotonic())
-            return dict(data)
-
-        with self._lock:
-            cached = self._cache.get(normalized)
-            if cached:
-                return dict(cached.data)
-        return {}
+        if force_refresh:
+            data = self._export_with_retry(normalized)
+            if data is not None:
+                self._swap({normalized: data})
+        return dict(self._snapshot.data.get(normalized, _EMPTY))
 
     def invalidate_secret(self, path: str) -> None:
-        normalized = self._normalize_path(path)
-        with self._lock:
-            self._cache.pop(normalized, None)
+        """Re-export one path now instead of waiting for the next refresh."""
+        self.get_secret(path, force_refresh=True)
 
-    def refresh_all_cached(self) -> None:
-        with self._lock:
-            paths = list(self._known_paths)
-        for path in paths:
-            self.get_secret(path, force_refresh=True)
-        if paths:
-            logger.info("infisical_secret_cache_refresh paths=%s", len(paths))
+    def _lookup(self, path: str, key: str) -> str | None:
+        return self._snapshot.data.get(self._normalize_path(path), _EMPTY).get(key)
+
+    def _swap(self, updates: dict[str, dict[str, str]]) -> None:
+        if not updates:
+            return
+        merged = dict(self._snapshot.data)
+        merged.update({path: MappingProxyType(dict(data)) for path, data in updates.items()})
+        # A single assignment: readers see either the old or the new snapshot, never a mix.
+        self._snapshot = SecretSnapshot(data=MappingProxyType(merged), fetched_at=time.monotonic())
 
-    def _fetch_secret_with_retry(self, path: str) -> dict[str, str] | None:
+    async def refresh_snapshot(self) -> int:
+        """Export every path concurrently and swap in the results; returns paths refreshed."""
+        if not self._enabled:
+            return 0
+        paths = list(dict.fromkeys([*PATH_KEYS, *self._snapshot.data]))
+        results = await asyncio.gather(*(self._export_async(path) for path in paths))
+        updates = {path: data for path, data in zip(paths, results) if data is not None}
+        self._swap(updates)
+        logger.info("infisical_snapshot_refresh paths=%s failed=%s", len(updates), len(paths) - len(updates))
+        return len(updates)
+
+    def _export_with_retry(self, path: str) -> dict[str, str] | None:
         if not self._enabled:
             return None
         for attempt in range(1, self.max_retries + 1):
             try:
-                output: dict[str, str] = {}
-                for key in self._path_keys(path):
-                    value = self._get_secret_value(path=path, key=key)
-                    if value:
-                        output[key] = value
-                return output
+                return self._parse_export(path, self._run_cli(self._export_args(path), token=self.token or None))
             except Exception as exc:
                 logger.warning(
                     "infisical_secret_read_failed path=%s attempt=%s error=%s msg=%s",
@@ -164,6 +209,50 @@ class VaultService:
                     time.sleep(self.retry_backoff_seconds * attempt)
         return None
 
+    async def _export_async(self, path: str) -> dict[str, str] | None:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                output = await self._run_cli_async(self._export_args(path), token=self.token or None)
+                return self._parse_export(path, output)
+            except Exception as exc:
+                logger.warning(
+                    "infisical_secret_read_failed path=%s attempt=%s error=%s msg=%s",
+                    path,
+                    attempt,
+                    exc.__class__.__name__,
+                    str(exc),
+                )
+                if not await asyncio.to_thread(self._try_recover_auth):
+                    await asyncio.sleep(self.retry_backoff_seconds * attempt)
+        return None
+
+    def _export_args(self, path: str) -> list[str]:
+        return [
+            "export",
+            "--projectId",
+            self.project_id,
+            "--env",
+            self.environment,
+            "--path",
+            path if path.startswith("/") else f"/{path}",
+            "--format",
+            "json",
+            "--silent",
+        ]
+
+    def _parse_export(self, path: str, output: str) -> dict[str, str]:
+        payload = json.loads(output or "[]")
+        if isinstance(payload, dict):
+            items = payload.items()
+        else:
+            items = ((item.get("key"), item.get("value")) for item in payload if isinstance(item, dict))
+        wanted = PATH_KEYS.get(path)
+        return {
+            key: value
+            for key, value in items
+            if isinstance(key, str) and isinstance(value, str) and value and (wanted is None or key in wanted)
+        }
+
     def renew_token(self) -> bool:
         if not self._enabled:
             return False
@@ -184,87 +273,46 @@ class VaultService:
             return False
         return self.authenticate()
 
-    def _start_background_loops(self) -> None:
-        if self._started:
+    def start(self) -> None:
+        """Start the snapshot refresher and token renewal on the running event loop."""
+        if not self._enabled or any(not task.done() for task in self._tasks):
             return
-        self._started = True
+        self._tasks = [
+            asyncio.create_task(self._refresh_loop(), name="infisical-snapshot-refresh"),
+            asyncio.create_task(self._renew_loop(), name="infisical-token-renew"),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
 
-        def renew_loop() -> None:
-            while True:
-                time.sleep(self.renew_interval_seconds)
-                self.renew_token()
+    @staticmethod
+    def _jittered(interval: float) -> float:
+        return interval * random.uniform(1 - REFRESH_JITTER_FRACTION, 1 + REFRESH_JITTER_FRACTION)
 
-        def refresh_loop() -> None:
-            while True:
-                time.sleep(self.refresh_interval_seconds)
-                self.refresh_all_cached()
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._jittered(self.refresh_interval_seconds))
+            try:
+                await self.refresh_snapshot()
+            except Exception as exc:
+                logger.warning("infisical_snapshot_refresh_failed error=%s", exc.__class__.__name__)
 
-        threading.Thread(target=renew_loop, daemon=True).start()
-        threading.Thread(target=refresh_loop, daemon=True).start()
+    async def _renew_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._jittered(self.renew_interval_seconds))
+            await asyncio.to_thread(self.renew_token)
 
     def _normalize_path(self, path: str) -> str:
         return path.strip().strip("/") or "ai"
 
-    def _path_keys(self, path: str) -> list[str]:
-        mapping: dict[str, list[str]] = {
-            "ai": [
-                "OPENROUTER_API_KEY",
-                "NEWSAPI_KEY",
-                "ANTHROPIC_API_KEY",
-            ],
-            "database": [
-                "DATABASE_URL",
-                "REDIS_URL",
-                "POSTGRES_USER",
-                "POSTGRES_PASSWORD",
-                "POSTGRES_HOST",
-                "POSTGRES_DB",
-            ],
-            "email": [
-                "SENDGRID_API_KEY",
-                "RESEND_API_KEY",
-            ],
-            "auth": [
-                "AUTH0_DOMAIN",
-                "AUTH0_CLIENT_ID",
-                "AUTH0_CLIENT_SECRET",
-                "AUTH0_SECRET",
-                "JWT_SECRET",
-                "TWILIO_ACCOUNT_SID",
-                "TWILIO_AUTH_TOKEN",
-                "TWILIO_WHATSAPP_NUMBER",
-                "WHATSAPP_META_ACCESS_TOKEN",
-                "WHATSAPP_META_PHONE_NUMBER_ID",
-            ],
-        }
-        return mapping.get(path, [])
-
-    def _get_secret_value(self, path: str, key: str) -> str | None:
-        path_arg = path if path.startswith("/") else f"/{path}"
-        output = self._run_cli(
-            [
-                "secrets",
-                "get",
-                key,
-                "--projectId",
-                self.project_id,
-                "--env",
-                self.environment,
-                "--path",
-                path_arg,
-                "--plain",
-                "--silent",
-            ],
-            token=self.token or None,
-            allow_failure=True,
-        )
-        value = output.strip()
-        return value or None
-
-    def _run_cli(self, args: list[str], token: str | None, allow_failure: bool = False) -> str:
-        if not self._binary:
-            raise RuntimeError("infisical cli not found")
-
+    def _cli_env(self, token: str | None) -> dict[str, str]:
         env = os.environ.copy()
         env["INFISICAL_DISABLE_UPDATE_CHECK"] = "true"
         # Avoid passing empty values from process env; the CLI treats some as invalid config.
@@ -274,23 +322,41 @@ class VaultService:
             env["INFISICAL_API_URL"] = self.api_url
         if token:
             env["INFISICAL_TOKEN"] = token
+        return env
 
+    def _check_cli_result(self, returncode: int, stdout: str, stderr: str) -> str:
+        if returncode != 0:
+            stderr = (stderr or "").strip().lower()
+            if "unauthorized" in stderr or "expired" in stderr:
+                self.token = ""
+            short_err = " ".join(stderr.splitlines()[:2])[:240]
+            raise RuntimeError(f"infisical cli failed: {returncode} ({short_err})")
+        return (stdout or "").strip()
+
+    def _run_cli(self, args: list[str], token: str | None) -> str:
+        if not self._binary:
+            raise RuntimeError("infisical cli not found")
         proc = subprocess.run(
             [self._binary, *args],
-            env=env,
+            env=self._cli_env(token),
             check=False,
             capture_output=True,
             text=True,
         )
-        if proc.returncode != 0:
-            stderr = (proc.stderr or "").strip().lower()
-            if "unauthorized" in stderr or "expired" in stderr:
-                self.token = ""
-            if allow_failure and self._is_secret_not_found_error(stderr):
-                return ""
-            short_err = " ".join(stderr.splitlines()[:2])[:240]
-            raise RuntimeError(f"infisical cli failed: {proc.returncode} ({short_err})")
-        return (proc.stdout or "").strip()
+        return self._check_cli_result(proc.returncode, proc.stdout, proc.stderr)
+
+    async def _run_cli_async(self, args: list[str], token: str | None) -> str:
+        if not self._binary:
+            raise RuntimeError("infisical cli not found")
+        proc = await asyncio.create_subprocess_exec(
+            self._binary,
+            *args,
+            env=self._cli_env(token),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+        return self._check_cli_result(proc.returncode, stdout.decode(), stderr.decode())
 
     def _get_config(self, key: str, default: str = "") -> str:
         value = os.getenv(key)
@@ -317,8 +383,11 @@ class VaultService:
         if key not in fallback_keys:
             fallback_keys = [*fallback_keys, key]
 
+        if force_refresh and self.enabled:
+            self.get_secret(path, force_refresh=True)
+
         if self.enabled and self.is_production:
-            secret = self.get_secret(path, force_refresh=force_refresh).get(key)
+            secret = self._lookup(path, key)
             if secret:
                 return secret
 
@@ -329,18 +398,7 @@ class VaultService:
 
         # In local/dev environments, prefer local env vars but still use Infisical when available.
         if self.enabled:
-            secret = self.get_secret(path, force_refresh=force_refresh).get(key)
+            secret = self._lookup(path, key)
             if secret:
                 return secret
         return default
-
-    @staticmethod
-    def _is_secret_not_found_error(stderr: str) -> bool:
-        markers = (
-            "secret with name",
-            "secret not found",
-            "no secret found",
-            "secret does not exist",
-            "unsuccessful response",
-        )
-        return any(marker in stderr for marker in markers)
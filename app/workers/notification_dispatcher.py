@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.notification_outbox import NotificationOutbox
+from app.services.delivery_throttle import DeliveryThrottle
+from app.services.email_service import EmailDeliveryResult, EmailMessage, EmailService
+from app.services.notification_outbox_service import DeliveryResult, NotificationOutboxService
+from app.services.rate_limiter import RedisRateLimiter
+from app.services.whatsapp_service import WhatsAppService
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """Drains the notification outbox, batching email where the provider has a batch API."""
+
+    def __init__(self) -> None:
+        settings = get_settings()
+        self._task: asyncio.Task | None = None
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.outbox = NotificationOutboxService()
+        self.email = EmailService()
+        self.whatsapp = WhatsAppService()
+        self.throttle = DeliveryThrottle(
+            settings.alert_send_concurrency,
+            settings.delivery_provider_rate_limits,
+            limiter=RedisRateLimiter(),
+        )
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name="notification-dispatcher")
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        settings = get_settings()
+        interval = max(0.5, float(settings.notification_dispatch_interval_seconds))
+        while True:
+            try:
+                # A full batch means more rows are due; drain them before sleeping.
+                while await self.dispatch_pending() >= settings.notification_dispatch_batch_size:
+                    pass
+            except Exception as exc:
+                logger.exception("notification_dispatch_iteration_failed error=%s", exc)
+            await asyncio.sleep(interval)
+
+    async def dispatch_pending(self) -> int:
+        """Claim one batch of due notifications, send it and record the outcomes; returns the batch size."""
+        settings = get_settings()
+        async with AsyncSessionLocal() as session:
+            rows = await self.outbox.claim(session, self.owner, max(1, settings.notification_dispatch_batch_size))
+            if not rows:
+                return 0
+            outcomes: dict[int, DeliveryResult] = {}
+            batch_email = self.email.active_provider() == "resend"
+            emails = [row for row in rows if batch_email and row.channel == "email"]
+            singles = [row for row in rows if row not in emails]
+            if emails:
+                async with self.throttle.slot("resend"):
+                    results = await self.email.send_batch(
+                        [
+                            EmailMessage(
+                                to_email=row.recipient,
+                                subject=row.subject or "",
+                                message=row.body,
+                                market_context=row.market_context or "",
+                                idempotency_key=row.idempotency_key,
+                            )
+                            for row in emails
+                        ]
+                    )
+                for row, result in zip(emails, results):
+                    if result is None:
+                        singles.append(row)
+                    else:
+                        outcomes[row.id] = result
+            batched = len(outcomes)
+            results = await asyncio.gather(*(self._send(row) for row in singles))
+            outcomes.update((row.id, result) for row, result in zip(singles, results))
+            await self.outbox.complete(session, outcomes)
+        sent = sum(1 for result in outcomes.values() if result.status == "sent")
+        logger.info(
+            "notification_dispatch_completed claimed=%s batched=%s sent=%s",
+            len(rows),
+            batched,
+            sent,
+        )
+        return len(rows)
+
+    async def _send(self, row: NotificationOutbox) -> DeliveryResult:
+        try:
+            if row.channel == "whatsapp":
+                provider = get_settings().whatsapp_provider.strip().lower()
+                async with self.throttle.slot(provider):
+                    return await self.whatsapp.send_alert(row.recipient, row.body)
+            async with self.throttle.slot(self.email.active_provider()):
+                return await self.email.send_alert(
+                    row.recipient,
+                    row.subject or "",
+                    row.body,
+                    market_context=row.market_context or "",
+                    idempotency_key=row.idempotency_key,
+                )
+        except Exception as exc:
+            logger.exception("notification_send_failed outbox_id=%s error=%s", row.id, exc)
+            return EmailDeliveryResult(status="failed", error=str(exc), attempts=1)
+
+
+notification_dispatcher = NotificationDispatcher()
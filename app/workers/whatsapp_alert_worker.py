@@ -2,17 +2,22 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
 from app.db.session import AsyncSessionLocal
 from app.models.alert_history import AlertHistory
 from app.models.price_alert import PriceAlert
-from app.services.market_quote_service import MarketQuoteService
+from app.services.alert_evaluator import CHANGE_RULES, AlertEvaluator, LadderRule
+from app.services.alert_service import AlertService
+from app.services.market_quote_service import MarketQuote, MarketQuoteService
+from app.services.notification_outbox_service import QUEUED
+from app.services.quote_events import Market, QuoteEventBus, QuoteSubscription, quote_events
 from app.services.rate_limiter import RedisRateLimiter
-from app.services.whatsapp_service import WhatsAppService
+from app.services.shard_lease_service import ShardLeaseService
 
 logger = logging.getLogger(__name__)
 
@@ -45,122 +50,237 @@ def _format_price(region: str, price: float, unit: str) -> str:
     return f"{symbol}{price:,.2f}/{out_unit}"
 
 
-def _is_breach(direction: str, live_price: float, target_price: float) -> bool:
-    if direction == "above":
-        return live_price >= target_price
-    return live_price <= target_price
+class WhatsAppAlertWorker:
+    """Global alert loop, one per process, over the alert shards this process leases.
 
+    Markets covered by the quote event stream are evaluated on every published tick;
+    the poll only fetches the markets that have not ticked within one poll interval,
+    plus those whose ticks carry no daily change, for the change-based rules alone.
+    """
 
-class WhatsAppAlertWorker:
-    def __init__(self) -> None:
+    def __init__(self, events: QuoteEventBus = quote_events) -> None:
+        settings = get_settings()
         self._task: asyncio.Task | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+        self._tick_task: asyncio.Task | None = None
+        self.events = events
+        self._subscription: QuoteSubscription | None = None
+        # market -> (monotonic time of its last tick, whether the tick had a daily change)
+        self._ticked_at: dict[Market, tuple[float, bool]] = {}
+        # Serializes firing between the poll and tick paths.
+        self._firing = asyncio.Lock()
+        self.poll_interval = max(5, int(settings.whatsapp_alert_poll_interval_seconds))
         self.market = MarketQuoteService()
-        self.whatsapp = WhatsAppService()
         self.rate_limiter = RedisRateLimiter()
+        self.alerts = AlertService()
+        self.evaluator = AlertEvaluator(shard_count=settings.alert_worker_shards)
+        self.leases = ShardLeaseService(
+            "alert-evaluator",
+            settings.alert_worker_shards,
+            settings.alert_worker_lease_ttl_seconds,
+            session_factory=lambda: AsyncSessionLocal(),
+        )
 
     def start(self) -> None:
         if self._task and not self._task.done():
             return
         self._task = asyncio.create_task(self._run(), name="whatsapp-alert-worker")
+        self._heartbeat_task = asyncio.create_task(self._heartbeat(), name="whatsapp-alert-worker-heartbeat")
+        self._subscription = self.events.subscribe()
+        self._tick_task = asyncio.create_task(self._listen(self._subscription), name="whatsapp-alert-worker-ticks")
 
     async def stop(self) -> None:
         if not self._task:
             return
-        self._task.cancel()
-        try:
-            await self._task
-        except asyncio.CancelledError:
-            pass
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        for task in (self._task, self._heartbeat_task, self._tick_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
         self._task = None
+        self._heartbeat_task = None
+        self._tick_task = None
+        try:
+            await self.leases.release()
+        except Exception as exc:
+            logger.warning("alert_shard_release_failed error=%s", exc)
 
     async def _run(self) -> None:
-        settings = get_settings()
-        interval = max(5, int(settings.whatsapp_alert_poll_interval_seconds))
         while True:
             try:
                 await self.process_pending_alerts()
             except Exception as exc:
                 logger.exception("whatsapp_alert_worker_iteration_failed error=%s", exc)
+            await asyncio.sleep(self.poll_interval)
+
+    async def _listen(self, subscription: QuoteSubscription) -> None:
+        while True:
+            quotes = await subscription.get()
+            try:
+                await self.process_tick(quotes)
+            except Exception as exc:
+                logger.exception("alert_tick_evaluation_failed error=%s", exc)
+
+    async def _heartbeat(self) -> None:
+        # Renew well inside the TTL so a slow cycle never loses its shards mid-way.
+        interval = max(1.0, get_settings().alert_worker_lease_ttl_seconds / 3)
+        while True:
             await asyncio.sleep(interval)
+            try:
+                await self.leases.renew()
+            except Exception as exc:
+                logger.warning("alert_shard_heartbeat_failed error=%s", exc)
 
     async def process_pending_alerts(self) -> int:
-        settings = get_settings()
-        processed = 0
+        """Run one poll cycle over the leased shards; returns the number of alerts fired.
+
+        Quotes are fetched concurrently, once per indexed market that the quote event
+        stream has not covered recently, and only the alerts whose threshold was crossed
+        since the previous observation are loaded. Email price alerts are fired here as
+        well, so they no longer wait for their owner to open the alerts page.
+        """
+        shards = await self.leases.acquire()
+        if not shards:
+            return 0
+        return await self._evaluate(shards, None, cycle="poll")
+
+    async def process_tick(self, quotes: dict[Market, MarketQuote]) -> int:
+        """Evaluate published quotes against the leased shards; returns the number of alerts fired.
+
+        Uses the shards held as of the last poll or heartbeat, so a tick costs neither a
+        lease round trip nor an upstream quote fetch.
+        """
+        now = time.monotonic()
+        for market, quote in quotes.items():
+            self._ticked_at[market] = (now, quote.daily_change_pct is not None)
+        shards = self.leases.held
+        if not shards:
+            return 0
+        return await self._evaluate(shards, quotes, cycle="tick")
+
+    async def _evaluate(
+        self,
+        shards: frozenset[int],
+        quotes: dict[Market, MarketQuote] | None,
+        *,
+        cycle: str,
+    ) -> int:
+        """Fire the alerts `quotes` trigger, fetching quotes first when None.
+
+        Fired alerts are committed together with their outbox rows; NotificationDispatcher
+        sends them, so a slow provider never stalls evaluation.
+        """
+        fired = 0
+        rules: dict[Market, frozenset[LadderRule]] = {}
         async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(PriceAlert)
-                .where(PriceAlert.is_active.is_(True))
-                .where(PriceAlert.is_triggered.is_(False))
-                .where(PriceAlert.whatsapp_number.is_not(None))
-                .where(PriceAlert.direction.in_(("above", "below")))
-                .order_by(PriceAlert.created_at.asc())
-            )
-            alerts = result.scalars().all()
-            for alert in alerts:
-                try:
-                    quote = await asyncio.to_thread(self.market.fetch_quote, alert.commodity, alert.region)
-                except Exception as exc:
-                    logger.warning("whatsapp_alert_quote_failed alert_id=%s error=%s", alert.id, exc)
-                    continue
-
-                target_price = float(alert.target_price or alert.threshold)
-                if not alert.direction or not _is_breach(alert.direction, quote.price, target_price):
-                    continue
-
-                limiter_key = f"whatsapp:alerts:{alert.user_id or alert.user_sub}:{alert.whatsapp_number}"
-                allowed = await self.rate_limiter.allow(
-                    key=limiter_key,
-                    limit=max(1, int(settings.whatsapp_rate_limit_max_messages)),
-                    window_seconds=max(60, int(settings.whatsapp_rate_limit_window_seconds)),
-                )
-                if not allowed:
-                    logger.info("whatsapp_alert_rate_limited alert_id=%s", alert.id)
-                    continue
-
-                live = _format_price(alert.region, quote.price, quote.unit)
-                target = _format_price(alert.region, target_price, quote.unit)
-                message = (
-                    f"🚨 {alert.commodity.replace('_', ' ').title()} Alert:\n"
-                    f"{live}\n"
-                    f"Your target of {target} was hit."
-                )
-                delivery = await self.whatsapp.send_alert(alert.whatsapp_number, message)
-                if delivery.status == "sent":
-                    now = datetime.now(timezone.utc).replace(tzinfo=None)
-                    alert.is_triggered = True
-                    alert.is_active = False
-                    alert.enabled = False
-                    alert.last_triggered_at = now
-                    alert.triggered_at = now
-                    session.add(
-                        AlertHistory(
-                            alert_id=alert.id,
-                            user_sub=alert.user_sub,
-                            commodity=alert.commodity,
-                            region=alert.region,
-                            currency=quote.currency,
-                            alert_type=alert.direction,
-                            threshold=target_price,
-                            observed_value=quote.price,
-                            message=message,
-                            email_status="sent",
-                            delivery_provider=delivery.provider or settings.whatsapp_provider,
-                            delivery_error=None,
-                            delivery_attempts=max(1, delivery.attempts),
-                        )
-                    )
-                    processed += 1
-                else:
-                    logger.warning(
-                        "whatsapp_alert_send_failed alert_id=%s status=%s provider=%s error=%s",
-                        alert.id,
-                        delivery.status,
-                        delivery.provider,
-                        delivery.error,
-                    )
-
-            await session.commit()
-        return processed
+            await self.evaluator.refresh(session, shards=shards)
+            if quotes is None:
+                ticked_since = time.monotonic() - self.poll_interval
+                markets = []
+                for market in self.evaluator.markets():
+                    ticked_at, has_change = self._ticked_at.get(market, (float("-inf"), False))
+                    if ticked_at >= ticked_since:
+                        if has_change:
+                            continue
+                        # Ticks drive the price rules; the polled quote only feeds the change rules.
+                        rules[market] = CHANGE_RULES
+                    markets.append(market)
+                quotes = await self.market.fetch_quotes(markets, cycle="global")
+            async with self._firing:
+                due: list[tuple[PriceAlert, MarketQuote]] = []
+                retry: set[int] = set()
+                for market, quote in quotes.items():
+                    ids = self.evaluator.candidates(quote, rules.get(market))
+                    triggered = await self.evaluator.triggered(session, quote, rules.get(market), ids=ids)
+                    due.extend((alert, quote) for alert in triggered)
+                    # Crossed but held back (e.g. cooling down): re-check on later quotes until it fires.
+                    retry.update(set(ids).difference(alert.id for alert in triggered))
+                for alert, quote in due:
+                    # Read before the savepoint: a rollback expires the alert's attributes.
+                    alert_id = alert.id
+                    try:
+                        # One savepoint per alert: a failed firing rolls back only itself.
+                        async with session.begin_nested():
+                            if alert.whatsapp_number:
+                                event = await self._queue_whatsapp(session, alert, quote)
+                            else:
+                                event = await self.alerts.fire_alert(session, alert, quote)
+                    except Exception as exc:
+                        logger.exception("alert_fire_failed alert_id=%s error=%s", alert_id, exc)
+                        event = None
+                    if event is None:
+                        retry.add(alert_id)
+                    else:
+                        fired += 1
+                # If the commit fails the ladders stay put, so the next cycle sees every crossing again.
+                await session.commit()
+                for market, quote in quotes.items():
+                    self.evaluator.advance(quote, rules.get(market), retry)
+        logger.info(
+            "alert_cycle_completed cycle=%s shards=%s quotes=%s due=%s fired=%s",
+            cycle,
+            len(shards),
+            len(quotes),
+            len(due),
+            fired,
+        )
+        return fired
+
+    async def _queue_whatsapp(self, session: AsyncSession, alert: PriceAlert, quote: MarketQuote) -> AlertHistory | None:
+        settings = get_settings()
+        target_price = float(alert.target_price or alert.threshold)
+        limiter_key = f"whatsapp:alerts:{alert.user_id or alert.user_sub}:{alert.whatsapp_number}"
+        allowed = await self.rate_limiter.allow(
+            key=limiter_key,
+            limit=max(1, int(settings.whatsapp_rate_limit_max_messages)),
+            window_seconds=max(60, int(settings.whatsapp_rate_limit_window_seconds)),
+        )
+        if not allowed:
+            logger.info("whatsapp_alert_rate_limited alert_id=%s", alert.id)
+            return None
+
+        live = _format_price(alert.region, quote.price, quote.unit)
+        target = _format_price(alert.region, target_price, quote.unit)
+        message = (
+            f"🚨 {alert.commodity.replace('_', ' ').title()} Alert:\n"
+            f"{live}\n"
+            f"Your target of {target} was hit."
+        )
 
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        alert.is_triggered = True
+        alert.is_active = False
+        alert.enabled = False
+        alert.last_triggered_at = now
+        alert.triggered_at = now
+        event = AlertHistory(
+            alert_id=alert.id,
+            user_sub=alert.user_sub,
+            commodity=alert.commodity,
+            region=alert.region,
+            currency=quote.currency,
+            alert_type=alert.direction,
+            threshold=target_price,
+            observed_value=quote.price,
+            message=message,
+            email_status=QUEUED,
+            delivery_provider=settings.whatsapp_provider,
+        )
+        session.add(event)
+        await session.flush()
+        await self.alerts.outbox.enqueue(
+            session,
+            event,
+            channel="whatsapp",
+            recipient=alert.whatsapp_number,
+            body=message,
+        )
+        return event
 
 whatsapp_alert_worker = WhatsAppAlertWorker()
@@ -108,6 +108,32 @@ vi.mock('./api/client', () => ({
       last_calibrated_at: new Date().toISOString(),
       model_used: 'test-model',
     })),
+    dashboard: vi.fn(async ({ region = 'us' }: { region?: string } = {}) => ({
+      region,
+      currency: region === 'india' ? 'INR' : region === 'europe' ? 'EUR' : 'USD',
+      horizon_days: 30,
+      as_of: new Date().toISOString(),
+      live_prices: [],
+      sparklines: {
+        gold: {
+          commodity: 'gold',
+          region,
+          currency: region === 'india' ? 'INR' : region === 'europe' ? 'EUR' : 'USD',
+          unit: region === 'india' ? '10g_24k' : region === 'europe' ? 'g' : 'oz',
+          rows: 2,
+          data: [
+            { date: '2025-01-01', open: 99, high: 101, low: 98, close: 100, volume: 10 },
+            { date: '2025-01-02', open: 100, high: 102, low: 99, close: 101, volume: 12 },
+          ],
+        },
+      },
+      predictions: {},
+      signals: {},
+      alerts: [],
+      alert_history: [],
+      news: {},
+      sections: {},
+    })),
   },
 }));
 
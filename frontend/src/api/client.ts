@@ -6,12 +6,15 @@ import type {
   AlertEvaluation,
   AlertHistoryItem,
   AlertHistoryFilters,
+  AlertHistoryPage,
   AlertType,
   AIProviderStatus,
   AIChatResponse,
   CommodityNewsSummary,
   Commodity,
   CommodityDefinition,
+  DashboardResponse,
+  DashboardSection,
   FeatureSnapshot,
   HistoricalResponse,
   LivePrice,
@@ -91,6 +94,44 @@ export const historicalSchema = z.object({
   data: z.array(historicalPointSchema),
 });
 
+// `?format=columnar`: parallel arrays instead of one object per bar.
+export const historicalColumnarSchema = z.object({
+  commodity: z.enum(['gold', 'silver', 'crude_oil']),
+  region: z.enum(['india', 'us', 'europe']),
+  currency: z.string(),
+  unit: z.string(),
+  rows: z.number(),
+  format: z.literal('columnar'),
+  date_encoding: z.literal('iso'),
+  columns: z.object({
+    date: z.array(z.string()),
+    open: z.array(z.number().nullable()),
+    high: z.array(z.number().nullable()),
+    low: z.array(z.number().nullable()),
+    close: z.array(z.number()),
+    volume: z.array(z.number().nullable()),
+  }),
+});
+
+function fromColumnar(payload: z.infer<typeof historicalColumnarSchema>): HistoricalResponse {
+  const { columns } = payload;
+  return {
+    commodity: payload.commodity,
+    region: payload.region,
+    currency: payload.currency,
+    unit: payload.unit,
+    rows: payload.rows,
+    data: columns.date.map((date, i) => ({
+      date,
+      open: columns.open[i],
+      high: columns.high[i],
+      low: columns.low[i],
+      close: columns.close[i],
+      volume: columns.volume[i],
+    })),
+  };
+}
+
 export const predictionSchema = z.object({
   commodity: z.enum(['gold', 'silver', 'crude_oil']),
   region: z.enum(['india', 'us', 'europe']),
@@ -171,6 +212,7 @@ const marketIntelligenceSchema = z.object({
   news_sentiment: z.enum(['bullish', 'bearish', 'neutral']).nullable().optional(),
   news_summary: z.string().nullable().optional(),
   provenance: z.array(dataProvenanceSchema),
+  stage_timings_ms: z.record(z.number()).optional(),
 });
 
 const normalizedLiveQuoteSchema = z.object({
@@ -365,6 +407,27 @@ const aiProviderStatusSchema = z.object({
   last_openrouter_error: z.string().nullable().optional(),
 });
 
+const dashboardSectionStatusSchema = z.object({
+  status: z.enum(['ok', 'partial', 'timeout', 'error', 'skipped']),
+  elapsed_ms: z.number(),
+  error: z.string().nullable().optional(),
+});
+
+const dashboardSchema = z.object({
+  region: z.enum(['india', 'us', 'europe']),
+  currency: z.string(),
+  horizon_days: z.number().int().min(1).max(90),
+  as_of: z.string(),
+  live_prices: z.array(livePriceSchema),
+  sparklines: z.record(historicalSchema),
+  predictions: z.record(predictionSchema),
+  signals: z.record(marketSignalSchema),
+  alerts: z.array(priceAlertSchema),
+  alert_history: z.array(alertHistorySchema),
+  news: z.record(newsSummarySchema),
+  sections: z.record(dashboardSectionStatusSchema),
+});
+
 function withQuery(path: string, filters: AlertHistoryFilters = {}): string {
   const params = new URLSearchParams();
   if (filters.commodity) params.set('commodity', filters.commodity);
@@ -374,6 +437,7 @@ function withQuery(path: string, filters: AlertHistoryFilters = {}): string {
   if (filters.end_at) params.set('end_at', filters.end_at);
   if (filters.search) params.set('search', filters.search);
   if (filters.limit) params.set('limit', String(filters.limit));
+  if (filters.cursor) params.set('cursor', filters.cursor);
   const q = params.toString();
   return q ? `${path}?${q}` : path;
 }
@@ -386,8 +450,12 @@ export const client = {
     liveEnvelopeSchema.parse((await api.get(`/live-prices/${region}`)).data).items as LivePrice[],
   publicLivePricesByRegion: async (region: Region) =>
     liveEnvelopeSchema.parse((await api.get(`/public/live-prices/${region}`)).data).items as LivePrice[],
-  historical: async (commodity: Commodity, region: Region, range: '1m' | '6m' | '1y' | '5y' | 'max') =>
-    historicalSchema.parse((await api.get(`/historical/${commodity}/${region}?range=${range}`)).data) as HistoricalResponse,
+  historical: async (commodity: Commodity, region: Region, range: '1m' | '6m' | '1y' | '5y' | 'max', points?: number) =>
+    fromColumnar(
+      historicalColumnarSchema.parse(
+        (await api.get(`/historical/${commodity}/${region}?range=${range}&format=columnar${points ? `&points=${points}` : ''}`)).data,
+      ),
+    ),
   train: async (commodity: Commodity, region: Region, horizon: number) =>
     trainSchema.parse((await api.post(`/train/${commodity}/${region}?horizon=${horizon}`)).data),
   trainStatus: async (commodity: Commodity, region: Region) =>
@@ -402,6 +470,14 @@ export const client = {
     featureSnapshotSchema.parse((await api.get(`/features/${commodity}/${region}?range=${range}`)).data) as FeatureSnapshot,
   signalSnapshot: async (commodity: Commodity, region: Region, horizon: number) =>
     marketSignalSchema.parse((await api.get(`/signals/${commodity}/${region}?horizon=${horizon}`)).data) as MarketSignal,
+  dashboard: async (params: { region?: Region; horizon?: number; sections?: DashboardSection[] } = {}) => {
+    const query = new URLSearchParams();
+    if (params.region) query.set('region', params.region);
+    if (params.horizon) query.set('horizon', String(params.horizon));
+    if (params.sections?.length) query.set('sections', params.sections.join(','));
+    const q = query.toString();
+    return dashboardSchema.parse((await api.get(q ? `/dashboard?${q}` : '/dashboard')).data) as DashboardResponse;
+  },
   forecastSnapshot: async (commodity: Commodity, region: Region, horizon: number) =>
     predictionSchema.parse((await api.get(`/forecasts/${commodity}/${region}?horizon=${horizon}`)).data) as PredictionResponse,
   predict: async (commodity: Commodity, region: Region, horizon: number) =>
@@ -433,6 +509,13 @@ export const client = {
   evaluateAlerts: async () => alertEvaluationSchema.parse((await api.post('/alerts/evaluate')).data) as AlertEvaluation,
   alertHistory: async (filters: AlertHistoryFilters = {}) =>
     z.array(alertHistorySchema).parse((await api.get(withQuery('/alerts/history', filters))).data) as AlertHistoryItem[],
+  alertHistoryPage: async (filters: AlertHistoryFilters = {}): Promise<AlertHistoryPage> => {
+    const response = await api.get(withQuery('/alerts/history', filters));
+    return {
+      items: z.array(alertHistorySchema).parse(response.data) as AlertHistoryItem[],
+      next_cursor: (response.headers['x-next-cursor'] as string | undefined) ?? null,
+    };
+  },
   exportAlertHistory: async (filters: AlertHistoryFilters = {}) =>
     api.get(withQuery('/alerts/history/export', filters), { responseType: 'blob' }),
   commodityNewsSummary: async (commodity: AlertCommodity) =>
@@ -7,6 +7,8 @@ import { CommodityChart } from '../components/chart';
 import { buildCommodityChartData } from '../utils/prediction-chart';
 
 const ranges: Array<'1m' | '6m' | '1y' | '5y' | 'max'> = ['1m', '6m', '1y', '5y', 'max'];
+// Long ranges are downsampled server-side; the chart is only a few hundred pixels wide.
+const LONG_RANGE_CHART_POINTS = 500;
 const alertCommodities: AlertCommodity[] = ['gold', 'silver', 'crude_oil', 'natural_gas', 'copper'];
 const alertTypes: AlertType[] = ['above', 'below', 'pct_change_24h', 'spike', 'drop'];
 
@@ -57,7 +59,7 @@ export function CommodityPage() {
 
   const historical = useQuery({
     queryKey: ['hist', commodity, region, range],
-    queryFn: () => client.historical(commodity, region, range),
+    queryFn: () => client.historical(commodity, region, range, range === '5y' || range === 'max' ? LONG_RANGE_CHART_POINTS : undefined),
     staleTime: 600_000,
   });
   const prediction = useQuery({
@@ -1,6 +1,6 @@
 import { useEffect, useMemo, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { useMutation, useQueries, useQuery, useQueryClient } from '@tanstack/react-query';
+import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
 import { Link } from 'react-router-dom';
 import { client } from '../api/client';
 import { ModernChart } from '../components/chart/ModernChart';
@@ -57,21 +57,13 @@ export function DashboardPage() {
     staleTime: 60_000,
   });
 
-  const historicalQueries = useQueries({
-    queries: commodities.map((commodity) => ({
-      queryKey: ['hist', commodity, region, '1m'],
-      queryFn: () => client.historical(commodity, region, '1m'),
-      staleTime: 60_000,
-      refetchInterval: 60_000,
-    })),
-  });
-
-  const predictionQueries = useQueries({
-    queries: commodities.map((commodity) => ({
-      queryKey: ['pred-dashboard', commodity, region, predictionHorizon],
-      queryFn: () => client.predict(commodity, region, predictionHorizon),
-      staleTime: 180_000,
-    })),
+  // Sparklines and forecasts for every commodity come from one fan-out request that
+  // shares the series load and live quotes on the server.
+  const overview = useQuery({
+    queryKey: ['dashboard', region, predictionHorizon],
+    queryFn: () => client.dashboard({ region, horizon: predictionHorizon, sections: ['sparklines', 'predictions'] }),
+    staleTime: 60_000,
+    refetchInterval: 60_000,
   });
 
   const historicalByCommodity = useMemo(() => {
@@ -80,11 +72,11 @@ export function DashboardPage() {
       silver: undefined,
       crude_oil: undefined,
     };
-    commodities.forEach((commodity, idx) => {
-      out[commodity] = historicalQueries[idx]?.data;
+    commodities.forEach((commodity) => {
+      out[commodity] = overview.data?.sparklines[commodity];
     });
     return out;
-  }, [historicalQueries]);
+  }, [overview.data]);
 
   const predictionByCommodity = useMemo(() => {
     const out: Record<Commodity, PredictionResponse | undefined> = {
@@ -92,11 +84,11 @@ export function DashboardPage() {
       silver: undefined,
       crude_oil: undefined,
     };
-    commodities.forEach((commodity, idx) => {
-      out[commodity] = predictionQueries[idx]?.data;
+    commodities.forEach((commodity) => {
+      out[commodity] = overview.data?.predictions[commodity];
     });
     return out;
-  }, [predictionQueries]);
+  }, [overview.data]);
 
   const momentumWindowDays = predictionHorizon >= 30 ? 30 : predictionHorizon >= 7 ? 7 : 1;
 
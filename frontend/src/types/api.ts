@@ -111,6 +111,7 @@ export interface MarketIntelligence {
   news_sentiment?: 'bullish' | 'bearish' | 'neutral' | null;
   news_summary?: string | null;
   provenance: DataProvenance[];
+  stage_timings_ms?: Record<string, number>;
 }
 
 export interface NormalizedLiveQuote {
@@ -235,6 +236,29 @@ export interface CommodityNewsSummary {
   updated_at: string;
 }
 
+export type DashboardSection = 'live_prices' | 'sparklines' | 'predictions' | 'signals' | 'alerts' | 'news';
+
+export interface DashboardSectionStatus {
+  status: 'ok' | 'partial' | 'timeout' | 'error' | 'skipped';
+  elapsed_ms: number;
+  error?: string | null;
+}
+
+export interface DashboardResponse {
+  region: Region;
+  currency: string;
+  horizon_days: number;
+  as_of: string;
+  live_prices: LivePrice[];
+  sparklines: Partial<Record<Commodity, HistoricalResponse>>;
+  predictions: Partial<Record<Commodity, PredictionResponse>>;
+  signals: Partial<Record<Commodity, MarketSignal>>;
+  alerts: PriceAlert[];
+  alert_history: AlertHistoryItem[];
+  news: Partial<Record<AlertCommodity, CommodityNewsSummary>>;
+  sections: Record<DashboardSection, DashboardSectionStatus>;
+}
+
 export interface UserProfile {
   user_sub: string;
   email?: string | null;
@@ -272,6 +296,12 @@ export interface AlertHistoryFilters {
   end_at?: string;
   search?: string;
   limit?: number;
+  cursor?: string;
+}
+
+export interface AlertHistoryPage {
+  items: AlertHistoryItem[];
+  next_cursor: string | null;
 }
 
 export interface AIChatResponse {
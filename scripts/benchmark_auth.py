@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+import numpy as np
+from fastapi import HTTPException, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core import auth
+from app.core.auth import TokenVerificationMiddleware, create_app_jwt
+from app.core.secrets import AUTH_SECRETS, get_secret_value
+
+
+def legacy_decode_app_jwt(token: str) -> dict:
+    """Secret lookup and key construction on every decode, as HS256 verification worked before."""
+    settings = auth._settings()
+    jwt_secret = get_secret_value(
+        AUTH_SECRETS,
+        "JWT_SECRET",
+        env_fallback="JWT_SECRET",
+        default=settings.jwt_secret or settings.secret_key or "dev-insecure-jwt-secret",
+    )
+    return auth.jwt.decode(token, jwt_secret, algorithms=["HS256"], audience="tradesight-frontend", issuer="tradesight")
+
+
+class LegacyTokenVerificationMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request.state.user = None
+        auth_header = request.headers.get("authorization", "")
+        if auth_header.lower().startswith("bearer "):
+            token = auth_header.split(" ", 1)[1].strip()
+            try:
+                request.state.user = legacy_decode_app_jwt(token)
+            except HTTPException:
+                pass
+        return await call_next(request)
+
+
+async def _endpoint(scope, receive, send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _scope(token: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/profile",
+        "raw_path": b"/api/profile",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def _drive(app, token: str, repeat: int) -> list[float]:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await app(_scope(token), receive, send)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _stats(samples: list[float]) -> str:
+    p50, p99 = np.percentile(samples, [50, 99]) * 1e6
+    return f"p50 {p50:8.1f}us p99 {p99:8.1f}us mean {statistics.mean(samples) * 1e6:8.1f}us"
+
+
+def main(repeat: int, tokens: int) -> None:
+    issued = [create_app_jwt({"sub": f"auth0|bench-{i}", "email": f"bench{i}@example.com"}) for i in range(tokens)]
+    baseline = asyncio.run(_drive(_endpoint, issued[0], repeat))
+    print(f"per-request auth overhead (HS256, {tokens} distinct tokens, repeat={repeat})")
+    print(f"  no middleware                  {_stats(baseline)}")
+
+    legacy = LegacyTokenVerificationMiddleware(_endpoint)
+    samples = [s for token in issued for s in asyncio.run(_drive(legacy, token, repeat // tokens or 1))]
+    print(f"  BaseHTTPMiddleware, no cache   {_stats(samples)}")
+
+    current = TokenVerificationMiddleware(_endpoint)
+    auth.claims_cache.clear()
+    cold = [s for token in issued for s in asyncio.run(_drive(current, token, 1))]
+    print(f"  pure ASGI, cold claims cache   {_stats(cold)}")
+    warm = [s for token in issued for s in asyncio.run(_drive(current, token, repeat // tokens or 1))]
+    print(f"  pure ASGI, warm claims cache   {_stats(warm)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--tokens", type=int, default=20)
+    args = parser.parse_args()
+    main(args.repeat, args.tokens)
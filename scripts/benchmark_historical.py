@@ -0,0 +1,187 @@
+import argparse
+import gzip
+import json
+import statistics
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas.market_data import MarketDataProvenanceRecord, NormalizedHistoricalBar, NormalizedHistoricalSeries
+from app.core.responses import ORJSONResponse
+from app.schemas.responses import RegionalHistoricalPoint, RegionalHistoricalResponse
+from app.services.commodity_service import CommodityService
+from app.services.downsampling import downsample_points
+
+# Approximate trading-day counts for each chart range.
+RANGE_ROWS = {"1y": 252, "5y": 1260, "max": 6300}
+FX_RATES = {"USD": 1.0, "INR": 83.5, "EUR": 0.92}
+
+
+def synthetic_series(rows: int, region: str = "india") -> NormalizedHistoricalSeries:
+    start = date(2000, 1, 3)
+    return NormalizedHistoricalSeries(
+        commodity="gold",
+        region=region,
+        provenance=MarketDataProvenanceRecord(source_type="historical", provider="benchmark"),
+        bars=[
+            NormalizedHistoricalBar(
+                date=start + timedelta(days=i),
+                open_usd_per_troy_oz=1500.0 + (i % 97),
+                high_usd_per_troy_oz=1510.0 + (i % 97),
+                low_usd_per_troy_oz=1490.0 + (i % 97),
+                close_usd_per_troy_oz=1505.0 + (i % 97),
+                volume=1000.0 + i,
+            )
+            for i in range(rows)
+        ],
+    )
+
+
+def synthetic_fx_history(rows: int) -> pd.Series:
+    # Weekday-only fixes so weekend bars exercise the forward fill.
+    index = pd.bdate_range(date(2000, 1, 3), periods=rows)
+    return pd.Series([83.0 + (i % 50) / 100 for i in range(rows)], index=index, dtype=float)
+
+
+def legacy_regional_points(service: CommodityService, series: NormalizedHistoricalSeries, fx_history: pd.Series):
+    """Per-bar FX lookup and scalar conversion, as regionalization worked before vectorizing."""
+
+    def _fx_for_date(date_value):
+        ts = pd.Timestamp(date_value).normalize()
+        rate = fx_history.get(ts)
+        if rate is None:
+            history = fx_history.loc[:ts]
+            rate = history.iloc[-1] if not history.empty else None
+        if rate is None:
+            return FX_RATES
+        return {**FX_RATES, "INR": float(rate)}
+
+    convert = service._to_regional_price
+    return [
+        RegionalHistoricalPoint(
+            date=bar.date,
+            open=round(convert(bar.open_usd_per_troy_oz, series.region, _fx_for_date(bar.date)), 4),
+            high=round(convert(bar.high_usd_per_troy_oz, series.region, _fx_for_date(bar.date)), 4),
+            low=round(convert(bar.low_usd_per_troy_oz, series.region, _fx_for_date(bar.date)), 4),
+            close=round(convert(bar.close_usd_per_troy_oz, series.region, _fx_for_date(bar.date)), 4),
+            volume=bar.volume,
+        )
+        for bar in series.bars
+    ]
+
+
+def sampled(fn, repeat: int) -> tuple[object, list[float]]:
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return result, samples
+
+
+def timed(fn, repeat: int) -> tuple[object, float]:
+    result, samples = sampled(fn, repeat)
+    return result, statistics.median(samples) * 1000
+
+
+def encode_stats(fn, repeat: int) -> str:
+    body, samples = sampled(fn, repeat)
+    p50, p99 = np.percentile(samples, [50, 99]) * 1000
+    mb_per_s = len(body) / statistics.median(samples) / 1e6
+    return f"p50 {p50:7.2f}ms p99 {p99:7.2f}ms {mb_per_s:6.1f}MB/s"
+
+
+def bench_downsampling(service: CommodityService, points: int, repeat: int) -> None:
+    print(f"downsampling (points={points})")
+    for period, rows in RANGE_ROWS.items():
+        series = synthetic_series(rows)
+        full = service.normalization_service.to_historical_response(series=series, fx_rates=FX_RATES)
+        full_body, full_ms = timed(full.model_dump_json, repeat)
+        sampled = full.model_copy(update={"data": downsample_points(full.data, points, "lttb")})
+        sampled_body, sampled_ms = timed(sampled.model_dump_json, repeat)
+        print(
+            f"  {period:>4} rows={rows:<5} bytes {len(full_body):>8} -> {len(sampled_body):<7} "
+            f"({len(full_body) / len(sampled_body):4.1f}x)  serialize {full_ms:7.2f}ms -> {sampled_ms:.2f}ms"
+        )
+
+
+def bench_regionalization(service: CommodityService, repeat: int) -> None:
+    print("regionalization (india, daily FX history)")
+    for period, rows in RANGE_ROWS.items():
+        series = synthetic_series(rows)
+        fx_history = synthetic_fx_history(rows)
+        legacy, legacy_ms = timed(lambda: legacy_regional_points(service, series, fx_history), repeat)
+        current, current_ms = timed(
+            lambda: service.normalization_service.to_historical_response(
+                series=series, fx_rates=FX_RATES, fx_history=fx_history
+            ),
+            repeat,
+        )
+        assert current.data == legacy
+        print(f"  {period:>4} rows={rows:<5} per-bar {legacy_ms:8.2f}ms -> vectorized {current_ms:6.2f}ms ({legacy_ms / current_ms:5.1f}x)")
+
+
+def bench_serialization(service: CommodityService, repeat: int) -> None:
+    print("serialization (response body for /historical)")
+    for period, rows in RANGE_ROWS.items():
+        payload = service.normalization_service.to_historical_response(series=synthetic_series(rows), fx_rates=FX_RATES)
+        body = ORJSONResponse(payload).body
+        print(f"  {period:>4} rows={rows:<5} body={len(body)} bytes")
+        # Older FastAPI: response_model validation, jsonable_encoder, then json.dumps.
+        print("        jsonable_encoder  " + encode_stats(
+            lambda: json.dumps(jsonable_encoder(RegionalHistoricalResponse.model_validate(payload.model_dump()))).encode(),
+            repeat,
+        ))
+        # Newer FastAPI: response_model validation, then pydantic-core JSON.
+        print("        validate+dump     " + encode_stats(
+            lambda: RegionalHistoricalResponse.model_validate(payload.model_dump()).model_dump_json().encode(),
+            repeat,
+        ))
+        print("        orjson fast path  " + encode_stats(lambda: ORJSONResponse(payload).body, repeat))
+
+
+def bench_columnar(service: CommodityService, repeat: int) -> None:
+    print("columnar payload (/historical?format=columnar; parse = json.loads as a client-side proxy)")
+    for period, rows in RANGE_ROWS.items():
+        series = synthetic_series(rows)
+        layouts = {
+            "rows": service.normalization_service.to_historical_response(series=series, fx_rates=FX_RATES),
+            "columnar": service.normalization_service.to_historical_response(
+                series=series, fx_rates=FX_RATES, format="columnar"
+            ),
+            "columnar+epoch": service.normalization_service.to_historical_response(
+                series=series, fx_rates=FX_RATES, format="columnar", date_encoding="epoch_day"
+            ),
+        }
+        print(f"  {period:>4} rows={rows}")
+        for name, payload in layouts.items():
+            body = ORJSONResponse(payload).body
+            _, parse_ms = timed(lambda: json.loads(body), repeat)
+            print(
+                f"        {name:<15} bytes {len(body):>7} gzip {len(gzip.compress(body)):>6}  parse {parse_ms:6.2f}ms"
+            )
+
+
+def main(section: str, points: int, repeat: int) -> None:
+    service = CommodityService()
+    if section in {"all", "regionalization"}:
+        bench_regionalization(service, repeat)
+    if section in {"all", "serialization"}:
+        bench_serialization(service, repeat)
+    if section in {"all", "columnar"}:
+        bench_columnar(service, repeat)
+    if section in {"all", "downsampling"}:
+        bench_downsampling(service, points, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--section", choices=["all", "regionalization", "serialization", "columnar", "downsampling"], default="all")
+    parser.add_argument("--points", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.section, args.points, args.repeat)
@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+import numpy as np
+
+from app.services import rate_limiter
+from app.services.rate_limiter import GCRA_SCRIPT, LocalTokenBuckets, RedisRateLimiter
+
+
+async def legacy_allow(client, key: str, limit: int, window_seconds: int) -> bool:
+    """INCR then a separate EXPIRE, as the limiter worked before."""
+    current = await client.incr(key)
+    if current == 1:
+        await client.expire(key, window_seconds)
+    return current <= limit
+
+
+async def _drive(check, keys: int, repeat: int) -> list[float]:
+    samples = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        await check(f"bench:{i % keys}")
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _stats(samples: list[float]) -> str:
+    p50, p99 = np.percentile(samples, [50, 99]) * 1e6
+    return f"p50 {p50:8.1f}us p99 {p99:8.1f}us mean {statistics.mean(samples) * 1e6:8.1f}us"
+
+
+async def _redis_rows(redis_url: str, keys: int, repeat: int, limit: int, window: int) -> list[tuple[str, list[float]]]:
+    client = rate_limiter.redis.from_url(redis_url, decode_responses=True)
+    try:
+        await client.ping()
+    except Exception as exc:
+        print(f"  redis at {redis_url} unreachable ({exc}); skipping Redis rows")
+        await client.aclose()
+        return []
+    script = client.register_script(GCRA_SCRIPT)
+    window_us = window * 1_000_000
+    try:
+        legacy = await _drive(lambda key: legacy_allow(client, f"legacy:{key}", limit, window), keys, repeat)
+        gcra = await _drive(lambda key: script(keys=[f"gcra:{key}"], args=[window_us // limit, window_us]), keys, repeat)
+    finally:
+        await client.delete(*[f"{prefix}:bench:{i}" for prefix in ("legacy", "gcra") for i in range(keys)])
+        await client.aclose()
+    return [("INCR + EXPIRE (2 round trips)", legacy), ("GCRA via EVALSHA (1 round trip)", gcra)]
+
+
+async def _fallback_samples(keys: int, repeat: int, limit: int, window: int) -> list[float]:
+    limiter = RedisRateLimiter()
+    # As during the backoff after a Redis failure: every call goes to the local buckets.
+    limiter._redis_retry_at = float("inf")
+    return await _drive(lambda key: limiter.allow(key, limit, window), keys, repeat)
+
+
+def main(repeat: int, keys: int, redis_url: str) -> None:
+    limit, window = 1_000_000, 60
+    print(f"per-request rate limiter overhead ({keys} distinct keys, repeat={repeat})")
+    buckets = LocalTokenBuckets()
+
+    async def _local(key: str) -> bool:
+        return buckets.allow(key, limit, window)
+
+    print(f"  in-process token bucket        {_stats(asyncio.run(_drive(_local, keys, repeat)))}")
+    print(f"  limiter, Redis down (fallback) {_stats(asyncio.run(_fallback_samples(keys, repeat, limit, window)))}")
+    if rate_limiter.redis is None:
+        print("  redis package not installed; skipping Redis rows")
+        return
+    for label, samples in asyncio.run(_redis_rows(redis_url, keys, repeat, limit, window)):
+        print(f"  {label:<31}{_stats(samples)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5000)
+    parser.add_argument("--keys", type=int, default=100)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    args = parser.parse_args()
+    main(args.repeat, args.keys, args.redis_url)
@@ -9,7 +9,7 @@ load_dotenv(".env.production")
 os.environ["ENVIRONMENT"] = "production"
 os.environ["INFISICAL_ENV"] = "prod"
 
-from app.services.vault_service import VaultService
+from app.services.vault_service import PATH_KEYS, VaultService
 
 def test_prod_auth():
     print("========================================")
@@ -25,7 +25,7 @@ def test_prod_auth():
     
     # Simulate exactly the VaultService path loading process
     # It fetches each key sequentially
-    keys = service._path_keys("auth")
+    keys = PATH_KEYS["auth"]
     print(f"Keys to fetch: {keys}")
     
     success_count = 0
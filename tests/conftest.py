@@ -5,8 +5,12 @@ import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from app.api.routes import live_price_snapshots
 from app.core.auth import get_current_user
+from app.core.body_cache import bodies
+from app.core.http_cache import validators
 from app.main import app
+from app.services.user_cache import profile_cache, settings_cache
 
 
 @pytest.fixture(autouse=True)
@@ -17,3 +21,14 @@ def _override_auth_dependency():
     app.dependency_overrides[get_current_user] = _fake_current_user
     yield
     app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.fixture(autouse=True)
+def _reset_response_caches():
+    # Tests mock different data behind the same URLs within one freshness window.
+    validators.clear()
+    bodies.clear()
+    live_price_snapshots.clear()
+    settings_cache.clear()
+    profile_cache.clear()
+    yield
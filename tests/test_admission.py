@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import re
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.admission import (
+    AdmissionControlMiddleware,
+    AdmissionController,
+    AdmissionGate,
+    AdmissionRejected,
+    RouteClass,
+    admission_controller,
+)
+from app.api import routes
+from app.main import app
+
+
+def _route_class(**overrides) -> RouteClass:
+    values = {
+        "name": "inference",
+        "methods": frozenset({"GET"}),
+        "pattern": re.compile(r"^/api/predict/"),
+        "max_concurrent": 1,
+        "max_queue": 1,
+        "queue_timeout_seconds": 0.2,
+        "max_per_client": 5,
+        "retry_after_seconds": 2,
+    }
+    values.update(overrides)
+    return RouteClass(**values)
+
+
+def test_gate_queues_in_order_and_sheds_when_full_or_late() -> None:
+    gate = AdmissionGate(_route_class(queue_timeout_seconds=0.05))
+
+    async def _run():
+        await gate.acquire()
+        queued = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        assert gate.stats()["queued"] == 1
+
+        with pytest.raises(AdmissionRejected) as full:
+            await gate.acquire()
+        assert (full.value.reason, full.value.status_code) == ("queue_full", 503)
+
+        gate.release()
+        await queued
+        assert gate.active == 1
+
+        with pytest.raises(AdmissionRejected) as late:
+            await gate.acquire()
+        assert late.value.reason == "queue_timeout"
+        gate.release()
+
+    asyncio.run(_run())
+    stats = gate.stats()
+    assert stats["active"] == 0 and stats["queued"] == 0
+    assert stats["admitted"] == 2
+    assert stats["shed"] == {"queue_full": 1, "queue_timeout": 1, "client_limit": 0}
+
+
+def test_gate_limits_slots_per_client() -> None:
+    gate = AdmissionGate(_route_class(max_concurrent=4, max_per_client=1))
+
+    async def _run():
+        await gate.acquire("user:a")
+        with pytest.raises(AdmissionRejected) as limited:
+            await gate.acquire("user:a")
+        assert (limited.value.reason, limited.value.status_code) == ("client_limit", 429)
+        await gate.acquire("user:b")
+        gate.release("user:a")
+        await gate.acquire("user:a")
+
+    asyncio.run(_run())
+    assert gate.active == 2
+    assert gate.shed["client_limit"] == 1
+
+
+def test_middleware_sheds_with_retry_after_and_passes_cheap_reads() -> None:
+    controller = AdmissionController([_route_class(max_queue=0)])
+    release = asyncio.Event()
+    seen: list[str] = []
+
+    async def _app(scope, receive, send):
+        seen.append(scope["path"])
+        if scope["path"].startswith("/api/predict/"):
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = AdmissionControlMiddleware(_app, controller)
+
+    async def _call(path: str) -> list[dict]:
+        messages: list[dict] = []
+
+        async def _send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": path, "client": ("10.0.0.1", 1234)}
+        await middleware(scope, None, _send)
+        return messages
+
+    async def _run():
+        slow = asyncio.ensure_future(_call("/api/predict/gold/us"))
+        await asyncio.sleep(0)
+        shed = await _call("/api/predict/silver/us")
+        cheap = await _call("/api/live-prices")
+        release.set()
+        await slow
+        return shed, cheap
+
+    shed, cheap = asyncio.run(_run())
+    assert shed[0]["status"] == 503
+    assert (b"retry-after", b"2") in shed[0]["headers"]
+    assert b"SERVER_BUSY" in shed[1]["body"]
+    assert cheap[0]["status"] == 200
+    assert seen == ["/api/predict/gold/us", "/api/live-prices"]
+    assert controller.stats()[0]["active"] == 0
+
+
+def test_middleware_releases_slot_once_response_is_sent() -> None:
+    controller = AdmissionController([_route_class(max_queue=0, max_per_client=1)])
+    background = asyncio.Event()
+
+    async def _app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 202, "headers": []})
+        await send({"type": "http.response.body", "body": b"accepted"})
+        # Work after the body, like Starlette's BackgroundTasks.
+        if scope["path"].endswith("/first"):
+            await background.wait()
+
+    middleware = AdmissionControlMiddleware(_app, controller)
+
+    async def _call(path: str) -> list[dict]:
+        messages: list[dict] = []
+
+        async def _send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": path, "client": ("10.0.0.1", 1234)}
+        await middleware(scope, None, _send)
+        return messages
+
+    async def _run():
+        first = asyncio.ensure_future(_call("/api/predict/first"))
+        await asyncio.sleep(0.01)
+        during_background = controller.stats()[0]["active"]
+        # Same client, one slot, no queue: admitted only because the slot was released.
+        second = await _call("/api/predict/second")
+        background.set()
+        await first
+        return during_background, second
+
+    during_background, second = asyncio.run(_run())
+    assert during_background == 0
+    assert second[0]["status"] == 202
+    assert controller.stats()[0]["active"] == 0
+
+
+def test_background_training_runs_never_overlap(monkeypatch) -> None:
+    class _Job:
+        id = 1
+
+    running = [0]
+    peak = [0]
+    trained: list[str] = []
+
+    async def _create_job(session, commodity: str, region: str, horizon: int):
+        _ = session, commodity, region, horizon
+        return _Job()
+
+    async def _train(session, commodity: str, region: str, horizon: int, job_id: int | None = None):
+        _ = session, region, horizon, job_id
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.05)
+        running[0] -= 1
+        trained.append(commodity)
+
+    monkeypatch.setattr(routes.service, "create_training_job", _create_job)
+    monkeypatch.setattr(routes.service, "train", _train)
+
+    async def _post(client_ip: str, commodity: str) -> int:
+        # Distinct clients, so the per-client admission limit does not shed the second call.
+        transport = httpx.ASGITransport(app=app, client=(client_ip, 1234))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return (await client.post(f"/api/train/{commodity}/us")).status_code
+
+    async def _run():
+        return await asyncio.gather(_post("10.0.0.1", "gold"), _post("10.0.0.2", "silver"))
+
+    statuses = asyncio.run(_run())
+    assert statuses == [202, 202]
+    assert sorted(trained) == ["gold", "silver"]
+    assert peak[0] == 1
+
+
+def test_admission_stats_route() -> None:
+    response = TestClient(app).get("/api/health/admission")
+    assert response.status_code == 200
+    assert {item["route_class"] for item in response.json()} == {"training", "ai_chat", "inference"}
+    assert admission_controller.gate_for("POST", "/api/ai/chat/stream").route_class.name == "ai_chat"
+    assert admission_controller.gate_for("GET", "/api/live-prices") is None
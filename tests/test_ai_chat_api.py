@@ -4,7 +4,7 @@ from fastapi.testclient import TestClient
 import httpx
 
 from app.main import app
-from app.schemas.responses import AIChatResponse, UserProfileResponse
+from app.schemas.responses import AIChatResponse, ChatHistoryResponse, UserProfileResponse
 from app.api import routes_ai_chat
 from app.services.ai_chat_service import AIProviderUnavailableError
 from app.services.ai_reasoning_engine import QueryContext
@@ -269,3 +269,27 @@ def test_ai_chat_end_to_end_uses_openrouter_model(monkeypatch) -> None:
     assert isinstance(body["messages"], list) and len(body["messages"]) == 2
     assert "temperature" in body
     assert "max_tokens" in body
+
+
+def test_ai_chat_history_returns_next_cursor_header(monkeypatch) -> None:
+    calls: list[str | None] = []
+
+    async def _mock_history_page(session, user_id: str, limit: int, cursor: str | None):
+        _ = session, user_id, limit
+        calls.append(cursor)
+        if cursor == "bad":
+            raise ValueError("Invalid pagination cursor")
+        item = ChatHistoryResponse(id=2, message="hi", response="hello", created_at=datetime.now(timezone.utc))
+        return [item], "next-page"
+
+    monkeypatch.setattr(routes_ai_chat.chat_service, "history_page", _mock_history_page)
+
+    response = client.get("/api/ai/chat/history", params={"limit": 1})
+    assert response.status_code == 200
+    assert response.json()[0]["message"] == "hi"
+    assert response.headers["x-next-cursor"] == "next-page"
+
+    bad = client.get("/api/ai/chat/history", params={"cursor": "bad"})
+    assert bad.status_code == 400
+    assert bad.json()["detail"]["error"]["code"] == "INVALID_CURSOR"
+    assert calls == [None, "bad"]
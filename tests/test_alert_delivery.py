@@ -1,16 +1,21 @@
 import asyncio
 from datetime import datetime, timezone
 
+import pandas as pd
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from app.db.base import Base
 from app.models.alert_history import AlertHistory
+from app.models.notification_outbox import NotificationOutbox
 from app.models.price_alert import PriceAlert
+from app.services import market_quote_service as market_quote_module
 from app.services.alert_service import AlertService
-from app.services.market_quote_service import MarketQuote
+from app.services.market_quote_service import MarketQuote, MarketQuoteService
 from app.services.whatsapp_service import WhatsAppDeliveryResult
+from app.workers.notification_dispatcher import NotificationDispatcher
 from app.workers.whatsapp_alert_worker import WhatsAppAlertWorker
+from app.workers import notification_dispatcher as dispatcher_module
 from app.workers import whatsapp_alert_worker as worker_module
 
 
@@ -27,12 +32,13 @@ def _mk_quote(price: float, commodity: str = "gold", region: str = "india") -> M
     )
 
 
-def test_email_alert_evaluation_sends_message(monkeypatch) -> None:
+def test_email_alert_evaluation_queues_message_for_dispatch(monkeypatch) -> None:
     async def _run() -> None:
         engine = create_async_engine("sqlite+aiosqlite:///:memory:")
         Session = async_sessionmaker(engine, expire_on_commit=False)
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+        monkeypatch.setattr(dispatcher_module, "AsyncSessionLocal", Session)
 
         try:
             async with Session() as session:
@@ -57,31 +63,51 @@ def test_email_alert_evaluation_sends_message(monkeypatch) -> None:
                 await session.commit()
 
                 service = AlertService()
-                monkeypatch.setattr(service.market, "fetch_quote", lambda commodity, region: _mk_quote(175200.0, commodity, region))
+                monkeypatch.setattr(
+                    service.market,
+                    "fetch_commodity_quotes",
+                    lambda commodity, regions: {region: _mk_quote(175200.0, commodity, region) for region in regions},
+                )
 
                 sent_calls: list[dict[str, str]] = []
 
-                async def _fake_send(to_email, subject, message, market_context="", send_enabled=True):
-                    _ = market_context, send_enabled
-                    sent_calls.append({"to_email": to_email, "subject": subject, "message": message})
+                async def _fake_send(to_email, subject, message, market_context="", idempotency_key=None):
+                    _ = market_context
+                    sent_calls.append(
+                        {"to_email": to_email, "subject": subject, "message": message, "key": idempotency_key}
+                    )
                     return type(
                         "EmailResult",
                         (),
                         {"status": "sent", "provider": "test", "error": None, "attempts": 1},
                     )()
 
-                monkeypatch.setattr(service.email, "send_alert", _fake_send)
+                dispatcher = NotificationDispatcher()
+                monkeypatch.setattr(dispatcher.email, "send_alert", _fake_send)
+                monkeypatch.setattr(dispatcher.email, "active_provider", lambda: None)
 
                 outcome = await service.evaluate_user_alerts(session=session, user_sub="u1", user_email="u1@example.com")
                 assert outcome.checked == 1
                 assert outcome.triggered == 1
-                assert len(sent_calls) == 1
-                assert sent_calls[0]["to_email"] == "u1@example.com"
-                assert "Commodity Alert" in sent_calls[0]["subject"]
+                # Evaluation only queues; nothing is sent until the dispatcher runs.
+                assert sent_calls == []
+                queued = (await session.execute(select(AlertHistory))).scalars().one()
+                assert queued.email_status == "queued"
+                row = (await session.execute(select(NotificationOutbox))).scalars().one()
+                assert row.alert_history_id == queued.id
 
+            assert await dispatcher.dispatch_pending() == 1
+            assert await dispatcher.dispatch_pending() == 0
+            assert len(sent_calls) == 1
+            assert sent_calls[0]["to_email"] == "u1@example.com"
+            assert "Commodity Alert" in sent_calls[0]["subject"]
+            assert sent_calls[0]["key"] == f"email:alert-history:{queued.id}"
+
+            async with Session() as session:
                 history_rows = (await session.execute(select(AlertHistory))).scalars().all()
                 assert len(history_rows) == 1
                 assert history_rows[0].email_status == "sent"
+                assert history_rows[0].delivery_attempts == 1
         finally:
             await engine.dispose()
 
@@ -95,8 +121,9 @@ def test_whatsapp_worker_sends_once_and_marks_triggered(monkeypatch) -> None:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
-        # Worker uses module-level AsyncSessionLocal; redirect it to this test DB.
+        # Worker and dispatcher use module-level AsyncSessionLocal; redirect it to this test DB.
         monkeypatch.setattr(worker_module, "AsyncSessionLocal", Session)
+        monkeypatch.setattr(dispatcher_module, "AsyncSessionLocal", Session)
 
         try:
             async with Session() as session:
@@ -122,7 +149,12 @@ def test_whatsapp_worker_sends_once_and_marks_triggered(monkeypatch) -> None:
                 await session.commit()
 
             worker = WhatsAppAlertWorker()
-            monkeypatch.setattr(worker.market, "fetch_quote", lambda commodity, region: _mk_quote(175220.0, commodity, region))
+            dispatcher = NotificationDispatcher()
+            monkeypatch.setattr(
+                worker.market,
+                "fetch_commodity_quotes",
+                lambda commodity, regions: {region: _mk_quote(175220.0, commodity, region) for region in regions},
+            )
 
             sent_messages: list[dict[str, str]] = []
 
@@ -134,14 +166,16 @@ def test_whatsapp_worker_sends_once_and_marks_triggered(monkeypatch) -> None:
                 _ = key, limit, window_seconds
                 return True
 
-            monkeypatch.setattr(worker.whatsapp, "send_alert", _fake_whatsapp_send)
+            monkeypatch.setattr(dispatcher.whatsapp, "send_alert", _fake_whatsapp_send)
             monkeypatch.setattr(worker.rate_limiter, "allow", _allow_all)
 
             processed_first = await worker.process_pending_alerts()
             processed_second = await worker.process_pending_alerts()
+            dispatched = await dispatcher.dispatch_pending()
 
             assert processed_first == 1
             assert processed_second == 0
+            assert dispatched == 1
             assert len(sent_messages) == 1
             assert "Gold Alert" in sent_messages[0]["message"]
             assert "Your target of" in sent_messages[0]["message"]
@@ -159,3 +193,337 @@ def test_whatsapp_worker_sends_once_and_marks_triggered(monkeypatch) -> None:
             await engine.dispose()
 
     asyncio.run(_run())
+
+
+def test_alert_history_stream_has_no_row_cap(monkeypatch) -> None:
+    monkeypatch.setattr("app.services.alert_service.HISTORY_STREAM_BATCH", 100)
+
+    async def _run() -> list[int]:
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with Session() as session:
+                triggered_at = datetime(2026, 3, 1)
+                session.add_all(
+                    AlertHistory(
+                        alert_id=1,
+                        user_sub="u1" if i % 10 else "u2",
+                        commodity="gold",
+                        region="us",
+                        currency="USD",
+                        alert_type="above",
+                        threshold=2000.0,
+                        observed_value=2000.0 + i,
+                        message=f"event {i}",
+                        triggered_at=triggered_at,
+                    )
+                    for i in range(1500)
+                )
+                await session.commit()
+
+                service = AlertService()
+                return [row.id async for row in service.stream_alert_history(session, "u1", commodity="gold")]
+        finally:
+            await engine.dispose()
+
+    ids = asyncio.run(_run())
+    # More than the old 1000-row cap, newest first with id breaking ties.
+    assert len(ids) == 1350
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_alert_history_keyset_pages_are_stable_across_new_triggers() -> None:
+    async def _run() -> tuple[list[list[int]], str | None]:
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        def _row(i: int, triggered_at: datetime) -> AlertHistory:
+            return AlertHistory(
+                alert_id=1,
+                user_sub="u1",
+                commodity="gold",
+                region="us",
+                currency="USD",
+                alert_type="above",
+                threshold=2000.0,
+                observed_value=2000.0 + i,
+                message=f"event {i}",
+                triggered_at=triggered_at,
+            )
+
+        try:
+            async with Session() as session:
+                # Pairs of rows share a timestamp, so pages must break ties on id.
+                session.add_all(_row(i, datetime(2026, 3, 1, 0, i // 2)) for i in range(7))
+                await session.commit()
+
+                service = AlertService()
+                pages: list[list[int]] = []
+                items, cursor = await service.alert_history_page(session, "u1", limit=3)
+                pages.append([item.id for item in items])
+                session.add(_row(99, datetime(2026, 3, 2)))
+                await session.commit()
+                while cursor:
+                    items, cursor = await service.alert_history_page(session, "u1", limit=3, cursor=cursor)
+                    pages.append([item.id for item in items])
+                return pages, cursor
+        finally:
+            await engine.dispose()
+
+    pages, cursor = asyncio.run(_run())
+    assert pages == [[7, 6, 5], [4, 3, 2], [1]]
+    assert cursor is None
+
+
+def test_user_evaluation_downloads_each_commodity_once(monkeypatch) -> None:
+    async def _run() -> tuple[list[tuple[str, tuple[str, ...]]], int]:
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with Session() as session:
+                session.add_all(
+                    PriceAlert(
+                        user_sub="u3",
+                        user_id="u3",
+                        commodity="gold" if i < 10 else "silver",
+                        region="us" if i < 2 else "india",
+                        currency="INR",
+                        unit="10g_24k",
+                        alert_type="above",
+                        threshold=1_000_000.0 + i,
+                        target_price=1_000_000.0 + i,
+                        enabled=True,
+                    )
+                    for i in range(12)
+                )
+                await session.commit()
+
+                service = AlertService()
+                fetched: list[tuple[str, tuple[str, ...]]] = []
+
+                def _fetch(commodity, regions):
+                    fetched.append((commodity, tuple(sorted(regions))))
+                    return {region: _mk_quote(175000.0, commodity, region) for region in regions}
+
+                monkeypatch.setattr(service.market, "fetch_commodity_quotes", _fetch)
+                outcome = await service.evaluate_user_alerts(session=session, user_sub="u3", user_email=None)
+                return fetched, outcome.checked
+        finally:
+            await engine.dispose()
+
+    fetched, checked = asyncio.run(_run())
+    assert checked == 12
+    # One download per commodity, converted for each of its regions.
+    assert sorted(fetched) == [("gold", ("india", "us")), ("silver", ("india",))]
+
+
+def test_fetch_quotes_downloads_each_commodity_once_for_all_regions(monkeypatch) -> None:
+    downloads: list[str] = []
+
+    def _download(symbol, **kwargs):
+        _ = kwargs
+        downloads.append(symbol)
+        return pd.DataFrame({"Date": pd.date_range("2026-03-12", periods=2), "Close": [2000.0, 2020.0]}).set_index("Date")
+
+    monkeypatch.setattr(market_quote_module.yf, "download", _download)
+    monkeypatch.setattr(market_quote_module, "get_fx_rates", lambda: {"USD": 1.0, "INR": 83.0, "EUR": 0.92})
+    markets = [("gold", "india"), ("gold", "us"), ("gold", "europe"), ("silver", "us"), ("gold", "us")]
+    quotes = asyncio.run(MarketQuoteService().fetch_quotes(markets, cycle="test"))
+
+    assert sorted(downloads) == ["GC=F", "SI=F"]
+    assert set(quotes) == set(markets)
+    assert quotes[("gold", "us")].price == 2020.0
+    assert quotes[("gold", "europe")].currency == "EUR"
+    assert {quote.daily_change_pct for quote in quotes.values()} == {1.0}
+
+
+def test_dispatcher_retries_failed_sends_with_backoff(monkeypatch) -> None:
+    async def _run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        monkeypatch.setattr(dispatcher_module, "AsyncSessionLocal", Session)
+        settings = dispatcher_module.get_settings()
+        monkeypatch.setattr(settings, "notification_max_attempts", 2)
+
+        dispatcher = NotificationDispatcher()
+        keys: list[str] = []
+
+        async def _failing_send(to_email, subject, message, market_context="", idempotency_key=None):
+            _ = to_email, subject, message, market_context
+            keys.append(idempotency_key)
+            return type("EmailResult", (), {"status": "failed", "provider": "test", "error": "503", "attempts": 1})()
+
+        monkeypatch.setattr(dispatcher.email, "send_alert", _failing_send)
+        monkeypatch.setattr(dispatcher.email, "active_provider", lambda: None)
+        try:
+            async with Session() as session:
+                history = AlertHistory(
+                    alert_id=1,
+                    user_sub="u9",
+                    commodity="gold",
+                    region="us",
+                    currency="USD",
+                    alert_type="above",
+                    threshold=2000.0,
+                    observed_value=2100.0,
+                    message="gold above 2000",
+                    email_status="queued",
+                )
+                session.add(history)
+                await session.flush()
+                await dispatcher.outbox.enqueue(
+                    session, history, channel="email", recipient="u9@example.com", body=history.message
+                )
+                await session.commit()
+
+            first = await dispatcher.dispatch_pending()
+            # The retry is scheduled in the future, so an immediate pass finds nothing due.
+            not_due = await dispatcher.dispatch_pending()
+            async with Session() as session:
+                row = (await session.execute(select(NotificationOutbox))).scalars().one()
+                retry_status, retry_at = row.status, row.next_attempt_at
+                row.next_attempt_at = datetime(2000, 1, 1)
+                await session.commit()
+            second = await dispatcher.dispatch_pending()
+            async with Session() as session:
+                row = (await session.execute(select(NotificationOutbox))).scalars().one()
+                history = (await session.execute(select(AlertHistory))).scalars().one()
+            return first, not_due, retry_status, retry_at, second, row, history, keys
+        finally:
+            await engine.dispose()
+
+    first, not_due, retry_status, retry_at, second, row, history, keys = asyncio.run(_run())
+    assert (first, not_due, second) == (1, 0, 1)
+    assert retry_status == "pending"
+    assert retry_at > datetime.now(timezone.utc).replace(tzinfo=None)
+    assert row.status == "failed" and row.attempts == 2
+    assert history.email_status == "failed" and history.delivery_attempts == 2
+    # Every attempt carries the same idempotency key, so a provider can drop a duplicate.
+    assert keys == [row.idempotency_key] * 2
+
+
+def test_worker_retries_alerts_whose_firing_failed_or_was_rate_limited(tmp_path, monkeypatch) -> None:
+    async def _run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'retry.db'}")
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        monkeypatch.setattr(worker_module, "AsyncSessionLocal", Session)
+        async with Session() as session:
+            session.add_all(
+                PriceAlert(
+                    user_sub=f"u{i}",
+                    user_id=f"u{i}",
+                    commodity="gold",
+                    region="us",
+                    currency="USD",
+                    unit="oz",
+                    alert_type="above",
+                    direction="above",
+                    threshold=2000.0,
+                    target_price=2000.0,
+                    whatsapp_number=f"+1555000000{i}",
+                )
+                for i in range(3)
+            )
+            await session.commit()
+
+        worker = WhatsAppAlertWorker()
+        budget = {"+15550000001": 0}
+        broken = {"+15550000002"}
+        original = worker._queue_whatsapp
+
+        async def _queue(session, alert, quote):
+            if alert.whatsapp_number in broken:
+                await original(session, alert, quote)
+                raise RuntimeError("outbox insert failed")
+            return await original(session, alert, quote)
+
+        async def _allow(key, limit, window_seconds):
+            _ = limit, window_seconds
+            number = key.rsplit(":", 1)[1]
+            if number not in budget:
+                return True
+            budget[number] -= 1
+            return budget[number] >= 0
+
+        monkeypatch.setattr(worker, "_queue_whatsapp", _queue)
+        monkeypatch.setattr(worker.rate_limiter, "allow", _allow)
+        try:
+            await worker.leases.acquire()
+            first = await worker.process_tick({("gold", "us"): _mk_quote(2100.0, region="us")})
+            budget["+15550000001"] = 1
+            broken.clear()
+            second = await worker.process_tick({("gold", "us"): _mk_quote(2101.0, region="us")})
+            third = await worker.process_tick({("gold", "us"): _mk_quote(2102.0, region="us")})
+            async with Session() as session:
+                rows = (await session.execute(select(NotificationOutbox.recipient))).scalars().all()
+                history = (await session.execute(select(AlertHistory))).scalars().all()
+            return (first, second, third), sorted(rows), len(history)
+        finally:
+            await engine.dispose()
+
+    counts, recipients, history = asyncio.run(_run())
+    # The failed alert's savepoint rolled back alone; both held-back alerts fire on the next tick.
+    assert counts == (1, 2, 0)
+    assert recipients == ["+15550000000", "+15550000001", "+15550000002"]
+    assert history == 3
+
+
+def test_worker_fires_alert_that_crossed_during_cooldown_once_cooldown_ends(tmp_path, monkeypatch) -> None:
+    async def _run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cooldown.db'}")
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        monkeypatch.setattr(worker_module, "AsyncSessionLocal", Session)
+        async with Session() as session:
+            alert = PriceAlert(
+                user_sub="u1",
+                user_id="u1",
+                commodity="gold",
+                region="us",
+                currency="USD",
+                unit="oz",
+                alert_type="above",
+                threshold=2000.0,
+                enabled=True,
+                is_active=True,
+                email_notifications_enabled=False,
+                cooldown_until=datetime(2999, 1, 1),
+            )
+            session.add(alert)
+            await session.commit()
+            alert_id = alert.id
+
+        worker = WhatsAppAlertWorker()
+        try:
+            await worker.leases.acquire()
+            await worker.process_tick({("gold", "us"): _mk_quote(1990.0, region="us")})
+            # Crosses while cooling down: held back, not lost.
+            during = await worker.process_tick({("gold", "us"): _mk_quote(2010.0, region="us")})
+            still = await worker.process_tick({("gold", "us"): _mk_quote(2015.0, region="us")})
+            async with Session() as session:
+                row = await session.get(PriceAlert, alert_id)
+                row.cooldown_until = datetime(2000, 1, 1)
+                await session.commit()
+            # No new crossing, but the condition still holds once the cooldown has ended.
+            after = await worker.process_tick({("gold", "us"): _mk_quote(2020.0, region="us")})
+            again = await worker.process_tick({("gold", "us"): _mk_quote(2025.0, region="us")})
+            async with Session() as session:
+                history = (await session.execute(select(AlertHistory))).scalars().all()
+            return (during, still, after, again), len(history)
+        finally:
+            await engine.dispose()
+
+    counts, history = asyncio.run(_run())
+    assert counts == (0, 0, 1, 0)
+    assert history == 1
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models.price_alert import PriceAlert
+from app.services.alert_evaluator import RULES, AlertEvaluator, ThresholdLadder
+from app.services.market_quote_service import MarketQuote
+
+
+def _quote(price: float, change: float = 0.0) -> MarketQuote:
+    return MarketQuote(
+        commodity="gold",
+        region="us",
+        currency="USD",
+        unit="oz",
+        price=price,
+        daily_change_pct=change,
+        timestamp=datetime.now(timezone.utc),
+        source="unit-test",
+    )
+
+
+def _alert(alert_type: str, threshold: float, **overrides) -> PriceAlert:
+    fields = dict(
+        user_sub="u1",
+        user_id="u1",
+        commodity="gold",
+        region="us",
+        currency="USD",
+        unit="oz",
+        alert_type=alert_type,
+        direction=alert_type if alert_type in {"above", "below"} else None,
+        threshold=threshold,
+        target_price=threshold,
+        enabled=True,
+        is_active=True,
+    )
+    fields.update(overrides)
+    return PriceAlert(**fields)
+
+
+def _step(ladder: ThresholdLadder, observed: float) -> list[int]:
+    crossed = ladder.crossed(observed)
+    ladder.advance(observed)
+    return crossed
+
+
+def test_ladder_returns_only_thresholds_crossed_since_last_observation() -> None:
+    above = ThresholdLadder(RULES[("email", "above")], [(float(t), t) for t in range(100, 200, 10)])
+    assert _step(above, 125.0) == [100, 110, 120]
+    assert _step(above, 150.0) == [130, 140]
+    # Equal to the threshold is not "above" for email alerts.
+    assert _step(above, 160.0) == [150]
+    assert _step(above, 120.0) == []
+    assert _step(above, 135.0) == [120, 130]
+
+    below = ThresholdLadder(RULES[("whatsapp", "below")], [(float(t), t) for t in range(100, 200, 10)])
+    assert _step(below, 175.0) == [180, 190]
+    assert _step(below, 150.0) == [150, 160, 170]
+
+    drop = ThresholdLadder(RULES[("email", "drop")], [(RULES[("email", "drop")].key(t), t) for t in (1.0, 3.0)])
+    assert _step(drop, -2.0) == [1.0]
+
+
+def test_evaluator_applies_cooldown_in_sql_and_checks_new_alerts_once() -> None:
+    async def _run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        evaluator = AlertEvaluator()
+        try:
+            async with Session() as session:
+                session.add_all(
+                    [
+                        _alert("above", 2000.0),
+                        _alert("above", 2100.0, cooldown_until=datetime(2999, 1, 1)),
+                        _alert("below", 1500.0),
+                        _alert("spike", 2.0),
+                    ]
+                )
+                await session.commit()
+
+                assert await evaluator.refresh(session) is True
+                assert await evaluator.refresh(session) is False
+                first = [row.id for row in await evaluator.triggered(session, _quote(2200.0, change=2.5))]
+                evaluator.advance(_quote(2200.0, change=2.5))
+                # Nothing crossed since the last quote.
+                second = [row.id for row in await evaluator.triggered(session, _quote(2250.0, change=2.6))]
+                evaluator.advance(_quote(2250.0, change=2.6))
+
+                session.add(_alert("above", 2200.0))
+                await session.commit()
+                assert await evaluator.refresh(session) is True
+                third = [row.id for row in await evaluator.triggered(session, _quote(2260.0, change=2.6))]
+                ids = (await session.execute(select(PriceAlert.id).order_by(PriceAlert.id))).scalars().all()
+                return first, second, third, ids
+        finally:
+            await engine.dispose()
+
+    first, second, third, ids = asyncio.run(_run())
+    # Alert 2 crossed but is cooling down; alert 3 (below) did not fire.
+    assert first == [ids[0], ids[3]]
+    assert second == []
+    assert third == [ids[4]]
+
+
+def test_ladder_keeps_crossings_until_advanced_and_retries_requested_ids() -> None:
+    above = ThresholdLadder(RULES[("whatsapp", "above")], [(100.0, 1), (110.0, 2)])
+    above.advance(90.0)
+    # Not advanced (e.g. the commit failed): the same crossing is offered again.
+    assert above.crossed(115.0) == [1, 2]
+    assert above.crossed(115.0) == [1, 2]
+    above.advance(115.0, retry={2})
+    # Alert 2 was rate-limited; it fires again while the price still qualifies.
+    assert above.crossed(116.0) == [2]
+    above.advance(116.0)
+    assert above.crossed(117.0) == []
+
+
+def test_refresh_sees_threshold_edits_that_cancel_out_in_the_sums() -> None:
+    async def _run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        evaluator = AlertEvaluator()
+        try:
+            async with Session() as session:
+                a, b = _alert("above", 2000.0), _alert("above", 2100.0)
+                session.add_all([a, b])
+                await session.commit()
+                await evaluator.refresh(session)
+                a.threshold, a.target_price = 2010.0, 2010.0
+                b.threshold, b.target_price = 2090.0, 2090.0
+                await session.commit()
+                return await evaluator.refresh(session), evaluator.candidates(_quote(2005.0))
+        finally:
+            await engine.dispose()
+
+    rebuilt, candidates = asyncio.run(_run())
+    assert rebuilt is True
+    assert candidates == []
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models.alert_history import AlertHistory
+from app.models.price_alert import PriceAlert
+from app.services import rate_limiter as rate_limiter_module
+from app.services.delivery_throttle import DeliveryThrottle
+from app.services.market_quote_service import MarketQuote
+from app.services.shard_lease_service import ShardLeaseService
+from app.services.whatsapp_service import WhatsAppDeliveryResult
+from app.workers import notification_dispatcher as dispatcher_module
+from app.workers import whatsapp_alert_worker as worker_module
+from app.workers.notification_dispatcher import NotificationDispatcher
+from app.workers.whatsapp_alert_worker import WhatsAppAlertWorker
+
+
+async def _sessionmaker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'shards.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+def test_shard_leases_rebalance_between_processes(tmp_path) -> None:
+    async def _run():
+        engine, Session = await _sessionmaker(tmp_path)
+        a = ShardLeaseService("pool", 16, 60, owner="a", session_factory=Session)
+        b = ShardLeaseService("pool", 16, 60, owner="b", session_factory=Session)
+        try:
+            alone = await a.acquire()
+            b_joining = await b.acquire()
+            a_shrunk = await a.acquire()
+            b_joined = await b.acquire()
+            await a.release()
+            b_after_a_left = await b.acquire()
+            return alone, b_joining, a_shrunk, b_joined, b_after_a_left
+        finally:
+            await engine.dispose()
+
+    alone, b_joining, a_shrunk, b_joined, b_after_a_left = asyncio.run(_run())
+    assert len(alone) == 16
+    # b registers first, and picks up shards once a has released its surplus.
+    assert b_joining == frozenset()
+    assert len(a_shrunk) == len(b_joined) == 8
+    assert a_shrunk.isdisjoint(b_joined)
+    assert len(b_after_a_left) == 16
+
+
+def test_workers_split_alerts_and_deliver_each_once(tmp_path, monkeypatch) -> None:
+    sent: list[str] = []
+
+    async def _run():
+        engine, Session = await _sessionmaker(tmp_path)
+        monkeypatch.setattr(worker_module, "AsyncSessionLocal", Session)
+        monkeypatch.setattr(dispatcher_module, "AsyncSessionLocal", Session)
+        async with Session() as session:
+            session.add_all(
+                PriceAlert(
+                    user_sub=f"u{i}",
+                    user_id=f"u{i}",
+                    commodity="gold",
+                    region="us",
+                    currency="USD",
+                    unit="oz",
+                    alert_type="above",
+                    direction="above",
+                    threshold=2000.0,
+                    target_price=2000.0,
+                    whatsapp_number=f"+1555000{i:04d}",
+                )
+                for i in range(40)
+            )
+            await session.commit()
+
+        async def _send(to_number, message):
+            _ = message
+            await asyncio.sleep(0)
+            sent.append(to_number)
+            return WhatsAppDeliveryResult(status="sent", provider="twilio", attempts=1)
+
+        async def _allow(key, limit, window_seconds):
+            _ = key, limit, window_seconds
+            return True
+
+        quote = MarketQuote("gold", "us", "USD", "oz", 2100.0, 0.5, datetime.now(timezone.utc), "unit-test")
+        workers = [WhatsAppAlertWorker(), WhatsAppAlertWorker()]
+        for worker in workers:
+            monkeypatch.setattr(worker.market, "fetch_commodity_quotes", lambda commodity, regions: {"us": quote})
+            monkeypatch.setattr(worker.rate_limiter, "allow", _allow)
+        dispatchers = [NotificationDispatcher(), NotificationDispatcher()]
+        for dispatcher in dispatchers:
+            monkeypatch.setattr(dispatcher.whatsapp, "send_alert", _send)
+            # Without Redis the budget is enforced by local buckets, so the 40 sends would
+            # wait out real one-second windows; budgets are covered by the tests below.
+            monkeypatch.setattr(dispatcher.throttle, "provider_rates", {})
+        try:
+            # Both processes register before either evaluates, as after a rolling start.
+            for worker in workers:
+                await worker.leases.acquire()
+            counts = [await worker.process_pending_alerts() for worker in workers]
+            counts += [await worker.process_pending_alerts() for worker in workers]
+            # Both dispatchers drain the outbox at once; claims keep their batches disjoint.
+            settings = dispatcher_module.get_settings()
+            monkeypatch.setattr(settings, "notification_dispatch_batch_size", 15)
+            while sum(await asyncio.gather(*(dispatcher.dispatch_pending() for dispatcher in dispatchers))):
+                pass
+            return counts, [worker.leases.held for worker in workers]
+        finally:
+            await engine.dispose()
+
+    counts, held = asyncio.run(_run())
+    assert sum(counts) == 40
+    assert held[0] and held[1] and held[0].isdisjoint(held[1])
+    assert len(sent) == len(set(sent)) == 40
+
+
+def test_delivery_throttle_bounds_concurrency_and_waits_for_provider_budget(monkeypatch) -> None:
+    windows: dict[str, int] = {}
+
+    class _Limiter:
+        async def allow(self, key: str, limit: int, window_seconds: int) -> bool:
+            _ = window_seconds
+            windows[key] = windows.get(key, 0) + 1
+            return windows[key] <= limit
+
+    waits: list[float] = []
+
+    async def _sleep(seconds: float) -> None:
+        waits.append(seconds)
+        clock[0] += 1.0
+
+    clock = [1000.25]
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr("app.services.delivery_throttle.time.time", lambda: clock[0])
+    monkeypatch.setattr("app.services.delivery_throttle.asyncio.sleep", _sleep)
+    throttle = DeliveryThrottle(2, {"twilio": 3}, limiter=_Limiter())
+    active = [0]
+    peak = [0]
+
+    async def _send() -> None:
+        async with throttle.slot("twilio"):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await real_sleep(0)
+            active[0] -= 1
+
+    async def _run() -> None:
+        await asyncio.gather(*(_send() for _ in range(7)))
+
+    asyncio.run(_run())
+    assert peak[0] <= 2
+    # 7 sends at 3 per second span three one-second windows.
+    assert sorted(windows) == [f"delivery:provider:twilio:{second}" for second in (1000, 1001, 1002)]
+    assert waits and waits[0] == 0.75
+
+
+def test_provider_over_budget_does_not_hold_send_slots(monkeypatch) -> None:
+    class _Limiter:
+        async def allow(self, key: str, limit: int, window_seconds: int) -> bool:
+            _ = limit, window_seconds
+            # Twilio is out of budget for the whole test.
+            return ":twilio:" not in key
+
+    window_over = asyncio.Event()
+
+    async def _sleep(seconds: float) -> None:
+        _ = seconds
+        await window_over.wait()
+
+    monkeypatch.setattr("app.services.delivery_throttle.asyncio.sleep", _sleep)
+    throttle = DeliveryThrottle(2, {"twilio": 1, "resend": 10}, limiter=_Limiter())
+    sent: list[str] = []
+
+    async def _send(provider: str) -> None:
+        async with throttle.slot(provider):
+            sent.append(provider)
+
+    async def _run() -> list[str]:
+        waiting = [asyncio.ensure_future(_send("twilio")) for _ in range(4)]
+        await asyncio.wait_for(asyncio.gather(*(_send("resend") for _ in range(3))), timeout=1.0)
+        for task in waiting:
+            task.cancel()
+        await asyncio.gather(*waiting, return_exceptions=True)
+        return sent
+
+    # Four twilio senders wait for budget; both slots stay free for resend.
+    assert asyncio.run(_run()) == ["resend"] * 3
+
+
+def test_dispatcher_delivers_without_redis_within_local_provider_budgets(tmp_path, monkeypatch) -> None:
+    # No Redis: the throttle's limiter falls back to per-process buckets instead of failing open.
+    monkeypatch.setattr(rate_limiter_module, "redis", None)
+    clock = [1000.25]
+    sends_per_window: dict[int, int] = {}
+
+    async def _sleep(seconds: float) -> None:
+        clock[0] += seconds
+
+    async def _run():
+        engine, Session = await _sessionmaker(tmp_path)
+        monkeypatch.setattr(dispatcher_module, "AsyncSessionLocal", Session)
+        settings = dispatcher_module.get_settings()
+        monkeypatch.setattr(settings, "whatsapp_provider", "twilio")
+        dispatcher = NotificationDispatcher()
+        dispatcher.throttle.provider_rates = {"twilio": 3}
+
+        async def _send(to_number, message):
+            _ = to_number, message
+            window = int(clock[0])
+            sends_per_window[window] = sends_per_window.get(window, 0) + 1
+            return WhatsAppDeliveryResult(status="sent", provider="twilio", attempts=1)
+
+        monkeypatch.setattr(dispatcher.whatsapp, "send_alert", _send)
+        try:
+            async with Session() as session:
+                for i in range(7):
+                    history = AlertHistory(
+                        alert_id=1,
+                        user_sub=f"u{i}",
+                        commodity="gold",
+                        region="us",
+                        currency="USD",
+                        alert_type="above",
+                        threshold=2000.0,
+                        observed_value=2100.0,
+                        message="gold above 2000",
+                    )
+                    session.add(history)
+                    await dispatcher.outbox.enqueue(
+                        session, history, channel="whatsapp", recipient=f"+1555000{i:04d}", body=history.message
+                    )
+                await session.commit()
+            return await dispatcher.dispatch_pending(), dispatcher.throttle.limiter
+        finally:
+            await engine.dispose()
+
+    monkeypatch.setattr("app.services.delivery_throttle.time.time", lambda: clock[0])
+    monkeypatch.setattr("app.services.delivery_throttle.asyncio.sleep", _sleep)
+    dispatched, limiter = asyncio.run(_run())
+    assert dispatched == 7
+    assert sum(sends_per_window.values()) == 7
+    assert max(sends_per_window.values()) <= 3
+    assert len(limiter.local._buckets) == len(sends_per_window) >= 3
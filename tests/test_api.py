@@ -66,8 +66,8 @@ def test_fallback_source(monkeypatch) -> None:
 
 
 def test_region_unit_conversion(monkeypatch) -> None:
-    async def _mock_hist(commodity: str, region: str, period: str, session=None):
-        _ = commodity, period, session
+    async def _mock_hist(commodity: str, region: str, period: str, session=None, **kwargs):
+        _ = commodity, period, session, kwargs
         return RegionalHistoricalResponse(
             commodity="gold",
             region=region,
@@ -336,8 +336,8 @@ def test_related_api_validation(monkeypatch, commodity: str, region: str) -> Non
             )
         ]
 
-    async def _mock_hist(commodity: str, region: str, period: str, session=None):
-        _ = commodity, region, period, session
+    async def _mock_hist(commodity: str, region: str, period: str, session=None, **kwargs):
+        _ = commodity, region, period, session, kwargs
         return RegionalHistoricalResponse(
             commodity=commodity,
             region=region,
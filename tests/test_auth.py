@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.core import auth
+from app.core.auth import ClaimsCache, TokenVerificationMiddleware, create_app_jwt, decode_access_token
+
+
+def test_verified_claims_are_cached_by_token(monkeypatch) -> None:
+    auth.claims_cache.clear()
+    verified: list[str] = []
+    original = auth._verify_access_token
+
+    async def _counting(token: str):
+        verified.append(token)
+        return await original(token)
+
+    monkeypatch.setattr(auth, "_verify_access_token", _counting)
+    token = create_app_jwt({"sub": "auth0|cached", "email": "cached@example.com"})
+
+    async def _run():
+        first = await decode_access_token(token)
+        first["sub"] = "mutated"
+        return await decode_access_token(token)
+
+    second = asyncio.run(_run())
+    assert second["sub"] == "auth0|cached"
+    assert verified == [token]
+    auth.claims_cache.clear()
+
+
+def test_claims_cache_honors_exp_and_bounds_size() -> None:
+    cache = ClaimsCache(max_entries=2, max_ttl_seconds=300)
+    cache.put("expired", {"sub": "a", "exp": time.time() - 1})
+    assert cache.get("expired") is None
+
+    cache.put("t1", {"sub": "1", "exp": time.time() + 60})
+    cache.put("t2", {"sub": "2"})
+    assert cache.get("t1")["sub"] == "1"
+    cache.put("t3", {"sub": "3"})
+    # t2 was least recently used.
+    assert cache.get("t2") is None
+    assert {cache.get("t1")["sub"], cache.get("t3")["sub"]} == {"1", "3"}
+
+
+def test_middleware_sets_user_state_and_tolerates_bad_tokens() -> None:
+    seen: list[object] = []
+
+    async def _app(scope, receive, send):
+        seen.append(scope["state"]["user"])
+
+    middleware = TokenVerificationMiddleware(_app)
+    token = create_app_jwt({"sub": "auth0|middleware"})
+
+    async def _run():
+        for header in (f"Bearer {token}", "Bearer not-a-jwt", None):
+            headers = [(b"authorization", header.encode())] if header else []
+            await middleware({"type": "http", "headers": headers}, None, None)
+
+    asyncio.run(_run())
+    assert seen[0]["sub"] == "auth0|middleware"
+    assert seen[1:] == [None, None]
+
+
+def test_app_jwt_secret_follows_vault_snapshots_and_never_caches_the_dev_default(monkeypatch) -> None:
+    from app.services.vault_service import SecretSnapshot
+
+    secrets = [auth.INSECURE_DEV_JWT_SECRET]
+    monkeypatch.setattr(auth, "get_secret_value", lambda *args, **kwargs: secrets[-1])
+    monkeypatch.setattr(auth, "_APP_JWT_SECRET_CACHE", {"snapshot": None, "secret": None})
+
+    before_vault_loaded = auth._app_jwt_secret()
+    secrets.append("vault-secret")
+    loaded = auth._app_jwt_secret()
+    secrets.append("rotated-secret")
+    same_snapshot = auth._app_jwt_secret()
+    monkeypatch.setattr(auth.vault, "_snapshot", SecretSnapshot())
+    after_refresh = auth._app_jwt_secret()
+
+    assert before_vault_loaded == auth.INSECURE_DEV_JWT_SECRET
+    assert (loaded, same_snapshot, after_refresh) == ("vault-secret", "vault-secret", "rotated-secret")
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.core.responses import dumps
+from app.main import app
+from app.schemas.market_data import MarketDataProvenanceRecord, NormalizedHistoricalBar, NormalizedHistoricalSeries
+from app.services import commodity_service as commodity_service_module
+from app.services.commodity_service import CommodityService
+from app.services.fx_cache import clear_caches
+
+client = TestClient(app)
+FX = {"USD": 1.0, "INR": 83.0, "EUR": 0.92}
+
+
+def _series(rows: int, region: str = "india") -> NormalizedHistoricalSeries:
+    start = date(2020, 1, 1)
+    return NormalizedHistoricalSeries(
+        commodity="gold",
+        region=region,
+        provenance=MarketDataProvenanceRecord(source_type="historical", provider="cache"),
+        bars=[
+            NormalizedHistoricalBar(
+                date=start + timedelta(days=i),
+                open_usd_per_troy_oz=1500.0 + i,
+                high_usd_per_troy_oz=1510.0 + i,
+                low_usd_per_troy_oz=1490.0 + i,
+                close_usd_per_troy_oz=1505.0 + i,
+                volume=None if i % 2 else 10.0,
+            )
+            for i in range(rows)
+        ],
+    )
+
+
+def test_columnar_matches_row_layout_and_is_smaller() -> None:
+    service = CommodityService()
+    series = _series(1000)
+    rows = service.normalization_service.to_historical_response(series=series, fx_rates=FX)
+    columnar = service.normalization_service.to_historical_response(
+        series=series,
+        fx_rates=FX,
+        format="columnar",
+        date_encoding="epoch_day",
+    )
+
+    columns = columnar.columns
+    assert columnar.rows == rows.rows == 1000
+    assert columns.close == [point.close for point in rows.data]
+    assert columns.low == [point.low for point in rows.data]
+    assert columns.volume == [point.volume for point in rows.data]
+    assert columns.date[0] == (date(2020, 1, 1) - date(1970, 1, 1)).days
+    assert len(dumps(columnar)) < 0.6 * len(dumps(rows))
+
+
+def test_layout_validation() -> None:
+    service = CommodityService()
+    with pytest.raises(ValueError, match="Invalid format"):
+        service.normalization_service.to_historical_response(series=_series(3), fx_rates=FX, format="csv")
+    with pytest.raises(ValueError, match="Invalid date_encoding"):
+        service.normalization_service.to_historical_response(series=_series(3), fx_rates=FX, date_encoding="unix")
+
+
+def test_downsampled_columnar_keeps_source_rows(monkeypatch) -> None:
+    clear_caches()
+    service = CommodityService()
+    series = _series(2000, region="us")
+
+    async def _load(commodity, region, period="1y", session=None):
+        _ = commodity, region, period, session
+        return series
+
+    monkeypatch.setattr(service, "historical_series", _load)
+    monkeypatch.setattr(commodity_service_module, "get_fx_rates", lambda: FX)
+    rows = asyncio.run(service.historical("gold", region="us", period="max", points=100))
+    columnar = asyncio.run(service.historical("gold", region="us", period="max", points=100, format="columnar"))
+
+    assert columnar.rows == 100
+    assert columnar.source_rows == 2000
+    assert columnar.downsample == "lttb"
+    assert columnar.columns.date == [point.date for point in rows.data]
+    clear_caches()
+
+
+def test_routes_serve_columnar_payloads(monkeypatch) -> None:
+    service = CommodityService()
+    series = _series(5)
+
+    async def _historical(commodity, region, period="1y", session=None, **kwargs):
+        _ = commodity, region, period, session
+        return service.normalization_service.to_historical_response(
+            series=series,
+            fx_rates=FX,
+            format=kwargs["format"],
+            date_encoding=kwargs["date_encoding"],
+        )
+
+    async def _historical_series(commodity, region, period="1y", session=None):
+        _ = commodity, region, period, session
+        return series
+
+    monkeypatch.setattr(routes.service, "historical", _historical)
+    monkeypatch.setattr(routes.service, "historical_series", _historical_series)
+
+    regional = client.get("/api/historical/gold/india?range=1m&format=columnar&date_encoding=epoch_day").json()
+    assert regional["format"] == "columnar"
+    assert regional["columns"]["date"][-1] == (date(2020, 1, 5) - date(1970, 1, 1)).days
+    assert "data" not in regional
+
+    normalized = client.get("/api/normalized/historical/gold/india?range=1m&format=columnar").json()
+    assert normalized["columns"]["date"] == ["2020-01-01", "2020-01-02", "2020-01-03", "2020-01-04", "2020-01-05"]
+    assert normalized["columns"]["close_usd_per_troy_oz"][0] == 1505.0
+    assert normalized["rows"] == 5
+
+    invalid = client.get("/api/normalized/historical/gold/india?range=1m&format=csv")
+    assert invalid.status_code == 400
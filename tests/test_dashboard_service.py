@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.schemas.market_data import (
+    MarketDataProvenanceRecord,
+    NormalizedHistoricalBar,
+    NormalizedHistoricalSeries,
+    NormalizedLiveQuote,
+)
+from app.schemas.responses import CommodityNewsSummaryResponse, EngineeredFeatureSnapshot, RegionalPredictionResponse
+from app.services import dashboard_service as dashboard_module
+from app.services.alert_service import AlertService
+from app.services.commodity_service import CommodityService
+from app.services.dashboard_service import DashboardService
+from app.services.market_signal_service import MarketSignalService
+from app.services.news_persistence_service import NewsPersistenceService
+from app.services.news_service import CommodityNewsService
+
+FX = {"USD": 1.0, "INR": 83.0, "EUR": 0.92}
+NOW = datetime(2026, 3, 11, tzinfo=timezone.utc)
+
+
+@asynccontextmanager
+async def _fake_session():
+    yield None
+
+
+def _series(commodity: str, region: str) -> NormalizedHistoricalSeries:
+    start = date(2025, 3, 1)
+    return NormalizedHistoricalSeries(
+        commodity=commodity,
+        region=region,
+        provenance=MarketDataProvenanceRecord(source_type="historical", provider="cache"),
+        bars=[
+            NormalizedHistoricalBar(
+                date=start + timedelta(days=i),
+                open_usd_per_troy_oz=2000.0 + i,
+                high_usd_per_troy_oz=2010.0 + i,
+                low_usd_per_troy_oz=1990.0 + i,
+                close_usd_per_troy_oz=2005.0 + i,
+                volume=100.0,
+            )
+            for i in range(365)
+        ],
+    )
+
+
+def _prediction(commodity: str, region: str) -> RegionalPredictionResponse:
+    return RegionalPredictionResponse(
+        commodity=commodity,
+        region=region,
+        unit="oz",
+        currency="USD",
+        forecast_horizon=date(2026, 4, 10),
+        current_spot_price=2350.0,
+        spot_timestamp=NOW,
+        point_forecast=2390.0,
+        forecast_vs_spot_pct=1.7,
+        confidence_interval=(2340.0, 2440.0),
+        confidence_method="spot_anchored_volatility_90",
+        scenario="base",
+        scenario_forecasts={"bull": 2460.0, "base": 2390.0, "bear": 2320.0},
+        forecast_basis_label="30D base scenario",
+        model_used="test-model",
+    )
+
+
+def _dashboard(monkeypatch, *, news_delay: float = 0.0, failing_prediction: str | None = None) -> tuple[DashboardService, dict]:
+    calls = {"quotes": 0, "series": [], "predict_series": [], "signals": 0}
+    commodity_service = CommodityService()
+    news_service = CommodityNewsService()
+    service = DashboardService(
+        commodity_service=commodity_service,
+        market_signal_service=MarketSignalService(),
+        alert_service=AlertService(),
+        news_service=news_service,
+        news_persistence_service=NewsPersistenceService(news_service),
+        session_factory=_fake_session,
+    )
+
+    async def _quotes(commodities):
+        calls["quotes"] += 1
+        return {
+            commodity: NormalizedLiveQuote(
+                commodity=commodity,
+                price_usd_per_troy_oz=2400.0,
+                observed_at=NOW,
+                provenance=MarketDataProvenanceRecord(source_type="live", provider="test"),
+            )
+            for commodity in commodities
+        }
+
+    def _load(commodity, region, period="1y"):
+        calls["series"].append(commodity)
+        return _series(commodity, region)
+
+    async def _predict(session, commodity, region, horizon=1, *, series=None, live_quotes=None):
+        _ = session, horizon, live_quotes
+        calls["predict_series"].append(series is not None)
+        if commodity == failing_prediction:
+            raise ValueError("model unavailable")
+        return _prediction(commodity, region)
+
+    async def _signal(session, *, commodity, region, horizon, live_row, prediction, series=None):
+        _ = session, horizon, series
+        calls["signals"] += 1
+        return service.market_signal_service.signal_service.build_response(
+            commodity=commodity,
+            region=region,
+            horizon_days=30,
+            current_price=float(live_row.live_price),
+            point_forecast=float(prediction.point_forecast),
+            forecast_range=prediction.confidence_interval,
+            scenario_forecasts=prediction.scenario_forecasts,
+            features=EngineeredFeatureSnapshot(
+                returns_1d=0.0,
+                returns_5d=0.0,
+                returns_20d=0.0,
+                realized_volatility_20d=0.01,
+                momentum_20d=0.0,
+                price_vs_ma20_pct=0.0,
+                drawdown_20d_pct=0.0,
+                fx_rate=1.0,
+                fx_volatility=0.0,
+                inflation_proxy=0.0,
+                rate_proxy=0.0,
+                calendar_month=3,
+            ),
+            provenance=[],
+        )
+
+    async def _list_alerts(session, user_sub):
+        return []
+
+    async def _history(session, user_sub, limit=200, **kwargs):
+        return []
+
+    async def _headlines(session, *, commodity, limit=6):
+        return []
+
+    async def _summarize(commodity, headlines=None):
+        await asyncio.sleep(news_delay)
+        return CommodityNewsSummaryResponse(
+            commodity=commodity, sentiment="neutral", summary="Quiet session.", headlines=[], updated_at=NOW
+        )
+
+    monkeypatch.setattr(commodity_service.ingestion_service, "fetch_live_quotes", _quotes)
+    monkeypatch.setattr(commodity_service.ingestion_service, "load_historical_series", _load)
+    monkeypatch.setattr(commodity_service.fetcher, "get_fx_history", lambda region, period="1y": pd.Series(dtype=float))
+    monkeypatch.setattr(commodity_service, "predict", _predict)
+    monkeypatch.setattr(service.market_signal_service, "signal_from_inputs", _signal)
+    monkeypatch.setattr(service.alert_service, "list_alerts", _list_alerts)
+    monkeypatch.setattr(service.alert_service, "alert_history", _history)
+    monkeypatch.setattr(service.news_persistence_service, "get_or_ingest_recent_headlines", _headlines)
+    monkeypatch.setattr(service.news_service, "summarize", _summarize)
+    monkeypatch.setattr(dashboard_module, "get_fx_rates", lambda: FX)
+    return service, calls
+
+
+def test_dashboard_shares_quotes_and_series_across_sections(monkeypatch) -> None:
+    service, calls = _dashboard(monkeypatch)
+
+    response = asyncio.run(service.build(user_sub="u1", region="india", horizon=30))
+
+    assert {name: status.status for name, status in response.sections.items()} == {
+        "live_prices": "ok",
+        "sparklines": "ok",
+        "predictions": "ok",
+        "signals": "ok",
+        "alerts": "ok",
+        "news": "ok",
+    }
+    assert calls["quotes"] == 1
+    assert sorted(calls["series"]) == ["crude_oil", "gold", "silver"]
+    assert calls["predict_series"] == [True, True, True]
+    assert calls["signals"] == 3
+    assert len(response.live_prices) == 3
+    assert response.currency == "INR"
+    assert response.sparklines["gold"].rows == 31
+    assert response.sparklines["gold"].data[-1].date == date(2026, 2, 28)
+
+
+def test_dashboard_reports_timeouts_and_partial_sections(monkeypatch) -> None:
+    service, _ = _dashboard(monkeypatch, news_delay=1.0, failing_prediction="silver")
+
+    response = asyncio.run(
+        service.build(user_sub="u1", region="us", horizon=30, sections=["predictions", "signals", "news"], timeout_seconds=0.3)
+    )
+
+    assert response.sections["news"].status == "timeout"
+    assert response.news == {}
+    assert response.sections["predictions"].status == "partial"
+    assert "silver" in response.sections["predictions"].error
+    assert set(response.predictions) == {"gold", "crude_oil"}
+    assert set(response.signals) == {"gold", "crude_oil"}
+    assert response.sections["live_prices"].status == "skipped"
+
+
+def test_dashboard_route(monkeypatch) -> None:
+    service, _ = _dashboard(monkeypatch)
+    monkeypatch.setattr(routes, "dashboard_service", service)
+    client = TestClient(app)
+
+    response = client.get("/api/dashboard?region=europe&horizon=7&sections=live_prices,sparklines")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, no-store"
+    body = response.json()
+    assert body["region"] == "europe"
+    assert body["sections"]["predictions"]["status"] == "skipped"
+    assert len(body["sparklines"]) == 3
+
+    invalid = client.get("/api/dashboard?region=us&horizon=7&sections=weather")
+    assert invalid.status_code == 400
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.schemas.market_data import MarketDataProvenanceRecord, NormalizedHistoricalBar, NormalizedHistoricalSeries
+from app.schemas.responses import RegionalHistoricalPoint
+from app.services import commodity_service as commodity_service_module
+from app.services.commodity_service import CommodityService
+from app.services.downsampling import downsample_points, lttb_indices, ohlc_buckets
+from app.services import fx_cache
+from app.services.fx_cache import clear_caches
+
+
+def _points(count: int) -> list[RegionalHistoricalPoint]:
+    start = date(2010, 1, 1)
+    closes = 1500.0 + 200.0 * np.sin(np.linspace(0, 12, count))
+    closes[count // 3] += 400.0  # a spike LTTB must keep
+    return [
+        RegionalHistoricalPoint(
+            date=start + timedelta(days=i),
+            open=float(close) - 1.0,
+            high=float(close) + 5.0,
+            low=float(close) - 5.0,
+            close=float(close),
+            volume=100.0,
+        )
+        for i, close in enumerate(closes)
+    ]
+
+
+def test_lttb_keeps_endpoints_and_extremes() -> None:
+    points = _points(5000)
+    sampled = downsample_points(points, 400, "lttb")
+
+    assert len(sampled) == 400
+    assert sampled[0] == points[0]
+    assert sampled[-1] == points[-1]
+    assert max(p.close for p in sampled) == max(p.close for p in points)
+    assert [p.date for p in sampled] == sorted(p.date for p in sampled)
+
+
+def test_lttb_indices_noop_when_threshold_exceeds_length() -> None:
+    x = np.arange(10, dtype=float)
+    assert lttb_indices(x, x, 50).tolist() == list(range(10))
+
+
+def test_ohlc_buckets_preserve_range_and_volume() -> None:
+    points = _points(1000)
+    candles = ohlc_buckets(points, 100)
+
+    assert len(candles) == 100
+    assert candles[0].date == points[0].date
+    assert candles[0].open == round(points[0].open, 4)
+    assert candles[-1].close == round(points[-1].close, 4)
+    assert max(c.high for c in candles) == round(max(p.high for p in points), 4)
+    assert min(c.low for c in candles) == round(min(p.low for p in points), 4)
+    assert sum(c.volume for c in candles) == pytest.approx(sum(p.volume for p in points))
+
+
+def test_downsample_rejects_unknown_method() -> None:
+    with pytest.raises(ValueError):
+        downsample_points(_points(10), 5, "mean")
+
+
+def _bars_series(count: int) -> NormalizedHistoricalSeries:
+    start = date(2006, 1, 1)
+    return NormalizedHistoricalSeries(
+        commodity="gold",
+        region="us",
+        provenance=MarketDataProvenanceRecord(source_type="historical", provider="cache"),
+        bars=[
+            NormalizedHistoricalBar(
+                date=start + timedelta(days=i),
+                open_usd_per_troy_oz=1500.0 + i * 0.1,
+                high_usd_per_troy_oz=1505.0 + i * 0.1,
+                low_usd_per_troy_oz=1495.0 + i * 0.1,
+                close_usd_per_troy_oz=1500.0 + i * 0.1,
+                volume=1000.0,
+            )
+            for i in range(count)
+        ],
+    )
+
+
+def test_historical_downsampling_shrinks_payload_and_is_cached(monkeypatch) -> None:
+    clear_caches()
+    service = CommodityService()
+    series = _bars_series(5000)
+    conversions: list[int] = []
+
+    async def _series(commodity, region, period="1y", session=None):
+        _ = commodity, region, period, session
+        return series
+
+    original = service.normalization_service.to_historical_response
+
+    def _counting(**kwargs):
+        conversions.append(1)
+        return original(**kwargs)
+
+    monkeypatch.setattr(service, "historical_series", _series)
+    monkeypatch.setattr(service.normalization_service, "to_historical_response", _counting)
+    monkeypatch.setattr(commodity_service_module, "get_fx_rates", lambda: {"USD": 1.0, "INR": 83.0, "EUR": 0.92})
+
+    full = asyncio.run(service.historical("gold", region="us", period="max"))
+    sampled = asyncio.run(service.historical("gold", region="us", period="max", points=500))
+    again = asyncio.run(service.historical("gold", region="us", period="max", points=500))
+
+    assert sampled.rows == 500
+    assert sampled.source_rows == 5000
+    assert sampled.downsample == "lttb"
+    assert len(json.dumps(full.model_dump(mode="json"))) >= 9 * len(json.dumps(sampled.model_dump(mode="json")))
+    assert again is sampled
+    assert len(conversions) == 2
+    clear_caches()
+
+
+def test_downsample_cache_is_bounded_and_keyed_on_fx_version(monkeypatch) -> None:
+    clear_caches()
+    service = CommodityService()
+    series = _bars_series(1000)
+
+    async def _series_for(commodity, region, period="1y", session=None):
+        _ = commodity, region, period, session
+        return series
+
+    monkeypatch.setattr(service, "historical_series", _series_for)
+    monkeypatch.setattr(commodity_service_module, "get_fx_rates", lambda: {"USD": 1.0, "INR": 83.0, "EUR": 0.92})
+    monkeypatch.setattr(fx_cache, "HIST_MAX_ENTRIES", 3)
+
+    first = asyncio.run(service.historical("gold", region="us", period="max", points=100))
+    for points in range(101, 110):
+        asyncio.run(service.historical("gold", region="us", period="max", points=points))
+    assert len(fx_cache._HIST_CACHE) == 3
+    assert asyncio.run(service.historical("gold", region="us", period="max", points=100)) is not first
+
+    # New FX rates must not be served a response converted with the old ones.
+    cached = asyncio.run(service.historical("gold", region="us", period="max", points=100))
+    fx_cache._store_rates({"USD": 1.0, "INR": 84.0, "EUR": 0.93}, 0.0)
+    assert asyncio.run(service.historical("gold", region="us", period="max", points=100)) is not cached
+    clear_caches()
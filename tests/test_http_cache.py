@@ -0,0 +1,291 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.core.body_cache import negotiate_encoding
+from app.core.http_cache import validators
+from app.main import app
+from app.services import fx_cache
+from app.services import live_price_snapshot_service as snapshot_module
+from app.services.live_price_snapshot_service import LivePriceSnapshotService
+from app.schemas.market_data import MarketDataProvenanceRecord, NormalizedLiveQuote
+from app.schemas.responses import LivePriceResponse, RegionalHistoricalPoint, RegionalHistoricalResponse
+
+client = TestClient(app)
+
+
+@asynccontextmanager
+async def _fake_session():
+    yield None
+
+
+def _live_item(price: float) -> LivePriceResponse:
+    return LivePriceResponse(
+        commodity="gold",
+        region="us",
+        unit="oz",
+        currency="USD",
+        live_price=price,
+        source="comex/yahoo_finance",
+        timestamp=datetime(2026, 3, 13, 14, 30, tzinfo=timezone.utc),
+    )
+
+
+def _quote(price: float) -> NormalizedLiveQuote:
+    return NormalizedLiveQuote(
+        commodity="gold",
+        price_usd_per_troy_oz=price,
+        observed_at=datetime(2026, 3, 13, 14, 30, tzinfo=timezone.utc),
+        provenance=MarketDataProvenanceRecord(source_type="live", provider="yahoo_finance"),
+    )
+
+
+def test_public_live_prices_serve_snapshot_without_db_writes(monkeypatch) -> None:
+    fetches = []
+    persisted = []
+
+    async def _quotes(commodities):
+        fetches.append(list(commodities))
+        return {"gold": _quote(2320.0)}
+
+    async def _persist(session, *, quotes, region, job_id=None):
+        persisted.append(region)
+
+    monkeypatch.setattr(routes.service.ingestion_service, "fetch_live_quotes", _quotes)
+    monkeypatch.setattr(routes.service.ingestion_persistence_service, "persist_live_quotes", _persist)
+    monkeypatch.setattr(snapshot_module, "get_fx_rates", lambda: {"USD": 1.0, "INR": 83.0, "EUR": 0.92})
+
+    first = client.get("/api/public/live-prices/us")
+    assert first.status_code == 200
+    assert first.headers["cache-control"].startswith("public, max-age=")
+    assert "s-maxage=" in first.headers["cache-control"]
+    assert first.headers["last-modified"] == "Fri, 13 Mar 2026 14:30:00 GMT"
+    etag = first.headers["etag"]
+
+    second = client.get("/api/public/live-prices/us", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+
+    # Every region was built by the one refresh.
+    europe = client.get("/api/public/live-prices/europe")
+    assert europe.json()["items"][0]["currency"] == "EUR"
+    assert len(fetches) == 1
+    assert persisted == []
+
+    assert client.get("/api/public/live-prices/mars").status_code == 400
+
+
+def test_live_price_snapshots_swap_only_on_quote_change(monkeypatch) -> None:
+    prices = [2320.0]
+    persisted = []
+
+    async def _quotes(commodities):
+        return {"gold": _quote(prices[-1])}
+
+    async def _persist(session, *, quotes, region, job_id=None):
+        persisted.append(region)
+
+    monkeypatch.setattr(routes.service.ingestion_service, "fetch_live_quotes", _quotes)
+    monkeypatch.setattr(routes.service.ingestion_persistence_service, "persist_live_quotes", _persist)
+    monkeypatch.setattr(snapshot_module, "get_fx_rates", lambda: {"USD": 1.0, "INR": 83.0, "EUR": 0.92})
+    snapshots = LivePriceSnapshotService(routes.service, cache_control="public", session_factory=_fake_session)
+
+    async def _run():
+        assert await snapshots.refresh() is not None
+        first = await snapshots.get("us")
+        assert await snapshots.refresh() is None
+        unchanged = await snapshots.get("us")
+        prices.append(2331.5)
+        await snapshots._persist(await snapshots.refresh())
+        changed = await snapshots.get("US")
+        return first, unchanged, changed
+
+    first, unchanged, changed = asyncio.run(_run())
+    assert unchanged.validator is first.validator
+    assert changed.validator.etag != first.validator.etag
+    assert changed.envelope.items[0].live_price == 2331.5
+    assert persisted == ["india", "us", "europe"]
+
+
+def test_live_price_snapshot_backs_off_after_refresh_failure(monkeypatch) -> None:
+    failing = [False]
+    fetches = []
+
+    async def _quotes(commodities):
+        fetches.append(failing[0])
+        if failing[0]:
+            raise RuntimeError("provider down")
+        return {"gold": _quote(2320.0)}
+
+    monkeypatch.setattr(routes.service.ingestion_service, "fetch_live_quotes", _quotes)
+    monkeypatch.setattr(snapshot_module, "get_fx_rates", lambda: {"USD": 1.0, "INR": 83.0, "EUR": 0.92})
+    snapshots = LivePriceSnapshotService(routes.service, cache_control="public", session_factory=_fake_session)
+    # Every snapshot is immediately stale, so only the backoff can prevent an inline refresh.
+    snapshots.settings = snapshots.settings.model_copy(
+        update={"public_live_prices_max_staleness_seconds": -1, "public_live_prices_failure_backoff_seconds": 3600}
+    )
+
+    async def _run():
+        first = await snapshots.get("us")
+        failing[0] = True
+        stale = await snapshots.get("us")
+        within_backoff = [await snapshots.get(region) for region in ("us", "us", "europe")]
+        calls_in_backoff = len(fetches)
+        snapshots._failed_at -= 3600
+        after_backoff = await snapshots.get("us")
+        return first, stale, within_backoff, calls_in_backoff, after_backoff
+
+    first, stale, within_backoff, calls_in_backoff, after_backoff = asyncio.run(_run())
+    assert stale is first and within_backoff[0] is first and after_backoff is first
+    # The first fetch plus one failed retry; the backoff window made no provider calls.
+    assert calls_in_backoff == 2
+    assert fetches == [False, True, True]
+
+
+def test_live_prices_etag_tracks_quote_watermark(monkeypatch) -> None:
+    prices = [2320.0]
+
+    async def _mock_live(region=None, session=None):
+        _ = region, session
+        return [_live_item(prices[-1])]
+
+    monkeypatch.setattr(routes.service, "live_prices", _mock_live)
+    etag = client.get("/api/live-prices").headers["etag"]
+    assert client.get("/api/live-prices").headers["cache-control"].startswith("private")
+
+    # Validator expired: the handler reruns and a new watermark yields a new ETag.
+    validators.clear()
+    prices.append(2331.5)
+    changed = client.get("/api/live-prices", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["items"][0]["live_price"] == 2331.5
+
+
+def test_fx_snapshot_version_is_a_digest_of_the_rates() -> None:
+    fx_cache.clear_caches()
+    try:
+        fx_cache._store_rates({"USD": 1.0, "INR": 83.0, "EUR": 0.92}, 0.0)
+        first = fx_cache.fx_snapshot_version()
+        fx_cache._store_rates({"EUR": 0.92, "INR": 83.0, "USD": 1.0}, 1.0)
+        assert fx_cache.fx_snapshot_version() == first
+        fx_cache._store_rates({"USD": 1.0, "INR": 83.1, "EUR": 0.92}, 2.0)
+        changed = fx_cache.fx_snapshot_version()
+        assert changed != first
+        # Another process that loads the same rates reports the same version.
+        fx_cache.clear_caches()
+        fx_cache._store_rates({"USD": 1.0, "INR": 83.0, "EUR": 0.92}, 3.0)
+        assert fx_cache.fx_snapshot_version() == first
+    finally:
+        fx_cache.clear_caches()
+
+
+def test_historical_conditional_get(monkeypatch) -> None:
+
+    async def _mock_hist(commodity: str, region: str, period: str, session=None, **kwargs):
+        _ = commodity, period, session, kwargs
+        start = date(2025, 1, 1)
+        return RegionalHistoricalResponse(
+            commodity="gold",
+            region=region,
+            currency="INR",
+            unit="10g_24k",
+            rows=3,
+            data=[RegionalHistoricalPoint(date=start + timedelta(days=i), close=70000 + i) for i in range(3)],
+        )
+
+    monkeypatch.setattr(routes.service, "historical", _mock_hist)
+    first = client.get("/api/historical/gold/india?range=1m")
+    assert first.status_code == 200
+    assert first.headers["last-modified"] == "Fri, 03 Jan 2025 00:00:00 GMT"
+
+    weak = client.get("/api/historical/gold/india?range=1m", headers={"If-None-Match": f'W/{first.headers["etag"]}'})
+    assert weak.status_code == 304
+    since = client.get(
+        "/api/historical/gold/india?range=1m",
+        headers={"If-Modified-Since": first.headers["last-modified"]},
+    )
+    assert since.status_code == 304
+    mismatch = client.get("/api/historical/gold/india?range=1m", headers={"If-None-Match": '"stale"'})
+    assert mismatch.status_code == 200
+
+
+def test_fast_path_body_matches_pydantic_serialization(monkeypatch) -> None:
+    payload = RegionalHistoricalResponse(
+        commodity="gold",
+        region="us",
+        currency="USD",
+        unit="oz",
+        rows=2,
+        data=[
+            RegionalHistoricalPoint(date=date(2025, 1, 1), open=1.5, high=2.0, low=1.0, close=1.75, volume=None),
+            RegionalHistoricalPoint(date=date(2025, 1, 2), close=1.8, volume=float("nan")),
+        ],
+    )
+
+    async def _mock_hist(commodity: str, region: str, period: str, session=None, **kwargs):
+        _ = commodity, region, period, session, kwargs
+        return payload
+
+    async def _mock_live(region=None, session=None):
+        _ = region, session
+        return [_live_item(2320.0)]
+
+    monkeypatch.setattr(routes.service, "historical", _mock_hist)
+    monkeypatch.setattr(routes.service, "live_prices", _mock_live)
+
+    historical = client.get("/api/historical/gold/us?range=1m")
+    assert historical.headers["content-type"] == "application/json"
+    assert historical.json() == json.loads(payload.model_dump_json())
+    assert historical.json()["data"][1]["volume"] is None
+    live = client.get("/api/live-prices")
+    assert live.json()["items"][0]["timestamp"] == "2026-03-13T14:30:00Z"
+
+
+def test_precompressed_body_served_without_rerunning_handler(monkeypatch) -> None:
+    calls = []
+
+    async def _mock_hist(commodity: str, region: str, period: str, session=None, **kwargs):
+        calls.append(period)
+        start = date(2025, 1, 1)
+        return RegionalHistoricalResponse(
+            commodity=commodity,
+            region=region,
+            currency="USD",
+            unit="oz",
+            rows=200,
+            data=[RegionalHistoricalPoint(date=start + timedelta(days=i), close=2000.0 + i) for i in range(200)],
+        )
+
+    monkeypatch.setattr(routes.service, "historical", _mock_hist)
+    identity = client.get("/api/historical/gold/us?range=1y", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+    gzipped = client.get("/api/historical/gold/us?range=1y", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in gzipped.headers["vary"]
+    assert int(gzipped.headers["content-length"]) < len(identity.content)
+    assert gzipped.json() == identity.json()
+    # A strong ETag names one byte sequence, so each coding gets its own.
+    assert gzipped.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+
+    # Either coding's tag revalidates, and the 304 confirms the one the client holds.
+    for etag in (identity.headers["etag"], gzipped.headers["etag"]):
+        revalidated = client.get(
+            "/api/historical/gold/us?range=1y", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == etag
+    assert calls == ["1y"]
+
+
+def test_negotiate_encoding() -> None:
+    assert negotiate_encoding(None) == "identity"
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") == "identity"
+    assert negotiate_encoding("*") in {"br", "gzip"}
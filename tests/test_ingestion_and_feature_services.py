@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
 import pandas as pd
@@ -554,3 +554,106 @@ def test_macro_and_news_persistence_services_are_replay_safe(tmp_path: Path) ->
         await engine.dispose()
 
     asyncio.run(_run())
+
+
+def test_ingestion_persistence_service_loads_historical_range_from_database(tmp_path: Path) -> None:
+    db_path = tmp_path / "historical_db_reads.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    persistence = IngestionPersistenceService()
+    today = datetime.now(timezone.utc).date()
+    series = NormalizedHistoricalSeries(
+        commodity="gold",
+        region="us",
+        provenance=MarketDataProvenanceRecord(source_type="historical", provider="cache"),
+        bars=[
+            NormalizedHistoricalBar(
+                date=today - timedelta(days=offset),
+                open_usd_per_troy_oz=2200.0 + offset,
+                high_usd_per_troy_oz=2210.0 + offset,
+                low_usd_per_troy_oz=2190.0 + offset,
+                close_usd_per_troy_oz=2205.0 + offset,
+                volume=1000.0,
+            )
+            for offset in range(60, -1, -1)
+        ],
+    )
+
+    async def _run() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with session_factory() as session:
+            missing = await persistence.load_historical_series(session, commodity="gold", region="us", period="1m")
+            assert missing is None
+
+            await persistence.persist_historical_series(session, series=series, period="1m")
+            loaded = await persistence.load_historical_series(
+                session,
+                commodity="gold",
+                region="us",
+                period="1m",
+                max_staleness_days=4,
+            )
+            assert loaded is not None
+            assert loaded.provenance.provider == "database"
+            assert loaded.bars[-1].date == today
+            assert loaded.bars[-1].close_usd_per_troy_oz == 2205.0
+            assert [bar.date for bar in loaded.bars] == sorted(bar.date for bar in loaded.bars)
+            assert loaded.bars[0].date >= (pd.Timestamp(today) - pd.DateOffset(months=1)).date()
+            assert len(loaded.bars) < len(series.bars)
+
+            other_period = await persistence.load_historical_series(session, commodity="gold", region="us", period="1y")
+            assert other_period is None
+
+        await engine.dispose()
+
+    asyncio.run(_run())
+
+
+def test_commodity_service_historical_serves_persisted_range_when_db_reads_enabled(tmp_path: Path) -> None:
+    db_path = tmp_path / "commodity_historical_db_reads.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    service = CommodityService()
+    service.settings = service.settings.model_copy(update={"historical_db_reads_enabled": True})
+    today = datetime.now(timezone.utc).date()
+    calls: list[str] = []
+
+    def _load(commodity: str, region: str, period: str = "1y") -> NormalizedHistoricalSeries:
+        calls.append(period)
+        return NormalizedHistoricalSeries(
+            commodity=commodity,
+            region=region,
+            provenance=MarketDataProvenanceRecord(source_type="historical", provider="cache"),
+            bars=[
+                NormalizedHistoricalBar(
+                    date=today - timedelta(days=offset),
+                    open_usd_per_troy_oz=70.0,
+                    high_usd_per_troy_oz=71.0,
+                    low_usd_per_troy_oz=69.0,
+                    close_usd_per_troy_oz=70.5 + offset,
+                    volume=1000.0,
+                )
+                for offset in (2, 1, 0)
+            ],
+        )
+
+    service.ingestion_service.load_historical_series = _load
+
+    async def _run() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with session_factory() as session:
+            first = await service.historical("crude_oil", region="us", period="1m", session=session)
+        async with session_factory() as session:
+            second = await service.historical("crude_oil", region="us", period="1m", session=session)
+
+        assert calls == ["1m"]
+        assert first.rows == second.rows == 3
+        assert [point.close for point in first.data] == [point.close for point in second.data]
+
+        await engine.dispose()
+
+    asyncio.run(_run())
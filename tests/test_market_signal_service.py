@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import date, datetime, timezone
 
 import pandas as pd
@@ -21,8 +22,6 @@ from app.schemas.responses import (
     MarketIntelligenceResponse,
     MarketSignalResponse,
     NewsHeadline,
-    RegionalHistoricalPoint,
-    RegionalHistoricalResponse,
     RegionalPredictionResponse,
 )
 from app.services.market_signal_service import MarketSignalService
@@ -45,29 +44,11 @@ def test_market_signal_service_builds_structured_bundle(monkeypatch) -> None:
             )
         ]
 
-    async def _historical(commodity: str, region: str, period: str = "1y"):
-        _ = commodity, region, period
-        return RegionalHistoricalResponse(
-            commodity="gold",
-            region="us",
-            currency="USD",
-            unit="oz",
-            rows=40,
-            data=[
-                RegionalHistoricalPoint(
-                    date=date(2026, 1, min(day, 28)),
-                    open=2200.0 + day,
-                    high=2205.0 + day,
-                    low=2195.0 + day,
-                    close=2200.0 + day,
-                    volume=1000.0 + day,
-                )
-                for day in range(1, 41)
-            ],
-        )
+    predict_inputs: dict = {}
 
-    async def _predict(session, commodity: str, region: str, horizon: int):
+    async def _predict(session, commodity: str, region: str, horizon: int, **kwargs):
         _ = session, commodity, region, horizon
+        predict_inputs.update(kwargs)
         return RegionalPredictionResponse(
             commodity="gold",
             region="us",
@@ -106,7 +87,6 @@ def test_market_signal_service_builds_structured_bundle(monkeypatch) -> None:
         )
 
     monkeypatch.setattr(service.commodity_service, "live_prices", _live_prices)
-    monkeypatch.setattr(service.commodity_service, "historical", _historical)
     monkeypatch.setattr(service.commodity_service, "predict", _predict)
     monkeypatch.setattr(
         service.commodity_service.fetcher,
@@ -140,6 +120,170 @@ def test_market_signal_service_builds_structured_bundle(monkeypatch) -> None:
     assert response.features.calendar_month == 3
     assert response.news_sentiment == "bullish"
     assert {item.data_type for item in response.provenance} >= {"live_price", "historical", "forecast", "signal"}
+    assert predict_inputs["series"] is not None and predict_inputs["features"] is not None
+    assert set(response.stage_timings_ms) >= {"live_price", "series", "features", "forecast", "news", "total"}
+
+
+def test_market_intelligence_runs_independent_stages_concurrently(monkeypatch) -> None:
+    service = MarketSignalService()
+    now = datetime.now(timezone.utc)
+
+    async def _live_prices(region: str | None = None):
+        await asyncio.sleep(0.3)
+        return [
+            LivePriceResponse(
+                commodity="gold",
+                region="us",
+                unit="oz",
+                currency="USD",
+                live_price=2350.0,
+                source="metals.live",
+                timestamp=now,
+            )
+        ]
+
+    async def _predict(session, commodity: str, region: str, horizon: int, **kwargs):
+        _ = session, commodity, region, horizon, kwargs
+        return RegionalPredictionResponse(
+            commodity="gold",
+            region="us",
+            unit="oz",
+            currency="USD",
+            forecast_horizon=date(2026, 4, 10),
+            current_spot_price=2350.0,
+            spot_timestamp=now,
+            point_forecast=2390.0,
+            forecast_vs_spot_pct=1.7,
+            confidence_interval=(2340.0, 2440.0),
+            confidence_method="spot_anchored_volatility_90",
+            scenario="base",
+            scenario_forecasts={"bull": 2460.0, "base": 2390.0, "bear": 2320.0},
+            forecast_basis_label="30D base scenario",
+            model_used="test-model",
+        )
+
+    async def _news(commodity: str, headlines=None):
+        await asyncio.sleep(0.3)
+        return CommodityNewsSummaryResponse(
+            commodity="gold", sentiment="neutral", summary="Quiet.", headlines=[], updated_at=now
+        )
+
+    monkeypatch.setattr(service.commodity_service, "live_prices", _live_prices)
+    monkeypatch.setattr(service.commodity_service, "predict", _predict)
+    monkeypatch.setattr(service.news_service, "summarize", _news)
+    monkeypatch.setattr(
+        service.commodity_service.fetcher,
+        "get_historical",
+        lambda commodity, period="1y", region="us": pd.DataFrame(
+            {
+                "Date": pd.date_range("2026-01-01", periods=40, freq="D"),
+                "Open": [2200.0 + i for i in range(40)],
+                "High": [2205.0 + i for i in range(40)],
+                "Low": [2195.0 + i for i in range(40)],
+                "Close": [2200.0 + i for i in range(40)],
+                "Volume": [1000.0] * 40,
+            }
+        ),
+    )
+
+    response = asyncio.run(service.build_market_intelligence(session=None, commodity="gold", region="us"))
+    timings = response.stage_timings_ms
+    assert timings["live_price"] >= 300 and timings["news"] >= 300
+    assert timings["total"] < timings["live_price"] + timings["news"]
+
+
+def test_market_intelligence_news_uses_its_own_session(monkeypatch) -> None:
+    service = MarketSignalService()
+    now = datetime.now(timezone.utc)
+    caller_session, news_session = object(), object()
+    used: dict[str, object] = {}
+
+    @asynccontextmanager
+    async def _session_factory():
+        yield news_session
+
+    async def _live_prices(region: str | None = None):
+        return [
+            LivePriceResponse(
+                commodity="gold",
+                region="us",
+                unit="oz",
+                currency="USD",
+                live_price=2350.0,
+                source="metals.live",
+                timestamp=now,
+            )
+        ]
+
+    materialize = service.feature_store_service.materialize_online_features_for_session
+
+    async def _features(session, **kwargs):
+        used["features"] = session
+        await asyncio.sleep(0.3)
+        return await materialize(None, **kwargs)
+
+    async def _predict(session, commodity: str, region: str, horizon: int, **kwargs):
+        _ = commodity, region, horizon, kwargs
+        used["forecast"] = session
+        return RegionalPredictionResponse(
+            commodity="gold",
+            region="us",
+            unit="oz",
+            currency="USD",
+            forecast_horizon=date(2026, 4, 10),
+            current_spot_price=2350.0,
+            spot_timestamp=now,
+            point_forecast=2390.0,
+            forecast_vs_spot_pct=1.7,
+            confidence_interval=(2340.0, 2440.0),
+            confidence_method="spot_anchored_volatility_90",
+            scenario="base",
+            scenario_forecasts={"bull": 2460.0, "base": 2390.0, "bear": 2320.0},
+            forecast_basis_label="30D base scenario",
+            model_used="test-model",
+        )
+
+    async def _headlines(session, *, commodity: str, limit: int = 6):
+        _ = commodity, limit
+        used["news"] = session
+        await asyncio.sleep(0.3)
+        return []
+
+    async def _summarize(commodity: str, headlines=None):
+        _ = headlines
+        return CommodityNewsSummaryResponse(
+            commodity=commodity, sentiment="neutral", summary="Quiet.", headlines=[], updated_at=now
+        )
+
+    monkeypatch.setattr(service, "session_factory", _session_factory)
+    monkeypatch.setattr(service.commodity_service, "live_prices", _live_prices)
+    monkeypatch.setattr(service.commodity_service, "predict", _predict)
+    monkeypatch.setattr(service.feature_store_service, "materialize_online_features_for_session", _features)
+    monkeypatch.setattr(service.news_persistence_service, "get_or_ingest_recent_headlines", _headlines)
+    monkeypatch.setattr(service.news_service, "summarize", _summarize)
+    monkeypatch.setattr(
+        service.commodity_service.fetcher,
+        "get_historical",
+        lambda commodity, period="1y", region="us": pd.DataFrame(
+            {
+                "Date": pd.date_range("2026-01-01", periods=40, freq="D"),
+                "Open": [2200.0 + i for i in range(40)],
+                "High": [2205.0 + i for i in range(40)],
+                "Low": [2195.0 + i for i in range(40)],
+                "Close": [2200.0 + i for i in range(40)],
+                "Volume": [1000.0] * 40,
+            }
+        ),
+    )
+
+    response = asyncio.run(
+        service.build_market_intelligence(session=caller_session, commodity="gold", region="us")
+    )
+    assert used == {"features": caller_session, "forecast": caller_session, "news": news_session}
+    # Features and news no longer take turns on one session.
+    timings = response.stage_timings_ms
+    assert timings["features"] >= 300 and timings["news"] >= 300
+    assert timings["total"] < timings["features"] + timings["news"]
 
 
 def test_market_intelligence_endpoint(monkeypatch) -> None:
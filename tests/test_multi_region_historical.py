@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, timedelta
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.schemas.market_data import MarketDataProvenanceRecord, NormalizedHistoricalBar, NormalizedHistoricalSeries
+from app.services import commodity_service as commodity_service_module
+from app.services.commodity_service import CommodityService
+
+client = TestClient(app)
+FX = {"USD": 1.0, "INR": 83.0, "EUR": 0.92}
+
+
+def _series(rows: int) -> NormalizedHistoricalSeries:
+    start = date(2024, 1, 1)
+    return NormalizedHistoricalSeries(
+        commodity="gold",
+        region="us",
+        provenance=MarketDataProvenanceRecord(source_type="historical", provider="cache"),
+        bars=[
+            NormalizedHistoricalBar(
+                date=start + timedelta(days=i),
+                open_usd_per_troy_oz=2000.0 + i,
+                high_usd_per_troy_oz=2010.0 + i,
+                low_usd_per_troy_oz=1990.0 + i,
+                close_usd_per_troy_oz=2005.0 + (i % 17),
+                volume=100.0,
+            )
+            for i in range(rows)
+        ],
+    )
+
+
+def _fx_histories() -> dict[str, pd.Series]:
+    return {
+        "india": pd.Series([84.0, 85.0], index=pd.to_datetime(["2024-01-02", "2024-01-20"])),
+        "europe": pd.Series([0.9, 0.95], index=pd.to_datetime(["2024-01-05", "2024-01-10"])),
+    }
+
+
+def _patch_service(monkeypatch, service: CommodityService, series: NormalizedHistoricalSeries) -> list[str]:
+    loads: list[str] = []
+
+    async def _load(commodity, region, period="1y", session=None):
+        _ = commodity, period, session
+        loads.append(region)
+        return series.model_copy(update={"region": region})
+
+    histories = _fx_histories()
+    monkeypatch.setattr(service, "historical_series", _load)
+    monkeypatch.setattr(service.fetcher, "get_fx_history", lambda region, period="1y": histories.get(region, pd.Series(dtype=float)))
+    monkeypatch.setattr(commodity_service_module, "get_fx_rates", lambda: FX)
+    return loads
+
+
+def test_multi_region_matches_single_region_responses(monkeypatch) -> None:
+    service = CommodityService()
+    series = _series(40)
+    loads = _patch_service(monkeypatch, service, series)
+
+    combined = asyncio.run(service.historical_regions("gold", regions=["india", "US", "europe", "india"], period="1m"))
+
+    assert combined.regions == ["india", "us", "europe"]
+    assert loads == ["us"]
+    for region in combined.regions:
+        single = asyncio.run(service.historical("gold", region=region, period="1m"))
+        assert combined.series[region].data == single.data
+        assert combined.series[region].currency == single.currency
+
+
+def test_multi_region_downsampling_shares_dates(monkeypatch) -> None:
+    service = CommodityService()
+    _patch_service(monkeypatch, service, _series(400))
+
+    combined = asyncio.run(
+        service.historical_regions("gold", regions=["india", "europe"], period="1y", points=50, format="columnar")
+    )
+
+    assert combined.rows == 50
+    assert combined.source_rows == 400
+    assert combined.series["india"].columns.date == combined.series["europe"].columns.date
+    assert combined.series["europe"].downsample == "lttb"
+
+
+def test_multi_region_route(monkeypatch) -> None:
+    _patch_service(monkeypatch, routes.service, _series(10))
+
+    response = client.get("/api/historical/gold?regions=india,us&range=1m")
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body["series"]) == {"india", "us"}
+    assert body["series"]["us"]["unit"] == "oz"
+    assert response.headers["etag"]
+
+    invalid = client.get("/api/historical/gold?regions=india,mars&range=1m")
+    assert invalid.status_code == 400
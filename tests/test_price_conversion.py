@@ -1,12 +1,18 @@
 """Tests for price conversion utilities."""
 from __future__ import annotations
 
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
 import pytest
+from app.schemas.market_data import MarketDataProvenanceRecord, NormalizedHistoricalBar, NormalizedHistoricalSeries
 from app.services.price_conversion import (
     FALLBACK_FX,
     TROY_OZ_TO_GRAMS,
     all_regions_price,
     convert_price,
+    convert_prices,
     format_price,
     grams_to_10g,
     grams_to_troy_oz,
@@ -79,6 +85,27 @@ class TestConvertPrice:
             convert_price(65.0, "mars", MOCK_FX)
 
 
+class TestConvertPrices:
+    @pytest.mark.parametrize("region", ["india", "us", "europe"])
+    def test_matches_scalar_conversion_exactly(self, region: str) -> None:
+        prices = np.array([12.5, 65.0, 74.123456, 0.0031])
+        rate = MOCK_FX.get({"india": "INR", "europe": "EUR"}.get(region, "USD"))
+        result = convert_prices(prices, region, rate)
+        assert result.tolist() == [convert_price(float(p), region, MOCK_FX) for p in prices]
+
+    def test_per_row_rates_broadcast_over_ohlc_columns(self) -> None:
+        ohlc = np.array([[60.0, 61.0, 59.0, 60.5], [62.0, 63.0, 61.0, 62.5]])
+        rates = np.array([83.0, 84.0])
+        result = convert_prices(ohlc, "india", rates[:, None])
+        assert result[1, 3] == convert_price(62.5, "india", {"INR": 84.0})
+        assert result[0, 0] == convert_price(60.0, "india", {"INR": 83.0})
+
+    def test_fallback_and_unknown_region(self) -> None:
+        assert convert_prices(np.array([65.0]), "europe")[0] == convert_price(65.0, "europe", None)
+        with pytest.raises(ValueError, match="Unknown region"):
+            convert_prices(np.array([65.0]), "mars", 1.0)
+
+
 class TestFormatPrice:
     def test_format_price_india(self) -> None:
         """India format: ₹ symbol, /10g_24k unit."""
@@ -135,3 +162,39 @@ class TestServiceRegionalConversion:
         assert india_price == pytest.approx(expected_india)
         assert us_price == pytest.approx(expected_us)
         assert europe_price == pytest.approx(expected_europe)
+
+    def test_historical_response_aligns_fx_history_per_bar(self) -> None:
+        service = CommodityService()
+        start = date(2026, 1, 1)
+        series = NormalizedHistoricalSeries(
+            commodity="gold",
+            region="india",
+            provenance=MarketDataProvenanceRecord(source_type="historical", provider="test"),
+            bars=[
+                NormalizedHistoricalBar(
+                    date=start + timedelta(days=i),
+                    open_usd_per_troy_oz=2000.0 + i,
+                    high_usd_per_troy_oz=2010.0 + i,
+                    low_usd_per_troy_oz=1990.0 + i,
+                    close_usd_per_troy_oz=2005.0 + i,
+                )
+                for i in range(4)
+            ],
+        )
+        # No fix for Jan 1 (spot), Jan 3 carries Jan 2 forward, Jan 4 has its own fix.
+        fx_history = pd.Series(
+            [85.0, 86.0],
+            index=pd.to_datetime(["2026-01-02", "2026-01-04"]),
+        )
+
+        response = service.normalization_service.to_historical_response(
+            series=series,
+            fx_rates=MOCK_FX,
+            fx_history=fx_history,
+        )
+
+        expected_rates = [MOCK_FX["INR"], 85.0, 85.0, 86.0]
+        for point, bar, rate in zip(response.data, series.bars, expected_rates):
+            fx = {**MOCK_FX, "INR": rate}
+            assert point.close == round(service._to_regional_price(bar.close_usd_per_troy_oz, "india", fx), 4)
+            assert point.low == round(service._to_regional_price(bar.low_usd_per_troy_oz, "india", fx), 4)
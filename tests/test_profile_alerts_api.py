@@ -84,31 +84,29 @@ def test_alert_patch_and_history_export(monkeypatch) -> None:
 
     async def _mock_history(session, user_sub: str, **kwargs):
         _ = session, user_sub, kwargs
-        return [
-            AlertHistoryResponse(
-                id=1,
-                alert_id=2,
-                commodity="gold",
-                region="us",
-                currency="USD",
-                alert_type="above",
-                threshold=2000.0,
-                observed_value=2100.0,
-                message="Gold above alert triggered",
-                email_status="sent",
-                delivery_provider="resend",
-                delivery_error=None,
-                delivery_attempts=1,
-                triggered_at=datetime.now(timezone.utc),
-            )
-        ]
+        yield AlertHistoryResponse(
+            id=1,
+            alert_id=2,
+            commodity="gold",
+            region="us",
+            currency="USD",
+            alert_type="above",
+            threshold=2000.0,
+            observed_value=2100.0,
+            message="Gold above alert triggered",
+            email_status="sent",
+            delivery_provider="resend",
+            delivery_error=None,
+            delivery_attempts=1,
+            triggered_at=datetime.now(timezone.utc),
+        )
 
     async def _mock_eval(session, user_sub: str, user_email: str | None):
         _ = session, user_sub, user_email
         return AlertEvaluationResponse(checked=1, triggered=0, events=[])
 
     monkeypatch.setattr(routes.alert_service, "update_alert", _mock_patch)
-    monkeypatch.setattr(routes.alert_service, "alert_history", _mock_history)
+    monkeypatch.setattr(routes.alert_service, "stream_alert_history", _mock_history)
     monkeypatch.setattr(routes.alert_service, "evaluate_user_alerts", _mock_eval)
 
     patch_res = client.patch("/api/alerts/99", json={"enabled": False})
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.base import Base
+from app.db.query_plans import find_full_scans, full_scan_steps
+from app.db.schema_guard import ensure_hot_path_indexes, ensure_ingestion_schema
+from app.models import alert_history, chat_history, normalized_market_record, training_job, training_run  # noqa: F401
+
+
+async def _seed(conn) -> None:
+    start = datetime(2025, 1, 1)
+    await conn.execute(
+        text(
+            "INSERT INTO normalized_market_records "
+            "(record_type, commodity, region, period, observed_at, close_usd_per_troy_oz, "
+            "provenance_provider, validation_status, ingested_at) "
+            "VALUES (:record_type, :commodity, :region, :period, :observed_at, 1.0, 'seed', 'valid', :observed_at)"
+        ),
+        [
+            {
+                "record_type": record_type,
+                "commodity": commodity,
+                "region": region,
+                "period": "1y" if record_type == "historical" else None,
+                "observed_at": start + timedelta(days=day),
+            }
+            for record_type in ("historical", "live")
+            for commodity in ("gold", "silver", "crude_oil")
+            for region in ("india", "us", "europe")
+            for day in range(120)
+        ],
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO alert_history "
+            "(alert_id, user_sub, commodity, region, currency, alert_type, threshold, observed_value, "
+            "message, email_status, delivery_attempts, triggered_at) "
+            "VALUES (1, :user_sub, 'gold', 'us', 'USD', 'above', 1.0, 2.0, 'seed', 'sent', 1, :triggered_at)"
+        ),
+        [
+            {"user_sub": f"user-{user}", "triggered_at": start + timedelta(hours=i)}
+            for user in range(20)
+            for i in range(50)
+        ],
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO chat_history (user_id, message, response, created_at) "
+            "VALUES (:user_id, 'q', 'a', :created_at)"
+        ),
+        [
+            {"user_id": f"user-{user}", "created_at": start + timedelta(minutes=i)}
+            for user in range(20)
+            for i in range(50)
+        ],
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO training_runs "
+            "(commodity, region, model_name, model_version, rmse, mape, artifact_path, trained_at) "
+            "VALUES (:commodity, :region, 'xgb', :version, 1.0, 1.0, 'a.joblib', :trained_at)"
+        ),
+        [
+            {
+                "commodity": commodity,
+                "region": region,
+                "version": f"{commodity}_{region}_{i}",
+                "trained_at": start + timedelta(days=i),
+            }
+            for commodity in ("gold", "silver", "crude_oil")
+            for region in ("india", "us", "europe")
+            for i in range(30)
+        ],
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO training_jobs (commodity, region, horizon, status, created_at, updated_at) "
+            "VALUES (:commodity, :region, 1, 'completed', :created_at, :created_at)"
+        ),
+        [
+            {"commodity": commodity, "region": region, "created_at": start + timedelta(days=i)}
+            for commodity in ("gold", "silver", "crude_oil")
+            for region in ("india", "us", "europe")
+            for i in range(30)
+        ],
+    )
+
+
+def test_hot_queries_use_index_seeks_on_seeded_data(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'query_plans.db'}")
+
+    async def _run() -> dict[str, list[str]]:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await ensure_ingestion_schema(conn)
+            await ensure_hot_path_indexes(conn)
+            await _seed(conn)
+            await conn.execute(text("ANALYZE"))
+            return await find_full_scans(conn)
+
+    assert asyncio.run(_run()) == {}
+
+
+def test_hot_path_indexes_repair_tables_created_without_them(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'query_plans_legacy.db'}")
+
+    async def _run() -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            for name in (
+                "idx_normalized_market_records_lookup",
+                "idx_alert_history_user_triggered_id",
+                "idx_chat_history_user_created_id",
+                "idx_training_runs_lookup",
+                "idx_training_jobs_lookup",
+            ):
+                await conn.execute(text(f"DROP INDEX {name}"))
+            await _seed(conn)
+            await conn.execute(text("ANALYZE"))
+            before = await find_full_scans(conn)
+            await ensure_hot_path_indexes(conn)
+            await conn.execute(text("ANALYZE"))
+            return before, await find_full_scans(conn)
+
+    before, after = asyncio.run(_run())
+    assert before
+    assert after == {}
+
+
+def test_full_scan_steps_flags_sequential_scans_and_sorts() -> None:
+    assert full_scan_steps("sqlite", ["SCAN alert_history"]) == ["SCAN alert_history"]
+    assert full_scan_steps("sqlite", ["USE TEMP B-TREE FOR ORDER BY"]) == ["USE TEMP B-TREE FOR ORDER BY"]
+    assert full_scan_steps("sqlite", ["SEARCH alert_history USING INDEX idx_alert_history_user_triggered (user_sub=?)"]) == []
+    assert full_scan_steps("postgresql", ["Seq Scan on alert_history  (cost=0.00..1.00 rows=1 width=8)"])
+    assert full_scan_steps("postgresql", ["Index Scan using idx_alert_history_user_triggered on alert_history"]) == []
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api import routes
+from app.db.base import Base
+from app.models.notification_outbox import NotificationOutbox
+from app.models.price_alert import PriceAlert
+from app.schemas.market_data import MarketDataProvenanceRecord, NormalizedLiveQuote
+from app.services import live_price_snapshot_service as snapshot_module
+from app.services.live_price_snapshot_service import LivePriceSnapshotService
+from app.services.market_quote_service import MarketQuote
+from app.services.quote_events import QuoteEventBus
+from app.workers import whatsapp_alert_worker as worker_module
+from app.workers.whatsapp_alert_worker import WhatsAppAlertWorker
+
+
+def _quote(price: float, commodity: str = "gold", region: str = "us") -> MarketQuote:
+    return MarketQuote(commodity, region, "USD", "oz", price, 0.5, datetime.now(timezone.utc), "unit-test")
+
+
+def _live(commodity: str, price: float, change: float | None = 0.8, fallback_level: int = 0) -> NormalizedLiveQuote:
+    return NormalizedLiveQuote(
+        commodity=commodity,
+        price_usd_per_troy_oz=price,
+        daily_change_pct=change,
+        observed_at=datetime(2026, 3, 13, 14, 30, tzinfo=timezone.utc),
+        provenance=MarketDataProvenanceRecord(
+            source_type="live", provider="yahoo_finance", fallback_level=fallback_level
+        ),
+    )
+
+
+def test_subscription_keeps_latest_quote_per_market() -> None:
+    async def _run():
+        bus = QuoteEventBus()
+        subscription = bus.subscribe()
+        bus.publish([_quote(2000.0), _quote(30.0, commodity="silver")])
+        bus.publish([_quote(2010.0)])
+        first = await subscription.get()
+        subscription.close()
+        bus.publish([_quote(2020.0)])
+        return first, subscription._pending
+
+    first, after_close = asyncio.run(_run())
+    assert first[("gold", "us")].price == 2010.0
+    assert first[("silver", "us")].price == 30.0
+    assert after_close == {}
+
+
+def test_snapshot_refresh_publishes_metal_ticks_on_change(monkeypatch) -> None:
+    prices = [2320.0]
+
+    async def _quotes(commodities):
+        return {
+            # The second price comes from a provider without a daily change figure.
+            "gold": _live("gold", prices[-1], change=0.8 if len(prices) == 1 else None),
+            "crude_oil": _live("crude_oil", 80.0),
+            # A placeholder price must never reach the alert worker.
+            "silver": _live("silver", 24.0, fallback_level=3),
+        }
+
+    @asynccontextmanager
+    async def _fake_session():
+        yield None
+
+    monkeypatch.setattr(routes.service.ingestion_service, "fetch_live_quotes", _quotes)
+    monkeypatch.setattr(snapshot_module, "get_fx_rates", lambda: {"USD": 1.0, "INR": 83.0, "EUR": 0.92})
+    bus = QuoteEventBus()
+    snapshots = LivePriceSnapshotService(
+        routes.service, cache_control="public", session_factory=_fake_session, events=bus
+    )
+
+    async def _run():
+        subscription = bus.subscribe()
+        await snapshots.refresh()
+        first = await subscription.get()
+        await snapshots.refresh()
+        unchanged = dict(subscription._pending)
+        prices.append(2331.5)
+        await snapshots.refresh()
+        return first, unchanged, await subscription.get()
+
+    first, unchanged, changed = asyncio.run(_run())
+    # Crude's public price is not in the alert quote's units, so it stays on the poll;
+    # silver came from the placeholder provider.
+    assert set(first) == {("gold", "india"), ("gold", "us"), ("gold", "europe")}
+    assert first[("gold", "us")].price == 2320.0
+    assert first[("gold", "us")].daily_change_pct == 0.8
+    assert unchanged == {}
+    assert changed[("gold", "us")].price == 2331.5
+    assert changed[("gold", "us")].daily_change_pct is None
+
+
+def test_worker_fires_on_tick_without_fetching_quotes(tmp_path, monkeypatch) -> None:
+    async def _run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ticks.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(worker_module, "AsyncSessionLocal", Session)
+        async with Session() as session:
+            session.add(
+                PriceAlert(
+                    user_sub="u1",
+                    user_id="u1",
+                    commodity="gold",
+                    region="us",
+                    currency="USD",
+                    unit="oz",
+                    alert_type="above",
+                    direction="above",
+                    threshold=2100.0,
+                    target_price=2100.0,
+                    whatsapp_number="+15550000001",
+                )
+            )
+            await session.commit()
+
+        fetched: list[tuple[str, str]] = []
+
+        def _fetch(commodity, regions):
+            fetched.extend((commodity, region) for region in regions)
+            return {region: _quote(2000.0, commodity, region) for region in regions}
+
+        async def _allow(key, limit, window_seconds):
+            _ = key, limit, window_seconds
+            return True
+
+        bus = QuoteEventBus()
+        worker = WhatsAppAlertWorker(events=bus)
+        monkeypatch.setattr(worker.market, "fetch_commodity_quotes", _fetch)
+        monkeypatch.setattr(worker.rate_limiter, "allow", _allow)
+        try:
+            below_target = await worker.process_pending_alerts()
+            worker.start()
+            bus.publish([_quote(2105.0)])
+            for _ in range(100):
+                async with Session() as session:
+                    if (await session.execute(select(NotificationOutbox))).scalars().first():
+                        break
+                await asyncio.sleep(0.01)
+            # The market ticked within the poll interval, so the poll skips its fetch.
+            after_tick = await worker.process_pending_alerts()
+            await worker.stop()
+            async with Session() as session:
+                alert = (await session.execute(select(PriceAlert))).scalars().one()
+                queued = (await session.execute(select(NotificationOutbox))).scalars().all()
+            return below_target, after_tick, fetched, alert, queued
+        finally:
+            await engine.dispose()
+
+    below_target, after_tick, fetched, alert, queued = asyncio.run(_run())
+    assert below_target == 0 and after_tick == 0
+    assert fetched == [("gold", "us")]
+    assert alert.is_triggered is True
+    assert len(queued) == 1 and queued[0].channel == "whatsapp"
+
+
+def test_ticks_without_daily_change_leave_change_rules_to_the_poll(tmp_path, monkeypatch) -> None:
+    async def _run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ticks.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(worker_module, "AsyncSessionLocal", Session)
+        async with Session() as session:
+            for alert_type, threshold in (("spike", 2.0), ("above", 2100.0)):
+                session.add(
+                    PriceAlert(
+                        user_sub="u1",
+                        user_id="u1",
+                        commodity="gold",
+                        region="us",
+                        currency="USD",
+                        unit="oz",
+                        alert_type=alert_type,
+                        threshold=threshold,
+                        enabled=True,
+                        is_active=True,
+                        email_notifications_enabled=False,
+                    )
+                )
+            await session.commit()
+
+        polled: list[MarketQuote] = []
+
+        def _fetch(commodity, regions):
+            quotes = {}
+            for region in regions:
+                # Above the price threshold too: only the change rules may use this quote.
+                quotes[region] = MarketQuote(commodity, region, "USD", "oz", 2500.0, 3.0, datetime.now(timezone.utc), "poll")
+                polled.append(quotes[region])
+            return quotes
+
+        worker = WhatsAppAlertWorker(events=QuoteEventBus())
+        monkeypatch.setattr(worker.market, "fetch_commodity_quotes", _fetch)
+        try:
+            await worker.leases.acquire()
+            tick = MarketQuote("gold", "us", "USD", "oz", 2000.0, None, datetime.now(timezone.utc), "tick")
+            on_tick = await worker.process_tick({("gold", "us"): tick})
+            on_poll = await worker.process_pending_alerts()
+            async with Session() as session:
+                fired = (await session.execute(select(PriceAlert).where(PriceAlert.last_triggered_at.is_not(None)))).scalars().all()
+            return on_tick, on_poll, len(polled), [alert.alert_type for alert in fired]
+        finally:
+            await engine.dispose()
+
+    on_tick, on_poll, polled, fired = asyncio.run(_run())
+    assert (on_tick, on_poll, polled) == (0, 1, 1)
+    assert fired == ["spike"]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.services import rate_limiter as limiter_module
+from app.services.rate_limiter import LocalTokenBuckets, RedisRateLimiter
+
+
+def test_local_buckets_admit_a_burst_then_refill_at_the_steady_rate(monkeypatch) -> None:
+    clock = [100.0]
+    monkeypatch.setattr(limiter_module.time, "monotonic", lambda: clock[0])
+    buckets = LocalTokenBuckets(max_keys=2)
+
+    burst = [buckets.allow("k", 3, 60) for _ in range(4)]
+    clock[0] += 20  # one token per 20s at 3 per minute
+    refilled = [buckets.allow("k", 3, 60) for _ in range(2)]
+    buckets.allow("a", 1, 60)
+    buckets.allow("b", 1, 60)  # evicts "k", the least recently used key
+
+    assert burst == [True, True, True, False]
+    assert refilled == [True, False]
+    assert "k" not in buckets._buckets
+
+
+def test_limiter_uses_one_script_call_and_falls_back_to_local_buckets(monkeypatch) -> None:
+    clock = [100.0]
+    monkeypatch.setattr(limiter_module.time, "monotonic", lambda: clock[0])
+    calls: list[tuple[list[str], list[int]]] = []
+    redis_up = [True]
+
+    async def _script(keys, args):
+        calls.append((keys, args))
+        if not redis_up[0]:
+            raise ConnectionError("connection refused")
+        return 1
+
+    limiter = RedisRateLimiter()
+    limiter._available = True
+    limiter._script = _script
+
+    async def _run():
+        up = await limiter.allow("chat:u1", 40, 60)
+        redis_up[0] = False
+        # The first failure switches to the local buckets; Redis is not retried until the backoff ends.
+        down = [await limiter.allow("chat:u1", 2, 60) for _ in range(3)]
+        calls_while_down = len(calls)
+        redis_up[0] = True
+        clock[0] += limiter_module.REDIS_RETRY_SECONDS
+        recovered = await limiter.allow("chat:u1", 2, 60)
+        return up, down, calls_while_down, recovered
+
+    up, down, calls_while_down, recovered = asyncio.run(_run())
+    assert up is True
+    assert calls[0] == (["chat:u1"], [1_500_000, 60_000_000])
+    assert down == [True, True, False]
+    assert calls_while_down == 2
+    assert recovered is True and len(calls) == 3
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from app.core.request_memo import memoized_each, request_memoized, request_scope
+from app.services.ingestion_service import MarketIngestionService
+from ml.data.data_fetcher import MarketDataFetcher
+
+
+class _Lookups:
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    @request_memoized("test_sync")
+    def rates(self, currency: str, symbols: list[str] | None = None) -> dict:
+        self.calls.append(("rates", currency, tuple(symbols or ())))
+        return {"currency": currency}
+
+    @request_memoized("test_async")
+    async def metrics(self, session, commodity: str) -> str:
+        self.calls.append(("metrics", commodity))
+        await asyncio.sleep(0.01)
+        return f"{commodity}-metrics"
+
+
+def test_sync_lookups_run_once_per_scope_and_bypass_outside() -> None:
+    lookups = _Lookups()
+    lookups.rates("EUR")
+    lookups.rates("EUR")
+    assert len(lookups.calls) == 2
+
+    with request_scope():
+        first = lookups.rates("EUR", symbols=["USD"])
+        second = lookups.rates(currency="EUR", symbols=["USD"])
+        lookups.rates("INR")
+    assert first is second
+    assert lookups.calls[2:] == [("rates", "EUR", ("USD",)), ("rates", "INR", ())]
+
+    with request_scope():
+        lookups.rates("EUR", symbols=["USD"])
+    assert len(lookups.calls) == 5
+
+
+def test_async_lookups_share_in_flight_work_and_ignore_session() -> None:
+    lookups = _Lookups()
+
+    async def _run():
+        with request_scope():
+            return await asyncio.gather(
+                lookups.metrics(object(), "gold"),
+                lookups.metrics(object(), commodity="gold"),
+                lookups.metrics(None, "silver"),
+            )
+
+    assert asyncio.run(_run()) == ["gold-metrics", "gold-metrics", "silver-metrics"]
+    assert lookups.calls == [("metrics", "gold"), ("metrics", "silver")]
+
+
+def test_failures_are_not_memoized() -> None:
+    attempts: list[list[str]] = []
+
+    async def _fetch(items):
+        attempts.append(items)
+        if len(attempts) == 1:
+            raise RuntimeError("provider down")
+        return {item: item.upper() for item in items if item != "copper"}
+
+    async def _run():
+        with request_scope():
+            with pytest.raises(RuntimeError):
+                await memoized_each("quotes", ["gold", "silver"], _fetch)
+            first = await memoized_each("quotes", ["gold", "silver", "copper"], _fetch)
+            second = await memoized_each("quotes", ["silver", "copper"], _fetch)
+            return first, second
+
+    first, second = asyncio.run(_run())
+    assert first == {"gold": "GOLD", "silver": "SILVER"}
+    assert second == {"silver": "SILVER"}
+    assert attempts == [["gold", "silver"], ["gold", "silver", "copper"]]
+
+
+def test_live_quotes_and_series_are_memoized_within_a_request(monkeypatch, tmp_path) -> None:
+    service = MarketIngestionService(fetcher=MarketDataFetcher(cache_dir=str(tmp_path)))
+    loads: list[str] = []
+    fetched: list[list[str]] = []
+
+    def _historical(commodity, period="1y", region="us"):
+        loads.append(commodity)
+        return pd.DataFrame(
+            {
+                "Date": pd.date_range("2026-01-01", periods=3, freq="D"),
+                "Open": [1.0, 2.0, 3.0],
+                "High": [1.0, 2.0, 3.0],
+                "Low": [1.0, 2.0, 3.0],
+                "Close": [1.0, 2.0, 3.0],
+                "Volume": [10.0, 10.0, 10.0],
+            }
+        )
+
+    async def _fetch(commodities):
+        fetched.append(list(commodities))
+        return {}
+
+    monkeypatch.setattr(service.fetcher, "get_historical", _historical)
+    monkeypatch.setattr(service, "_fetch_live_quotes", _fetch)
+
+    async def _run():
+        with request_scope():
+            await service.fetch_live_quotes(["gold", "silver", "crude_oil"])
+            await service.fetch_live_quotes(["gold"])
+            first = service.load_historical_series("gold", region="us")
+            second = service.load_historical_series(commodity="gold", region="us", period="1y")
+            assert first is second
+
+    asyncio.run(_run())
+    assert fetched == [["gold", "silver", "crude_oil"]]
+    assert loads == ["gold"]
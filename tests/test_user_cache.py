@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import user_profile, user_settings  # noqa: F401
+from app.schemas.responses import UserProfileUpdateRequest, UserSettingsUpdateRequest
+from app.services.alert_service import AlertService
+from app.services.profile_service import ProfileService
+from app.services.settings_service import SettingsService
+from app.services.user_cache import UserRowCache
+
+
+async def _sessionmaker():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+def test_settings_are_served_from_cache_and_refreshed_on_update() -> None:
+    async def _run():
+        engine, Session = await _sessionmaker()
+        reader, writer = SettingsService(), SettingsService()
+        async with Session() as session:
+            created = await reader.get_or_create(session, "u1")
+            # A second read needs no DB session at all.
+            cached = await reader.get_or_create(None, "u1")
+            updated = await writer.update(session, "u1", UserSettingsUpdateRequest(prediction_horizon=7))
+        after_write = await reader.get_or_create(None, "u1")
+        await engine.dispose()
+        return created, cached, updated, after_write
+
+    created, cached, updated, after_write = asyncio.run(_run())
+    assert cached is created
+    assert updated.prediction_horizon == 7
+    assert after_write.prediction_horizon == 7
+
+
+def test_profile_cache_skips_db_until_claims_change_or_update() -> None:
+    async def _run():
+        engine, Session = await _sessionmaker()
+        profiles = ProfileService()
+        alerts = AlertService()
+        async with Session() as session:
+            await profiles.get_or_create(session, "u2", user_email="a@example.com", user_name="A")
+            cached = await profiles.get_or_create(None, "u2", user_email="a@example.com", user_name="A")
+            renamed = await profiles.get_or_create(session, "u2", user_email="a@example.com", user_name="B")
+            await profiles.update(session, "u2", UserProfileUpdateRequest(alert_cooldown_minutes=45))
+        alert_defaults = await alerts._profile(None, "u2")
+        await engine.dispose()
+        return cached, renamed, alert_defaults
+
+    cached, renamed, alert_defaults = asyncio.run(_run())
+    assert cached.name == "A"
+    assert renamed.name == "B"
+    assert alert_defaults.alert_cooldown_minutes == 45
+
+
+def test_user_row_cache_expires_and_bounds_entries(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("app.services.user_cache.time.monotonic", lambda: now[0])
+    cache: UserRowCache[str] = UserRowCache(ttl_seconds=10, max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    now[0] += 11
+    assert cache.get("a") is None
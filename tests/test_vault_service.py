@@ -1,39 +1,77 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import subprocess
 
 from app.services.vault_service import VaultService
 
 
-def test_infisical_service_caches_and_force_refresh(monkeypatch):
-    calls: list[list[str]] = []
-
-    def fake_run(cmd, env, check, capture_output, text):
-        calls.append(cmd)
-        if cmd[1] == "secrets" and cmd[2] == "get":
-            key = cmd[3]
-            if key == "OPENROUTER_API_KEY":
-                return subprocess.CompletedProcess(cmd, 0, "k1\n", "")
-            return subprocess.CompletedProcess(cmd, 1, "", "secret not found")
-        raise AssertionError(f"unexpected command: {cmd}")
-
+def _enable(monkeypatch, fake_run) -> None:
     monkeypatch.setattr("app.services.vault_service.shutil.which", lambda _: "/usr/local/bin/infisical")
     monkeypatch.setattr("app.services.vault_service.subprocess.run", fake_run)
-    monkeypatch.setattr(VaultService, "_start_background_loops", lambda self: None)
     monkeypatch.setenv("INFISICAL_PROJECT_ID", "p1")
     monkeypatch.setenv("INFISICAL_ENV", "dev")
     monkeypatch.setenv("INFISICAL_TOKEN", "tok")
 
+
+def test_infisical_service_exports_snapshot_once_and_reads_without_cli(monkeypatch):
+    calls: list[list[str]] = []
+
+    def fake_run(cmd, env, check, capture_output, text):
+        calls.append(cmd)
+        assert cmd[1] == "export", f"unexpected command: {cmd}"
+        path = cmd[cmd.index("--path") + 1]
+        if path == "/ai":
+            payload = [{"key": "OPENROUTER_API_KEY", "value": "k1"}, {"key": "UNRELATED", "value": "x"}]
+            return subprocess.CompletedProcess(cmd, 0, json.dumps(payload), "")
+        return subprocess.CompletedProcess(cmd, 0, "[]", "")
+
+    _enable(monkeypatch, fake_run)
     service = VaultService()
+    assert [cmd[cmd.index("--path") + 1] for cmd in calls] == ["/ai", "/database", "/email", "/auth"]
 
     first = service.get_secret("ai")
-    second = service.get_secret("ai")
-    refreshed = service.get_secret("ai", force_refresh=True)
+    value = service.get_value(path="ai", key="OPENROUTER_API_KEY")
+    assert first == {"OPENROUTER_API_KEY": "k1"}
+    assert value == "k1"
+    assert len(calls) == 4
 
-    assert first["OPENROUTER_API_KEY"] == "k1"
-    assert second["OPENROUTER_API_KEY"] == "k1"
+    refreshed = service.get_secret("/ai", force_refresh=True)
     assert refreshed["OPENROUTER_API_KEY"] == "k1"
-    assert sum(1 for c in calls if len(c) > 3 and c[1:4] == ["secrets", "get", "OPENROUTER_API_KEY"]) == 2
+    assert len(calls) == 5
+
+
+def test_infisical_async_refresh_swaps_snapshot_and_keeps_failed_paths(monkeypatch):
+    values = {"ai": "k1", "auth": "jwt-1"}
+
+    def fake_run(cmd, env, check, capture_output, text):
+        return subprocess.CompletedProcess(cmd, 0, "[]", "")
+
+    _enable(monkeypatch, fake_run)
+    service = VaultService()
+    service.max_retries = 1
+    service.retry_backoff_seconds = 0
+    monkeypatch.setattr(service, "_try_recover_auth", lambda: True)
+
+    async def fake_cli(args, token):
+        path = args[args.index("--path") + 1].strip("/")
+        if path == "email":
+            raise RuntimeError("infisical cli failed: 1 (timeout)")
+        key = {"ai": "OPENROUTER_API_KEY", "auth": "JWT_SECRET"}.get(path)
+        return json.dumps({key: values[path]} if key else {})
+
+    monkeypatch.setattr(service, "_run_cli_async", fake_cli)
+    service._swap({"email": {"RESEND_API_KEY": "old"}})
+    before = service.snapshot
+
+    assert asyncio.run(service.refresh_snapshot()) == 3
+    after = service.snapshot
+    assert after is not before
+    assert before.data["ai"] == {}
+    assert after.data["ai"]["OPENROUTER_API_KEY"] == "k1"
+    assert after.data["auth"]["JWT_SECRET"] == "jwt-1"
+    assert after.data["email"]["RESEND_API_KEY"] == "old"
 
 
 def test_infisical_service_reauth_on_renew(monkeypatch):
@@ -43,11 +81,12 @@ def test_infisical_service_reauth_on_renew(monkeypatch):
         calls.append(cmd)
         if cmd[1] == "login":
             return subprocess.CompletedProcess(cmd, 0, "new-token\n", "")
+        if cmd[1] == "export":
+            return subprocess.CompletedProcess(cmd, 0, "[]", "")
         raise AssertionError(f"unexpected command: {cmd}")
 
     monkeypatch.setattr("app.services.vault_service.shutil.which", lambda _: "/usr/local/bin/infisical")
     monkeypatch.setattr("app.services.vault_service.subprocess.run", fake_run)
-    monkeypatch.setattr(VaultService, "_start_background_loops", lambda self: None)
     monkeypatch.setenv("INFISICAL_PROJECT_ID", "p1")
     monkeypatch.setenv("INFISICAL_ENV", "dev")
     monkeypatch.delenv("INFISICAL_TOKEN", raising=False)
@@ -91,7 +130,10 @@ def test_infisical_service_reads_from_dotenv_when_shell_env_missing(monkeypatch,
     monkeypatch.delenv("INFISICAL_CLIENT_ID", raising=False)
     monkeypatch.delenv("INFISICAL_CLIENT_SECRET", raising=False)
     monkeypatch.setattr("app.services.vault_service.shutil.which", lambda _: "/usr/local/bin/infisical")
-    monkeypatch.setattr(VaultService, "_start_background_loops", lambda self: None)
+    monkeypatch.setattr(
+        "app.services.vault_service.subprocess.run",
+        lambda cmd, env, check, capture_output, text: subprocess.CompletedProcess(cmd, 0, "[]", ""),
+    )
 
     service = VaultService()
     assert service.enabled is True